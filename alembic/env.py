@@ -6,6 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 
 from dbcore import Base
+import dbcore.models  # noqa: F401 - every table on Base.metadata, or autogenerate drops them
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -22,6 +23,14 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names):
+    # The SQLite FTS5 indexes (cases_fts, pdf_documents_fts and their shadow tables)
+    # are created by raw DDL, not mapped; leave them out of autogenerate
+    if type_ == "table":
+        return "_fts" not in name
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -46,6 +55,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -67,7 +77,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_name=include_name
         )
 
         with context.begin_transaction():
@@ -0,0 +1,140 @@
+"""case stats table added
+
+Revision ID: eeecca2e1c7b
+Revises: e4b5652fa088
+Create Date: 2026-10-19 18:00:01.161148
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eeecca2e1c7b'
+down_revision: Union[str, Sequence[str], None] = 'e4b5652fa088'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Value of each dimension for a row of cases, as in dbcore.models at this revision
+DIMENSIONS = {
+    "sqlite": {
+        "total": "''",
+        "lpa": "coalesce({row}.local_planning_authority, '')",
+        "status": "coalesce({row}.status, '')",
+        "type": "coalesce({row}.type, '')",
+        "decision_year": (
+            "CASE WHEN {row}.decision_date GLOB '[0-9][0-9][0-9][0-9]-*' THEN substr({row}.decision_date, 1, 4) "
+            "WHEN {row}.decision_date GLOB '*[0-9][0-9][0-9][0-9]' THEN substr({row}.decision_date, -4) ELSE '' END"
+        ),
+    },
+    "postgresql": {
+        "total": "''",
+        "lpa": "coalesce({row}.local_planning_authority, '')",
+        "status": "coalesce({row}.status, '')",
+        "type": "coalesce({row}.type, '')",
+        "decision_year": (
+            "coalesce(substring({row}.decision_date from '^([0-9]{{4}})-'), "
+            "substring({row}.decision_date from '([0-9]{{4}})$'), '')"
+        ),
+    },
+}
+
+
+def sqlite_triggers() -> list[str]:
+    dimensions = DIMENSIONS["sqlite"]
+
+    def bump(dimension, row, delta, condition=None):
+        return (
+            f"INSERT INTO case_stats(dimension, value, cases) SELECT '{dimension}', "
+            f"{dimensions[dimension].format(row=row)}, {delta} WHERE {condition or 'true'} "
+            "ON CONFLICT(dimension, value) DO UPDATE SET cases = cases + excluded.cases; "
+        )
+
+    changed = {
+        dimension: f"{expression.format(row='old')} IS NOT {expression.format(row='new')}"
+        for dimension, expression in dimensions.items() if dimension != "total"
+    }
+    return [
+        "CREATE TRIGGER case_stats_ai AFTER INSERT ON cases BEGIN "
+        + "".join(bump(dimension, "new", 1) for dimension in dimensions) + "END",
+        "CREATE TRIGGER case_stats_ad AFTER DELETE ON cases BEGIN "
+        + "".join(bump(dimension, "old", -1) for dimension in dimensions) + "END",
+        "CREATE TRIGGER case_stats_au AFTER UPDATE OF local_planning_authority, status, type, decision_date "
+        "ON cases BEGIN "
+        + "".join(bump(d, "old", -1, c) + bump(d, "new", 1, c) for d, c in changed.items()) + "END",
+    ]
+
+
+def postgresql_triggers() -> list[str]:
+    values = ", ".join(
+        f"('{dimension}', {expression.format(row='r')})" for dimension, expression in DIMENSIONS["postgresql"].items()
+    )
+
+    def changes(table, delta):
+        return f"SELECT d.dimension, d.value, {delta} AS delta FROM {table} r CROSS JOIN LATERAL (VALUES {values}) AS d(dimension, value)"
+
+    def apply(source):
+        return (
+            "INSERT INTO case_stats (dimension, value, cases) "
+            f"SELECT dimension, value, sum(delta) FROM ({source}) AS c GROUP BY dimension, value "
+            "HAVING sum(delta) <> 0 ORDER BY dimension, value "
+            "ON CONFLICT (dimension, value) DO UPDATE SET cases = case_stats.cases + excluded.cases;"
+        )
+
+    return [
+        "CREATE OR REPLACE FUNCTION case_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+        f"IF TG_OP = 'INSERT' THEN {apply(changes('new_rows', 1))} "
+        f"ELSIF TG_OP = 'DELETE' THEN {apply(changes('old_rows', -1))} "
+        f"ELSE {apply(changes('new_rows', 1) + ' UNION ALL ' + changes('old_rows', -1))} "
+        "END IF; RETURN NULL; END $$",
+        "CREATE TRIGGER case_stats_ai AFTER INSERT ON cases REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION case_stats_apply()",
+        "CREATE TRIGGER case_stats_ad AFTER DELETE ON cases REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION case_stats_apply()",
+        "CREATE TRIGGER case_stats_au AFTER UPDATE ON cases REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION case_stats_apply()",
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('case_stats',
+    sa.Column('dimension', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('cases', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'value')
+    )
+    # ### end Alembic commands ###
+
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name not in DIMENSIONS:
+        return
+
+    # Count the cases that already exist, then keep the counts current
+    for dimension, expression in DIMENSIONS[dialect_name].items():
+        op.execute(
+            "INSERT INTO case_stats (dimension, value, cases) "
+            f"SELECT '{dimension}', {expression.format(row='cases')}, count(*) FROM cases GROUP BY 2"
+        )
+
+    for statement in sqlite_triggers() if dialect_name == "sqlite" else postgresql_triggers():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in ("case_stats_ai", "case_stats_ad", "case_stats_au"):
+        if op.get_bind().dialect.name == "postgresql":
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON cases")
+        else:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS case_stats_apply()")
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table('case_stats')
+    # ### end Alembic commands ###
@@ -0,0 +1 @@
+from .stand_in_site import StandInSite, StandInConfig, build_pdf
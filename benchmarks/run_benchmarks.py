@@ -0,0 +1,339 @@
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from dotenv import dotenv_values
+from .stand_in_site import StandInSite, StandInConfig
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes everywhere else
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _prepare_workdir(workdir: str):
+    """
+    Point dbcore at a scratch SQLite database.
+
+    dbcore reads `.env` from the working directory, so each benchmark process gets
+    its own directory and `.env` before anything from dbcore is imported.
+    """
+    Path(workdir).mkdir(parents=True, exist_ok=True)
+    Path(workdir, ".env").write_text(
+        f"DATABASE=sqlite:///{Path(workdir, 'bench.sqlite3')}\n"
+        f"CASE_PDF_PATH={Path(workdir, 'PDF')}\n"
+    )
+    os.chdir(workdir)
+
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+    from dbcore import Base
+    from dbcore.session import db
+    import dbcore.models  # noqa: F401 - registers the tables on Base before create_all
+    Base.metadata.create_all(bind=db.engine)
+
+
+def _fake_case_details(case_id: int) -> dict:
+    return {
+        "reference": f"APP/X1234/W/20/{case_id}",
+        "site_address": f"{case_id % 200} High Street, Sometown, AB1 2CD",
+        "type": "Planning Appeal (W)",
+        "local_planning_authority": "Maidstone Borough Council",
+        "officer": "Jane Smith",
+        "status": "Complete: Decision issued",
+        "decision_date": "22 Nov 2019",
+        "pdf_url": f"https://example.invalid/ViewDocument.aspx?fileid={case_id}",
+        "pdf_name": f"{case_id} Appeal decision.pdf",
+    }
+
+
+def _seed_cases(count: int, first_case_id: int = 3_000_000):
+    from dbcore import Case
+    from dbcore.session import db
+
+    with db.session_scope() as session:
+        session.add_all(Case(id=first_case_id + index, **_fake_case_details(first_case_id + index)) for index in range(count))
+
+
+# -------------------------------------------------------------------
+# Benchmarks - each runs in its own process and returns raw counters
+# -------------------------------------------------------------------
+def bench_download_pdf(params: dict) -> dict:
+    from library import download_pdf
+
+    save_path = Path(params["workdir"], "PDF")
+    downloaded_bytes = 0
+    errors = 0
+
+    started = time.perf_counter()
+    for index in range(params["cases"]):
+        case_id = params["first_case_id"] + index
+        try:
+            file_path = download_pdf(
+                url=f"{params['base_url']}/ViewDocument.aspx?fileid={case_id}",
+                save_path=str(save_path / str(case_id)),
+                filename=f"{case_id}.pdf"
+            )
+            downloaded_bytes += os.path.getsize(file_path)
+        except Exception:
+            errors += 1
+
+    return {"items": params["cases"] - errors, "bytes": downloaded_bytes, "errors": errors,
+            "seconds": time.perf_counter() - started}
+
+
+def bench_db_writers(params: dict) -> dict:
+    from dbcore import create_case, update_case_by_id
+
+    case_ids = [params["first_case_id"] + index for index in range(params["cases"])]
+
+    started = time.perf_counter()
+    for case_id in case_ids:
+        create_case(_id=case_id)
+    for case_id in case_ids:
+        update_case_by_id(case_id=case_id, **_fake_case_details(case_id))
+
+    return {"items": len(case_ids), "bytes": 0, "errors": 0, "seconds": time.perf_counter() - started}
+
+
+def bench_db_bulk(params: dict) -> dict:
+    from dbcore import create_cases, upsert_cases
+
+    case_ids = [params["first_case_id"] + index for index in range(params["cases"])]
+
+    started = time.perf_counter()
+    create_cases(case_ids)
+    upsert_cases([{"id": case_id, **_fake_case_details(case_id)} for case_id in case_ids])
+
+    return {"items": len(case_ids), "bytes": 0, "errors": 0, "seconds": time.perf_counter() - started}
+
+
+def bench_export_excel(params: dict) -> dict:
+    from library import export_cases_to_excel
+
+    _seed_cases(params["cases"], params["first_case_id"])
+    output_path = str(Path(params["workdir"], "export.xlsx"))
+
+    started = time.perf_counter()
+    export_cases_to_excel(output_path=output_path)
+    seconds = time.perf_counter() - started
+
+    return {"items": params["cases"], "bytes": os.path.getsize(output_path), "errors": 0, "seconds": seconds}
+
+
+def _chromedriver(params: dict):
+    from selenium_webdriver import get_selenium_chrome_driver
+
+    return get_selenium_chrome_driver(headless=True, chromedriver_path=params["chromedriver"])
+
+
+def bench_case_id(params: dict) -> dict:
+    from case import CaseSearchSession
+    from library import generate_monthly_dates
+
+    months = generate_monthly_dates(from_date="01/01/2015", to_date="01/12/2022")[:params["search_windows"]]
+    driver = _chromedriver(params)
+    found = 0
+    errors = 0
+
+    search_session = CaseSearchSession(driver, base_page_url=f"{params['base_url']}/CaseSearch.aspx")
+
+    try:
+        started = time.perf_counter()
+        for month in months:
+            try:
+                found += len(search_session.search(month))
+            except Exception:
+                errors += 1
+        seconds = time.perf_counter() - started
+    finally:
+        driver.quit()
+
+    return {"items": found, "bytes": 0, "errors": errors, "seconds": seconds}
+
+
+def bench_case_details(params: dict) -> dict:
+    from case import get_uk_gov_case_details_by_id
+
+    driver = _chromedriver(params)
+    errors = 0
+
+    try:
+        started = time.perf_counter()
+        for index in range(params["cases"]):
+            try:
+                get_uk_gov_case_details_by_id(
+                    case_id=params["first_case_id"] + index,
+                    webdriver_instance=driver,
+                    base_page_url=f"{params['base_url']}/ViewCase.aspx"
+                )
+            except Exception:
+                errors += 1
+        seconds = time.perf_counter() - started
+    finally:
+        driver.quit()
+
+    return {"items": params["cases"] - errors, "bytes": 0, "errors": errors, "seconds": seconds}
+
+
+BENCHMARKS = {
+    "download-pdf": (bench_download_pdf, False),
+    "db-writers": (bench_db_writers, False),
+    "db-bulk": (bench_db_bulk, False),
+    "export-excel": (bench_export_excel, False),
+    "case-id": (bench_case_id, True),
+    "case-details": (bench_case_details, True),
+}
+
+
+def _run_in_child(name: str, params: dict) -> dict:
+    """Entry point of the benchmark process: isolate the DB, run, attach peak RSS."""
+    _prepare_workdir(params["workdir"])
+
+    # Keep per-item progress output from the scrapers out of the report
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            result = BENCHMARKS[name][0](params)
+        finally:
+            sys.stdout = stdout
+
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def run_benchmark(name: str, params: dict) -> dict:
+    """
+    Run a single benchmark in a fresh process so peak RSS is attributable to it.
+
+    Args:
+        name (str): Benchmark name (key of BENCHMARKS)
+        params (dict): Benchmark parameters (base_url, cases, workdir, ...)
+
+    Returns:
+        dict: Result with items, seconds, cases_per_sec, mb_per_sec, errors and peak_rss_mb
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        result = executor.submit(_run_in_child, name, params).result()
+
+    seconds = result["seconds"] or float("nan")
+    result.update({
+        "name": name,
+        "cases_per_sec": result["items"] / seconds,
+        "mb_per_sec": result["bytes"] / seconds / 1_000_000,
+    })
+    return result
+
+
+def find_regressions(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """
+    Compare results against a previous run.
+
+    Args:
+        results (list[dict]): Current results
+        baseline (list[dict]): Results loaded from a previous --output file
+        tolerance (float): Allowed relative slowdown / memory growth (e.g. 0.1 for 10%)
+
+    Returns:
+        list[str]: Human-readable regression descriptions (empty if none)
+    """
+    previous = {item["name"]: item for item in baseline}
+    regressions = []
+
+    for result in results:
+        before = previous.get(result["name"])
+        if not before:
+            continue
+        if result["cases_per_sec"] < before["cases_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{result['name']}: {result['cases_per_sec']:.1f} cases/s vs baseline {before['cases_per_sec']:.1f}"
+            )
+        if result["peak_rss_mb"] > before["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{result['name']}: peak RSS {result['peak_rss_mb']:.1f} MB vs baseline {before['peak_rss_mb']:.1f}"
+            )
+
+    return regressions
+
+
+def _print_report(results: list[dict]):
+    print(f"{'benchmark':<14} {'items':>8} {'seconds':>9} {'cases/s':>10} {'MB/s':>8} {'errors':>7} {'peak RSS MB':>12}")
+    for result in results:
+        print(
+            f"{result['name']:<14} {result['items']:>8} {result['seconds']:>9.2f} {result['cases_per_sec']:>10.1f} "
+            f"{result['mb_per_sec']:>8.2f} {result['errors']:>7} {result['peak_rss_mb']:>12.1f}"
+        )
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks against a local stand-in of the Planning Inspectorate site")
+
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to run (default: all)")
+    parser.add_argument("--cases", type=int, default=1000, help="Cases per benchmark (default: 1000)")
+    parser.add_argument("--search-windows", type=int, default=12, help="Monthly search windows for case-id (default: 12)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stand-in base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Stand-in random extra latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stand-in responses that are HTTP 500")
+    parser.add_argument("--pdf-size", type=int, default=256 * 1024, help="Size of served PDFs in bytes")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for reproducible latency, errors and content")
+    parser.add_argument("--chromedriver", default=None, help="chromedriver path (default: CHROMEDRIVER_PATH from .env)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous --output file and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative regression (default: 0.1)")
+
+    args = parser.parse_args(argv)
+
+    chromedriver = args.chromedriver or dotenv_values(".env").get("CHROMEDRIVER_PATH")
+    config = StandInConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        pdf_size=args.pdf_size,
+        seed=args.seed
+    )
+
+    results = []
+
+    with StandInSite(config) as site, tempfile.TemporaryDirectory(prefix="case-scraper-bench-") as scratch:
+        print(f"Stand-in site running at {site.base_url}")
+
+        for name in args.only or list(BENCHMARKS):
+            if BENCHMARKS[name][1] and not (chromedriver and Path(chromedriver).exists()):
+                print(f"Skipping {name}: no chromedriver found (set CHROMEDRIVER_PATH or --chromedriver)")
+                continue
+
+            print(f"Running {name} ...")
+            results.append(run_benchmark(name, {
+                "base_url": site.base_url,
+                "cases": args.cases,
+                "search_windows": args.search_windows,
+                "first_case_id": config.first_case_id,
+                "chromedriver": chromedriver,
+                "workdir": str(Path(scratch, name)),
+            }))
+
+    _print_report(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Results written to: {args.output}")
+
+    if args.baseline:
+        regressions = find_regressions(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+
+    return 0
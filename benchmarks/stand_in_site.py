@@ -0,0 +1,260 @@
+import hashlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+@dataclass
+class StandInConfig:
+    """
+    Behaviour of the stand-in Planning Inspectorate site.
+
+    Attributes:
+        latency (float): Base latency added to every response, in seconds
+        jitter (float): Maximum extra random latency, in seconds
+        error_rate (float): Fraction of requests answered with HTTP 500 (0.0 - 1.0)
+        pdf_size (int): Size of each served PDF in bytes
+        cases_per_search (int): Number of CaseID links returned by a search postback
+        first_case_id (int): Lowest CaseID handed out by searches
+        case_density (float): Fraction of CaseIDs that exist (0.0 - 1.0); the others get
+                              a page without case details, like the live site
+        seed (int): Seed so latency, errors and generated content are reproducible
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    pdf_size: int = 256 * 1024
+    cases_per_search: int = 50
+    first_case_id: int = 3_000_000
+    case_density: float = 1.0
+    seed: int = 42
+
+
+_SEARCH_FORM = """<!DOCTYPE html>
+<html>
+<head><title>Case Search</title></head>
+<body>
+<form method="post" action="CaseSearch.aspx" id="form1">
+<div id="cphMainContent_dSearchContent">
+  {dropdowns}
+  <input type="text" id="cphMainContent_pdsStart_txtDateSearch" name="start_date" value="{start_date}">
+  <input type="checkbox" id="cphMainContent_pdsStart_chk30days" name="within_30_days">
+  <input type="submit" id="cphMainContent_cmdSearch" value="Search">
+</div>
+</form>
+{results}
+<script>
+  document.querySelectorAll('.dd-trigger').forEach(function (trigger) {{
+    trigger.addEventListener('click', function () {{
+      document.getElementById(trigger.dataset.child).style.display = 'block';
+    }});
+  }});
+  document.querySelectorAll('.dd-child li').forEach(function (option) {{
+    option.addEventListener('click', function () {{
+      option.parentElement.parentElement.style.display = 'none';
+    }});
+  }});
+</script>
+</body>
+</html>"""
+
+_DROPDOWN = """<div class="dd-trigger" id="cphMainContent_{name}_msdd" data-child="cphMainContent_{name}_child">{name}</div>
+  <div class="dd-child" id="cphMainContent_{name}_child" style="display:none"><ul>{options}</ul></div>"""
+
+_CASE_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>View Case</title></head>
+<body>
+<div id="divMainContent">
+  <span id="cphMainContent_LabelCaseReference">Reference: APP/X{lpa_code}/W/{year}/{case_id}</span>
+  <span id="cphMainContent_labSiteAddress" title="{address}">{address}</span>
+  <span id="cphMainContent_labCaseTypeName">Planning Appeal (W)</span>
+  <span id="cphMainContent_labLPAName">{lpa}</span>
+  <span id="cphMainContent_labCaseOfficer">{officer}</span>
+  <span id="cphMainContent_labStatus">Complete: Decision issued</span>
+  <span id="cphMainContent_labDecisionDate">{decision_date}</span>
+  <span id="cphMainContent_labDecisionLink"><a href="ViewDocument.aspx?fileid={case_id}">{case_id} Appeal decision.pdf</a></span>
+</div>
+</body>
+</html>"""
+
+_MISSING_CASE_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>View Case</title></head>
+<body>
+<div id="divMainContent">
+  <span id="cphMainContent_labError">The case could not be found.</span>
+</div>
+</body>
+</html>"""
+
+_LPAS = ("Maidstone Borough Council", "London Borough of Brent", "Tendring District Council", "Hart District Council")
+_OFFICERS = ("Andrew Lumber", "Jane Smith", "Priya Patel", "Tom Evans")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _rng(config: StandInConfig, *parts) -> random.Random:
+    """Deterministic RNG derived from the seed and request-specific parts."""
+    digest = hashlib.sha256(":".join(str(p) for p in (config.seed, *parts)).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def build_pdf(size: int, case_id: int) -> bytes:
+    """
+    Build a syntactically plausible PDF of exactly `size` bytes (minimum ~100 bytes).
+
+    Args:
+        size (int): Desired size in bytes
+        case_id (int): CaseID embedded in the document text
+
+    Returns:
+        bytes: PDF content starting with %PDF and ending with %%EOF
+    """
+    header = f"%PDF-1.4\n1 0 obj << /Title (Appeal decision {case_id}) >> endobj\n".encode()
+    trailer = b"\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+    padding = max(size - len(header) - len(trailer), 0)
+    return header + (b"%" + b"0" * 79 + b"\n") * (padding // 81) + b" " * (padding % 81) + trailer
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    server_version = "StandInPlanningInspectorate/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def config(self) -> StandInConfig:
+        return self.server.config
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+    def _delay_or_fail(self) -> bool:
+        """Apply configured latency; return True if the request should fail."""
+        with self.server.counter_lock:
+            self.server.request_count += 1
+            request_number = self.server.request_count
+
+        rng = _rng(self.config, self.path, request_number)
+        delay = self.config.latency + rng.uniform(0, self.config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if rng.random() < self.config.error_rate:
+            self._send(500, b"<html><body>Server Error</body></html>", "text/html")
+            return True
+        return False
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self._delay_or_fail():
+            return
+
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        route = parsed.path.rstrip("/").lower()
+
+        if route == "/casesearch.aspx":
+            self._send(200, self._render_search(start_date="", results="").encode(), "text/html; charset=utf-8")
+        elif route == "/viewcase.aspx" and query.get("CaseID", [""])[0].isdigit():
+            case_id = int(query["CaseID"][0])
+            self._send(200, self._render_case(case_id).encode(), "text/html; charset=utf-8")
+        elif route == "/viewdocument.aspx" and query.get("fileid", [""])[0].isdigit():
+            body = build_pdf(self.config.pdf_size, int(query["fileid"][0]))
+            self._send(200, body, "application/pdf")
+        else:
+            self._send(404, b"<html><body>Not Found</body></html>", "text/html")
+
+    def do_POST(self):
+        if self._delay_or_fail():
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+        start_date = form.get("start_date", [""])[0]
+
+        rng = _rng(self.config, "search", start_date)
+        offset = rng.randrange(0, 1_000_000)
+        links = "".join(
+            f'<a id="cphMainContent_grdCaseResults_lnkViewCase_{index}" '
+            f'href="ViewCase.aspx?CaseID={self.config.first_case_id + offset + index}">View</a>\n'
+            for index in range(self.config.cases_per_search)
+        )
+        results = f'<div id="cphMainContent_grdCaseResults">\n{links}</div>'
+        self._send(200, self._render_search(start_date, results).encode(), "text/html; charset=utf-8")
+
+    def _render_search(self, start_date: str, results: str) -> str:
+        dropdowns = "\n  ".join(
+            _DROPDOWN.format(
+                name=name,
+                options="".join(f"<li>Option {index}</li>" for index in range(4))
+            )
+            for name in ("cboAppealType", "cboProcedureType", "cboStatus")
+        )
+        return _SEARCH_FORM.format(dropdowns=dropdowns, start_date=escape(start_date), results=results)
+
+    def _render_case(self, case_id: int) -> str:
+        if _rng(self.config, "exists", case_id).random() >= self.config.case_density:
+            return _MISSING_CASE_PAGE
+
+        rng = _rng(self.config, "case", case_id)
+        return _CASE_PAGE.format(
+            case_id=case_id,
+            lpa_code=rng.randrange(1000, 9999),
+            year=rng.randrange(15, 23),
+            address=escape(f"{rng.randrange(1, 200)} High Street, Sometown, AB{rng.randrange(1, 99)} {rng.randrange(1, 9)}CD"),
+            lpa=rng.choice(_LPAS),
+            officer=rng.choice(_OFFICERS),
+            decision_date=f"{rng.randrange(1, 28):02d} {rng.choice(_MONTHS)} {rng.randrange(2015, 2023)}",
+        )
+
+
+class StandInSite:
+    """
+    Local HTTP stand-in for the Planning Inspectorate site, served from a background thread.
+
+    Usage:
+        with StandInSite(StandInConfig(latency=0.05)) as site:
+            download_pdf(url=f"{site.base_url}/ViewDocument.aspx?fileid=1", save_path="/tmp/pdf")
+    """
+
+    def __init__(self, config: StandInConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StandInConfig()
+        self._server = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.config = self.config
+        self._server.counter_lock = threading.Lock()
+        self._server.request_count = 0
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stand-in-site", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        return self._server.request_count
+
+    def start(self) -> "StandInSite":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInSite":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
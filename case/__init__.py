@@ -1,2 +1,29 @@
-from .case_id_scraper import get_uk_gov_case_id
-from .case_details_scraper import get_uk_gov_case_details_by_id
+from importlib import import_module
+
+# Exports are resolved on first access (PEP 562), so the HTML parser can be used
+# without importing Selenium and the scrapers without importing BeautifulSoup.
+_exports = {
+    "get_uk_gov_case_id": ".case_id_scraper",
+    "CaseSearchSession": ".case_id_scraper",
+    "CaseSearchError": ".case_id_scraper",
+    "get_uk_gov_case_details_by_id": ".case_details_scraper",
+    "MultiTabCaseScraper": ".multi_tab_scraper",
+    "AdaptiveWaitPolicy": ".wait_policy",
+    "PageNotFoundError": ".wait_policy",
+    "default_wait_policy": ".wait_policy",
+    "parse_case_details_html": ".case_details_parser",
+    "reparse_archived_case_details": ".reparse",
+    "CaseIdRangeProber": ".case_id_prober",
+    "probe_case_id": ".case_id_prober",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
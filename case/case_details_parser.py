@@ -0,0 +1,89 @@
+from typing import Dict, Optional
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+
+
+def parse_case_details_html(
+        html: str,
+        page_url: str = "https://acp.planninginspectorate.gov.uk/ViewCase.aspx"
+) -> Dict[str, Optional[str]]:
+    """
+    Extract case details from the HTML of a ViewCase.aspx page, without a browser.
+
+    Mirrors the Selenium extraction in `get_uk_gov_case_details_by_id` so archived
+    pages can be re-parsed offline and give the same values as a live scrape.
+
+    Args:
+        html: Page source of a ViewCase.aspx page
+        page_url: URL the page was fetched from, used to resolve relative PDF links
+
+    Returns:
+        Dictionary of case details keyed by Case column name
+        (reference, site_address, type, local_planning_authority, officer,
+        status, decision_date, pdf_url, pdf_name)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    case_details = dict()
+
+    case_details["reference"] = _text(
+        soup,
+        "cphMainContent_LabelCaseReference",
+        transform=lambda x: x.replace("Reference: ", "").strip()
+    )
+    case_details["site_address"] = _attribute(soup, "cphMainContent_labSiteAddress", "title")
+    case_details["type"] = _text(soup, "cphMainContent_labCaseTypeName")
+    case_details["local_planning_authority"] = _text(soup, "cphMainContent_labLPAName")
+    case_details["officer"] = _text(soup, "cphMainContent_labCaseOfficer")
+    case_details["status"] = _text(soup, "cphMainContent_labStatus")
+    case_details["decision_date"] = _text(soup, "cphMainContent_labDecisionDate")
+
+    pdf_url, pdf_name = _pdf_details(soup, page_url)
+    case_details["pdf_url"] = pdf_url
+    case_details["pdf_name"] = pdf_name
+
+    return case_details
+
+
+def _text(soup: BeautifulSoup, element_id: str, transform: Optional[callable] = None) -> Optional[str]:
+    element = soup.find(id=element_id)
+    if element is None:
+        return None
+
+    # Collapse whitespace the way a browser renders inline text
+    text = " ".join(element.get_text(" ").split())
+
+    if transform and callable(transform):
+        text = transform(text)
+
+    return text if text else None
+
+
+def _attribute(soup: BeautifulSoup, element_id: str, attribute_name: str) -> Optional[str]:
+    element = soup.find(id=element_id)
+    if element is None:
+        return None
+
+    attribute_value = element.get(attribute_name)
+    return attribute_value.strip() if attribute_value else None
+
+
+def _pdf_details(soup: BeautifulSoup, page_url: str) -> tuple[Optional[str], Optional[str]]:
+    container = soup.find(id="cphMainContent_labDecisionLink")
+    if container is None:
+        return None, None
+
+    pdf_urls = []
+    pdf_names = []
+
+    for link in container.find_all("a"):
+        href = link.get("href")
+        if href:
+            # Selenium's get_attribute("href") returns the resolved absolute URL
+            pdf_urls.append(urljoin(page_url, href.strip()))
+            pdf_names.append(" ".join(link.get_text(" ").split()))
+
+    if pdf_urls:
+        return "|".join(pdf_urls), "|".join(pdf_names)
+
+    return None, None
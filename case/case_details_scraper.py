@@ -4,7 +4,10 @@ from selenium.webdriver.ie.webdriver import WebDriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.support.ui import WebDriverWait
+from library.page_archive import PageArchive
+from selenium_webdriver.browser_daemon import BrowserLeaseLostError
+from metrics import PAGE_NAVIGATION_SECONDS, FIELD_EXTRACTION_SECONDS, FIELDS_MISSING_TOTAL, SCRAPER_ERRORS_TOTAL
+from .wait_policy import AdaptiveWaitPolicy, PageNotFoundError, default_wait_policy, page_loaded_without
 
 
 class UKGovernmentCaseScraperError(Exception):
@@ -16,7 +19,9 @@ def get_uk_gov_case_details_by_id(
         case_id: int,
         webdriver_instance: WebDriver,
         base_page_url: str = "https://acp.planninginspectorate.gov.uk/ViewCase.aspx",
-        timeout: int = 10
+        timeout: Optional[int] = None,
+        page_archive: Optional[PageArchive] = None,
+        wait_policy: Optional[AdaptiveWaitPolicy] = None
 ) -> Dict[str, Optional[str]]:
     """
     Scrape case details from the UK Planning Inspectorate website.
@@ -25,7 +30,10 @@ def get_uk_gov_case_details_by_id(
         case_id: The unique identifier for the planning case
         webdriver_instance: Selenium WebDriver instance (preferably Chrome)
         base_page_url: The base URL for the case viewing page
-        timeout: Maximum time to wait for page elements (in seconds)
+        timeout: Fixed maximum time to wait for page elements (in seconds); by default
+                 the wait policy's timeout learned from recent page loads
+        page_archive: Optional archive that receives the raw page source for offline re-parsing
+        wait_policy: Policy timing the wait (default: the shared adaptive policy)
 
     Returns:
         Dictionary containing case details with the following keys:
@@ -41,6 +49,7 @@ def get_uk_gov_case_details_by_id(
 
     Raises:
         UKGovernmentCaseScraperError: If case details cannot be retrieved
+        BrowserLeaseLostError: If the browser was leased from the daemon and the lease expired
         ValueError: If case_id is invalid
     """
     if not isinstance(case_id, int) or case_id <= 0:
@@ -51,75 +60,107 @@ def get_uk_gov_case_details_by_id(
         full_url = f"{base_page_url}?{urlencode({'CaseID': case_id})}"
         print(f"Navigating to case details page for case ID: {case_id}")
 
-        webdriver_instance.get(full_url)
-
-        # Initialize explicit wait
-        wait = WebDriverWait(webdriver_instance, timeout)
-
-        # Wait for main content to load
-        try:
-            wait.until(ec.presence_of_element_located((By.ID, "divMainContent")))
-        except TimeoutException:
-            raise UKGovernmentCaseScraperError(
-                f"Timeout waiting for page to load for case ID: {case_id}"
-            )
-
-        # Extract case details with error handling for each field
-        case_details = dict()
-
-        # Extract case reference
-        case_details["reference"] = _safe_extract_text(
-            webdriver_instance,
-            "cphMainContent_LabelCaseReference",
-            transform=lambda x: x.replace("Reference: ", "").strip()
-        )
-
-        # Extract site address from title attribute
-        case_details["site_address"] = _safe_extract_attribute(
-            webdriver_instance,
-            "cphMainContent_labSiteAddress",
-            "title"
-        )
-
-        # Extract other text fields
-        case_details["type"] = _safe_extract_text(
-            webdriver_instance, "cphMainContent_labCaseTypeName"
-        )
-
-        case_details["local_planning_authority"] = _safe_extract_text(
-            webdriver_instance, "cphMainContent_labLPAName"
-        )
-
-        case_details["officer"] = _safe_extract_text(
-            webdriver_instance, "cphMainContent_labCaseOfficer"
-        )
-
-        case_details["status"] = _safe_extract_text(
-            webdriver_instance, "cphMainContent_labStatus"
-        )
-
-        case_details["decision_date"] = _safe_extract_text(
-            webdriver_instance, "cphMainContent_labDecisionDate"
-        )
-
-        # Extract PDF link details
-        pdf_url, pdf_name = _extract_pdf_details(webdriver_instance)
-        case_details["pdf_url"] = pdf_url
-        case_details["pdf_name"] = pdf_name
+        with PAGE_NAVIGATION_SECONDS.labels(page="view_case").time():
+            webdriver_instance.get(full_url)
+
+            # Wait for main content to load; an error page that loaded without it fails at once
+            try:
+                (wait_policy or default_wait_policy).until(
+                    webdriver_instance,
+                    "view_case",
+                    ec.presence_of_element_located((By.ID, "divMainContent")),
+                    not_found=page_loaded_without("#divMainContent"),
+                    timeout=timeout
+                )
+            except PageNotFoundError:
+                raise UKGovernmentCaseScraperError(
+                    f"Page loaded without case details for case ID: {case_id}"
+                )
+            except TimeoutException:
+                raise UKGovernmentCaseScraperError(
+                    f"Timeout waiting for page to load for case ID: {case_id}"
+                )
+
+        if page_archive is not None:
+            page_archive.append("view_case", webdriver_instance.page_source, url=full_url, case_id=case_id)
+
+        with FIELD_EXTRACTION_SECONDS.labels(page="view_case").time():
+            case_details = _extract_case_details(webdriver_instance)
 
         print(f"Successfully extracted case details for ID: {case_id}")
         return case_details
 
+    except BrowserLeaseLostError:
+        # Not this case's fault: the browser is gone for every case after it too
+        raise
     except WebDriverException as e:
+        SCRAPER_ERRORS_TOTAL.labels(stage="case_details").inc()
         raise UKGovernmentCaseScraperError(
             f"WebDriver error while scraping case {case_id}: {str(e)}"
         ) from e
     except Exception as e:
+        SCRAPER_ERRORS_TOTAL.labels(stage="case_details").inc()
         raise UKGovernmentCaseScraperError(
             f"Unexpected error while scraping case {case_id}: {str(e)}"
         ) from e
 
 
+def _extract_case_details(webdriver_instance: WebDriver) -> Dict[str, Optional[str]]:
+    """
+    Extract every case field from an already loaded case details page.
+
+    Args:
+        webdriver_instance: WebDriver instance showing a ViewCase.aspx page
+
+    Returns:
+        Dictionary of case details keyed by Case column name
+    """
+    # Extract case details with error handling for each field
+    case_details = dict()
+
+    # Extract case reference
+    case_details["reference"] = _safe_extract_text(
+        webdriver_instance,
+        "cphMainContent_LabelCaseReference",
+        transform=lambda x: x.replace("Reference: ", "").strip()
+    )
+
+    # Extract site address from title attribute
+    case_details["site_address"] = _safe_extract_attribute(
+        webdriver_instance,
+        "cphMainContent_labSiteAddress",
+        "title"
+    )
+
+    # Extract other text fields
+    case_details["type"] = _safe_extract_text(
+        webdriver_instance, "cphMainContent_labCaseTypeName"
+    )
+
+    case_details["local_planning_authority"] = _safe_extract_text(
+        webdriver_instance, "cphMainContent_labLPAName"
+    )
+
+    case_details["officer"] = _safe_extract_text(
+        webdriver_instance, "cphMainContent_labCaseOfficer"
+    )
+
+    case_details["status"] = _safe_extract_text(
+        webdriver_instance, "cphMainContent_labStatus"
+    )
+
+    case_details["decision_date"] = _safe_extract_text(
+        webdriver_instance, "cphMainContent_labDecisionDate"
+    )
+
+    # Extract PDF link details
+    pdf_url, pdf_name = _extract_pdf_details(webdriver_instance)
+    case_details["pdf_url"] = pdf_url
+    case_details["pdf_name"] = pdf_name
+
+    return case_details
+
+
 def _safe_extract_text(
         driver: WebDriver,
         element_id: str,
@@ -147,6 +188,7 @@ def _safe_extract_text(
 
     except NoSuchElementException:
         print(f"Warning: Element with ID '{element_id}' not found")
+        FIELDS_MISSING_TOTAL.labels(field=element_id).inc()
         return None
 
 
@@ -173,6 +215,7 @@ def _safe_extract_attribute(
 
     except NoSuchElementException:
         print(f"Warning: Element with ID '{element_id}' not found")
+        FIELDS_MISSING_TOTAL.labels(field=element_id).inc()
         return None
 
 
@@ -210,5 +253,6 @@ def _extract_pdf_details(driver: WebDriver) -> tuple[Optional[str], Optional[str
 
     except NoSuchElementException:
         print("Warning: PDF decision link element not found")
+        FIELDS_MISSING_TOTAL.labels(field="cphMainContent_labDecisionLink").inc()
 
     return None, None
@@ -0,0 +1,241 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import requests
+from metrics import PAGE_NAVIGATION_SECONDS, ITEMS_PROCESSED_TOTAL, RETRIES_TOTAL, SCRAPER_ERRORS_TOTAL
+
+VIEW_CASE_URL = "https://acp.planninginspectorate.gov.uk/ViewCase.aspx"
+
+# Case pages carry the case reference in this label; pages for unknown CaseIDs do not
+_CASE_REFERENCE = re.compile(r'id="cphMainContent_LabelCaseReference"[^>]*>\s*[^<\s]', re.IGNORECASE)
+
+
+class CaseProbeError(Exception):
+    """Raised when a CaseID could not be classified, e.g. the site kept failing."""
+    pass
+
+
+def case_page_exists(html: str) -> bool:
+    """Tell whether a ViewCase.aspx page shows an existing case."""
+    return _CASE_REFERENCE.search(html) is not None
+
+
+def probe_case_id(
+        session: requests.Session,
+        case_id: int,
+        base_page_url: str = VIEW_CASE_URL,
+        timeout: int = 30,
+        max_attempts: int = 3
+) -> bool:
+    """
+    Check whether a CaseID exists with a plain HTTP request, without a browser.
+
+    Args:
+        session (requests.Session): HTTP session (connections are reused across probes)
+        case_id (int): CaseID to check
+        base_page_url (str): URL of the ViewCase.aspx page
+        timeout (int): Request timeout in seconds (default: 30)
+        max_attempts (int): Attempts on connection errors, 429 and 5xx responses (default: 3)
+
+    Returns:
+        bool: True if the case exists, False if the site has no such case
+
+    Raises:
+        CaseProbeError: If the site did not give a usable answer within max_attempts
+    """
+    error = None
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            with PAGE_NAVIGATION_SECONDS.labels(page="view_case_probe").time():
+                response = session.get(base_page_url, params={"CaseID": case_id}, timeout=timeout)
+
+            if response.status_code in (404, 410):
+                return False
+            if response.status_code == 200:
+                return case_page_exists(response.text)
+
+            error = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            error = str(e)
+
+        if attempt < max_attempts:
+            RETRIES_TOTAL.labels(stage="case_id_probe").inc()
+            time.sleep(0.5 * 2 ** attempt)
+
+    raise CaseProbeError(f"CaseID {case_id}: {error}")
+
+
+class CaseIdRangeProber:
+    """
+    Discover cases by probing CaseIDs directly instead of going through the search form.
+
+    IDs are probed concurrently in rounds of `workers` requests. While rounds find
+    nothing the stride between probed IDs doubles (up to `max_stride`), so sparse gaps
+    cost few requests; as soon as a probe hits, every ID the round skipped is probed
+    too and the stride drops back to 1, so clusters of cases are covered fully. Only
+    IDs inside rounds where every probe missed are left out; they are reported as
+    skipped, so a later pass with `max_stride=1` can probe them.
+
+    Progress is reported through callbacks, so the caller decides how to persist it:
+    `on_found(case_ids)` after every round with hits, and
+    `on_range(start_id, end_id, probed, found, skipped)` for every `checkpoint_size` IDs
+    settled, `skipped` being the (start_id, end_id) ranges inside it that were not probed.
+    Without an `end_id`, probing stops `max_gap` IDs after the last hit and ranges
+    are reported only up to that hit, so a later run resumes where new cases appear.
+    """
+
+    def __init__(
+            self,
+            on_found: Callable[[list[int]], None],
+            on_range: Callable[[int, int, int, int, list[tuple[int, int]]], None],
+            base_page_url: str = VIEW_CASE_URL,
+            workers: int = 8,
+            max_stride: int = 64,
+            max_gap: int = 5000,
+            checkpoint_size: int = 1000,
+            delay: float = 0.0,
+            timeout: int = 30,
+            max_attempts: int = 3
+    ):
+        self.on_found = on_found
+        self.on_range = on_range
+        self.base_page_url = base_page_url
+        self.workers = workers
+        self.max_stride = max_stride
+        self.max_gap = max_gap
+        self.checkpoint_size = checkpoint_size
+        self.delay = delay
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+
+        self._local = threading.local()
+        self._settled = []
+        self._skipped = []
+
+    def _probe(self, case_id: int) -> Optional[bool]:
+        # One HTTP session per thread; requests.Session is not thread-safe
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+
+        if self.delay:
+            time.sleep(self.delay)
+
+        try:
+            exists = probe_case_id(
+                session=session,
+                case_id=case_id,
+                base_page_url=self.base_page_url,
+                timeout=self.timeout,
+                max_attempts=self.max_attempts
+            )
+        except CaseProbeError as e:
+            SCRAPER_ERRORS_TOTAL.labels(stage="case_id_probe").inc()
+            print(f"Error probing {e}")
+            return None
+
+        ITEMS_PROCESSED_TOTAL.labels(stage="case_id_probe").inc()
+        return exists
+
+    def _checkpoint(self, start_id: int, up_to: int) -> int:
+        # Report the settled IDs up to `up_to` as one range; returns where the next range starts
+        if up_to < start_id:
+            return start_id
+
+        reported = [(case_id, exists) for case_id, exists in self._settled if case_id <= up_to]
+        self._settled = [(case_id, exists) for case_id, exists in self._settled if case_id > up_to]
+        skipped = [(first, min(last, up_to)) for first, last in self._skipped if first <= up_to]
+        self._skipped = [(max(first, up_to + 1), last) for first, last in self._skipped if last > up_to]
+        self.on_range(start_id, up_to, len(reported), sum(1 for _, exists in reported if exists), skipped)
+        return up_to + 1
+
+    def run(self, start_id: int, end_id: int = None) -> dict:
+        """
+        Probe from `start_id` up to `end_id` (inclusive), or until `max_gap` IDs pass without a hit.
+
+        A CaseID that cannot be classified (the site keeps failing) ends the run; ranges
+        are reported only up to the ID before it, so the next run retries from there.
+
+        Args:
+            start_id (int): First CaseID to probe
+            end_id (int, optional): Last CaseID to probe
+
+        Returns:
+            dict: probed, found, skipped and last_settled (highest CaseID reported, skipped
+                  ranges included), plus failed_at when an error ended the run
+        """
+        stats = {"probed": 0, "found": 0, "skipped": 0, "last_settled": start_id - 1}
+        self._settled = []
+        self._skipped = []
+
+        cursor = start_id
+        stride = 1
+        last_probed = start_id - 1
+        last_hit = start_id - 1
+        range_start = start_id
+        failed_at = None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while failed_at is None:
+                if end_id is not None and cursor > end_id:
+                    break
+                if end_id is None and cursor - last_hit > self.max_gap:
+                    break
+
+                candidates = [cursor + index * stride for index in range(self.workers)]
+                candidates = [case_id for case_id in candidates if end_id is None or case_id <= end_id]
+                results = dict(zip(candidates, executor.map(self._probe, candidates)))
+
+                # A hit means cases are not sparse here after all: probe every ID the round skipped
+                if stride > 1 and any(results.values()):
+                    backfill = [case_id for case_id in range(last_probed + 1, candidates[-1]) if case_id not in results]
+                    results.update(zip(backfill, executor.map(self._probe, backfill)))
+
+                errors = [case_id for case_id, result in results.items() if result is None]
+                if errors:
+                    failed_at = min(errors)
+
+                found = sorted(case_id for case_id, result in results.items() if result)
+                if found:
+                    self.on_found(found)
+                    last_hit = max(last_hit, found[-1])
+
+                round_end = candidates[-1]
+                stats["probed"] += len(results)
+                stats["found"] += len(found)
+                stats["skipped"] += round_end - last_probed - len(results)
+
+                # The IDs between this round's probes (none after a backfill)
+                previous = last_probed
+                for case_id in sorted(results):
+                    if case_id > previous + 1:
+                        self._skipped.append((previous + 1, case_id - 1))
+                    previous = case_id
+
+                self._settled.extend(
+                    (case_id, result) for case_id, result in results.items() if failed_at is None or case_id < failed_at
+                )
+
+                stride = 1 if found else min(stride * 2, self.max_stride)
+                last_probed = round_end
+                cursor = round_end + stride
+
+                # Open-ended runs only report up to the last hit; IDs past it may still be allocated
+                settled_to = round_end if end_id is not None else last_hit
+                if failed_at is not None:
+                    settled_to = min(settled_to, failed_at - 1)
+
+                if settled_to - range_start + 1 >= self.checkpoint_size or failed_at is not None:
+                    range_start = self._checkpoint(range_start, settled_to)
+
+            if failed_at is None:
+                range_start = self._checkpoint(range_start, last_probed if end_id is not None else last_hit)
+
+        stats["last_settled"] = range_start - 1
+        if failed_at is not None:
+            stats["failed_at"] = failed_at
+
+        return stats
@@ -1,17 +1,22 @@
+from typing import Optional
 from urllib.parse import urlparse, parse_qs
 from selenium.webdriver.ie.webdriver import WebDriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.support.ui import WebDriverWait
-from library import generate_monthly_dates
+from library.page_archive import PageArchive
+from metrics import PAGE_NAVIGATION_SECONDS, FIELD_EXTRACTION_SECONDS, RETRIES_TOTAL
+from .wait_policy import AdaptiveWaitPolicy, PageNotFoundError, default_wait_policy, page_loaded_without
 
+_RESULT_LINKS = '[id^="cphMainContent_grdCaseResults_lnkViewCase_"]'
 
 
-monthly_dates = generate_monthly_dates(from_date="01/01/2015", to_date="01/12/2022")
+class CaseSearchError(Exception):
+    """Raised when a search window keeps coming back without the configured search form."""
+    pass
 
 
-def select_dropdown_option(driver, dropdown_id, child_id, option_index, wait_time=10):
+def select_dropdown_option(driver, dropdown_id, child_id, option_index, wait_time=None, wait_policy=None):
     """
     Select an option from a custom dropdown by index.
 
@@ -20,21 +25,28 @@ def select_dropdown_option(driver, dropdown_id, child_id, option_index, wait_tim
         dropdown_id (str): ID of the dropdown trigger element
         child_id (str): ID of the dropdown options container
         option_index (int): Index of the option to select (0-based)
-        wait_time (int): Maximum wait time in seconds (default: 10)
+        wait_time (int, optional): Fixed maximum wait time in seconds; by default the
+                                   wait policy's learned timeout
+        wait_policy (AdaptiveWaitPolicy, optional): Policy timing the waits (default: shared policy)
 
     Returns:
         bool: True if selection was successful, False otherwise
     """
     try:
-        wait = WebDriverWait(driver, wait_time)
+        wait_policy = wait_policy or default_wait_policy
 
         # Click to open dropdown
-        dropdown = wait.until(ec.element_to_be_clickable((By.ID, dropdown_id)))
+        dropdown = wait_policy.until(
+            driver, "search_form_field", ec.element_to_be_clickable((By.ID, dropdown_id)), timeout=wait_time
+        )
         dropdown.click()
 
         # Wait for options to be visible and select by index
-        dropdown_options = wait.until(
-            ec.visibility_of_all_elements_located((By.XPATH, f"//div[@id='{child_id}']//li"))
+        dropdown_options = wait_policy.until(
+            driver,
+            "search_dropdown_options",
+            ec.visibility_of_all_elements_located((By.XPATH, f"//div[@id='{child_id}']//li")),
+            timeout=wait_time
         )
 
         # Check if the index is valid
@@ -49,7 +61,9 @@ def select_dropdown_option(driver, dropdown_id, child_id, option_index, wait_tim
         return False
 
 
-def set_date_field(driver, input_id, date_value, checkbox_id=None, check_checkbox=False, wait_time=10):
+def set_date_field(
+        driver, input_id, date_value, checkbox_id=None, check_checkbox=False, wait_time=None, wait_policy=None
+):
     """
     Set date in input field and optionally handle associated checkbox.
 
@@ -59,16 +73,20 @@ def set_date_field(driver, input_id, date_value, checkbox_id=None, check_checkbo
         date_value (str): Date value to enter (format: dd/mm/yyyy)
         checkbox_id (str, optional): ID of the checkbox to handle
         check_checkbox (bool): Whether to check (True) or uncheck (False) the checkbox
-        wait_time (int): Maximum wait time in seconds (default: 10)
+        wait_time (int, optional): Fixed maximum wait time in seconds; by default the
+                                   wait policy's learned timeout
+        wait_policy (AdaptiveWaitPolicy, optional): Policy timing the waits (default: shared policy)
 
     Returns:
         bool: True if operation was successful, False otherwise
     """
     try:
-        wait = WebDriverWait(driver, wait_time)
+        wait_policy = wait_policy or default_wait_policy
 
         # Wait for and clear the input field
-        date_input = wait.until(ec.element_to_be_clickable((By.ID, input_id)))
+        date_input = wait_policy.until(
+            driver, "search_form_field", ec.element_to_be_clickable((By.ID, input_id)), timeout=wait_time
+        )
         date_input.clear()
 
         # Enter the date value
@@ -77,7 +95,9 @@ def set_date_field(driver, input_id, date_value, checkbox_id=None, check_checkbo
         # Handle checkbox if provided
         if checkbox_id:
             # Wait for checkbox to exist
-            wait.until(ec.presence_of_element_located((By.ID, checkbox_id)))
+            wait_policy.until(
+                driver, "search_form_field", ec.presence_of_element_located((By.ID, checkbox_id)), timeout=wait_time
+            )
 
             # Force check/uncheck with JS
             state_js = 'true' if check_checkbox else 'false'
@@ -96,91 +116,245 @@ def set_date_field(driver, input_id, date_value, checkbox_id=None, check_checkbo
         return False
 
 
-def extract_case_ids(driver: WebDriver, wait_time: int = 10) -> set[int]:
+def extract_case_ids(
+        driver: WebDriver,
+        wait_time: Optional[int] = None,
+        wait_policy: Optional[AdaptiveWaitPolicy] = None
+) -> set[int]:
     """
     Waits for case result links to load and extracts unique CaseID values from <a> tags
     whose IDs start with 'cphMainContent_grdCaseResults_lnkViewCase_'.
 
     Each matching <a> tag contains a 'href' attribute with a 'CaseID' query parameter.
     This function parses the CaseID values and returns them as a set of integers.
+    A results page that finished loading without any links has no cases, and is
+    returned as an empty set at once instead of waiting out the timeout.
 
     Args:
         driver (WebDriver): Selenium WebDriver instance.
-        wait_time (int): Maximum time in seconds to wait for the elements to be present.
+        wait_time (int, optional): Fixed maximum time in seconds to wait for the elements
+                                   to be present; by default the wait policy's learned timeout.
+        wait_policy (AdaptiveWaitPolicy, optional): Policy timing the wait (default: shared policy).
 
     Returns:
         set[int]: A set of unique CaseID integers.
     """
     case_ids = set()
+    wait_policy = wait_policy or default_wait_policy
 
     # Wait until at least one matching link is present in the DOM
-    wait = WebDriverWait(driver, wait_time)
-    wait.until(ec.presence_of_element_located((By.CSS_SELECTOR, '[id^="cphMainContent_grdCaseResults_lnkViewCase_"]')))
+    with PAGE_NAVIGATION_SECONDS.labels(page="case_search_results").time():
+        try:
+            wait_policy.until(
+                driver,
+                "case_search_results",
+                ec.presence_of_element_located((By.CSS_SELECTOR, _RESULT_LINKS)),
+                not_found=page_loaded_without(_RESULT_LINKS),
+                timeout=wait_time
+            )
+        except PageNotFoundError:
+            print("No cases in the search results")
+            return case_ids
+
+    with FIELD_EXTRACTION_SECONDS.labels(page="case_search_results").time():
+        # Find all matching <a> elements
+        links = driver.find_elements(By.CSS_SELECTOR, _RESULT_LINKS)
+
+        for link in links:
+            href = link.get_attribute("href")
+            if href:
+                parsed_url = urlparse(href)
+                query_params = parse_qs(parsed_url.query)
+                case_id_list = query_params.get("CaseID")
+                if case_id_list and case_id_list[0].isdigit():
+                    case_ids.add(int(case_id_list[0]))
 
-    # Find all matching <a> elements
-    links = driver.find_elements(By.CSS_SELECTOR, '[id^="cphMainContent_grdCaseResults_lnkViewCase_"]')
+    return case_ids
 
-    for link in links:
-        href = link.get_attribute("href")
-        if href:
-            parsed_url = urlparse(href)
-            query_params = parse_qs(parsed_url.query)
-            case_id_list = query_params.get("CaseID")
-            if case_id_list and case_id_list[0].isdigit():
-                case_ids.add(int(case_id_list[0]))
+# Custom dropdowns of the search form: (trigger ID, options container ID, option index)
+_SEARCH_DROPDOWNS = (
+    # Case Type
+    ("cphMainContent_cboAppealType_msdd", "cphMainContent_cboAppealType_child", 1),
+    # Procedure Type
+    ("cphMainContent_cboProcedureType_msdd", "cphMainContent_cboProcedureType_child", 2),
+    # Status
+    ("cphMainContent_cboStatus_msdd", "cphMainContent_cboStatus_child", 1),
+)
+
+# Text shown by each dropdown trigger, or null when the search form is not on the page
+_FORM_STATE_SCRIPT = """
+if (!document.getElementById("cphMainContent_dSearchContent")) {
+    return null;
+}
+return arguments[0].map(function (id) {
+    var element = document.getElementById(id);
+    return element ? element.textContent.trim() : null;
+});
+"""
+
+_START_DATE_INPUT = "cphMainContent_pdsStart_txtDateSearch"
+
+# Start date the search form holds, or null when the form is not on the page
+_START_DATE_SCRIPT = """
+var element = document.getElementById(arguments[0]);
+return element ? element.value.trim() : null;
+"""
+
+
+class CaseSearchSession:
+    """
+    Search CaseSearch.aspx for one date window after another, reusing the filled form.
+
+    The form is loaded and its three dropdowns are configured once. The search
+    postback re-renders the same form with its state, so every further window
+    only changes the start date and resubmits. Before each search the dropdown
+    state is compared with what was configured; if the form is gone or was reset
+    it is loaded and configured again.
+
+    A server-side session expiry does not show in the page until the postback: it
+    returns a reset form or an error page, which has no result links either. So the
+    postback is checked too - configured dropdowns and the submitted start date - and
+    a window whose postback fails the check is searched again on a freshly loaded
+    form instead of being returned as empty.
+
+    Waits are timed by `wait_policy` (the shared adaptive policy by default), unless
+    a fixed `wait_time` is given.
+    """
 
-    return case_ids
+    def __init__(
+            self,
+            chromedriver: WebDriver,
+            base_page_url: str = "https://acp.planninginspectorate.gov.uk/CaseSearch.aspx",
+            page_archive: PageArchive = None,
+            wait_time: Optional[int] = None,
+            wait_policy: Optional[AdaptiveWaitPolicy] = None
+    ):
+        self.chromedriver = chromedriver
+        self.base_page_url = base_page_url
+        self.page_archive = page_archive
+        self.wait_time = wait_time
+        self.wait_policy = wait_policy or default_wait_policy
+        self.form_loads = 0
+        self._form_state = None
+
+    def _read_form_state(self) -> Optional[list]:
+        trigger_ids = [dropdown_id for dropdown_id, _, _ in _SEARCH_DROPDOWNS]
+        return self.chromedriver.execute_script(_FORM_STATE_SCRIPT, trigger_ids)
+
+    def _load_form(self):
+        with PAGE_NAVIGATION_SECONDS.labels(page="case_search").time():
+            self.chromedriver.get(url=self.base_page_url)
+
+            self.wait_policy.until(
+                self.chromedriver,
+                "case_search",
+                ec.presence_of_element_located((By.ID, "cphMainContent_dSearchContent")),
+                timeout=self.wait_time
+            )
+
+        for dropdown_id, child_id, option_index in _SEARCH_DROPDOWNS:
+            select_dropdown_option(
+                driver=self.chromedriver,
+                dropdown_id=dropdown_id,
+                child_id=child_id,
+                option_index=option_index,
+                wait_time=self.wait_time,
+                wait_policy=self.wait_policy
+            )
+
+        self._form_state = self._read_form_state()
+        self.form_loads += 1
+
+    def _is_search_form(self, start_date: str) -> bool:
+        """Whether the page holds the configured form with `start_date` filled in."""
+        return (
+            self._read_form_state() == self._form_state
+            and self.chromedriver.execute_script(_START_DATE_SCRIPT, _START_DATE_INPUT) == start_date
+        )
 
-def get_uk_gov_case_id(
-        chromedriver: WebDriver,
-        base_page_url: str = "https://acp.planninginspectorate.gov.uk/CaseSearch.aspx",
-        start_date: str = "01/01/2015"
-) -> set[int]:
+    def _submit(self, start_date: str) -> Optional[set[int]]:
+        """Search one window on the current form; None if the postback lost the form."""
+        # Set Start date field
+        set_date_field(
+            driver=self.chromedriver,
+            input_id=_START_DATE_INPUT,
+            date_value=start_date,
+            checkbox_id="cphMainContent_pdsStart_chk30days",
+            check_checkbox=True,
+            wait_time=self.wait_time,
+            wait_policy=self.wait_policy
+        )
 
-    chromedriver.get(url=base_page_url)
+        search_btn = self.wait_policy.until(
+            self.chromedriver,
+            "search_form_field",
+            ec.element_to_be_clickable((By.ID, "cphMainContent_cmdSearch")),
+            timeout=self.wait_time
+        )
+        search_btn.click()
 
-    # Chromedriver wait for 10 seconds
-    wait = WebDriverWait(chromedriver, 10)
+        # The previous window's results stay on the page until the postback replaces it
+        with PAGE_NAVIGATION_SECONDS.labels(page="case_search_submit").time():
+            self.wait_policy.until(
+                self.chromedriver, "case_search_submit", ec.staleness_of(search_btn), timeout=self.wait_time
+            )
 
+        case_ids = extract_case_ids(driver=self.chromedriver, wait_time=self.wait_time, wait_policy=self.wait_policy)
 
-    wait.until(ec.presence_of_element_located((By.ID, "cphMainContent_dSearchContent")))
+        # An expired session answers with a reset form or an error page, which has no results either
+        if not case_ids and not self._is_search_form(start_date):
+            return None
 
-    # Case Type
-    select_dropdown_option(
-        driver=chromedriver,
-        dropdown_id="cphMainContent_cboAppealType_msdd",
-        child_id="cphMainContent_cboAppealType_child",
-        option_index=1
-    )
+        if self.page_archive is not None:
+            self.page_archive.append(
+                "case_search", self.chromedriver.page_source, url=self.chromedriver.current_url, key=start_date
+            )
 
-    # Procedure Type
-    select_dropdown_option(
-        driver=chromedriver,
-        dropdown_id="cphMainContent_cboProcedureType_msdd",
-        child_id="cphMainContent_cboProcedureType_child",
-        option_index=2
-    )
+        return case_ids
 
-    # Status
-    select_dropdown_option(
-        driver=chromedriver,
-        dropdown_id="cphMainContent_cboStatus_msdd",
-        child_id="cphMainContent_cboStatus_child",
-        option_index=1
-    )
-
-    # Set Start date field
-    set_date_field(
-        driver=chromedriver,
-        input_id="cphMainContent_pdsStart_txtDateSearch",
-        date_value=start_date,
-        checkbox_id="cphMainContent_pdsStart_chk30days",
-        check_checkbox=True
-    )
-
-    search_btn = wait.until(ec.element_to_be_clickable((By.ID, "cphMainContent_cmdSearch")))
-    search_btn.click()
-
-    case_ids = extract_case_ids(driver=chromedriver)
+    def search(self, start_date: str) -> set[int]:
+        """
+        Search the 30 days from `start_date` and return the CaseIDs found.
 
-    return case_ids
+        Args:
+            start_date (str): Start of the window (format: dd/mm/yyyy)
+
+        Returns:
+            set[int]: CaseIDs in the results
+
+        Raises:
+            CaseSearchError: If the postback lost the search form again on a freshly loaded form
+        """
+        if self._form_state is None:
+            self._load_form()
+        elif self._read_form_state() != self._form_state:
+            print("Search form expired, loading it again")
+            RETRIES_TOTAL.labels(stage="case_search").inc()
+            self._load_form()
+
+        case_ids = self._submit(start_date)
+        if case_ids is not None:
+            return case_ids
+
+        print(f"Search form expired during the search from {start_date}, loading it again")
+        RETRIES_TOTAL.labels(stage="case_search").inc()
+        self._load_form()
+
+        case_ids = self._submit(start_date)
+        if case_ids is None:
+            raise CaseSearchError(f"The search from {start_date} came back without the search form twice")
+        return case_ids
+
+
+def get_uk_gov_case_id(
+        chromedriver: WebDriver,
+        base_page_url: str = "https://acp.planninginspectorate.gov.uk/CaseSearch.aspx",
+        start_date: str = "01/01/2015",
+        page_archive: PageArchive = None
+) -> set[int]:
+    """
+    Search a single date window on a freshly loaded form.
+
+    Use CaseSearchSession to search many windows without reloading the form for each.
+    """
+    return CaseSearchSession(chromedriver, base_page_url=base_page_url, page_archive=page_archive).search(start_date)
@@ -0,0 +1,245 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlencode
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from library.page_archive import PageArchive
+from metrics import PAGE_NAVIGATION_SECONDS, FIELD_EXTRACTION_SECONDS, SCRAPER_ERRORS_TOTAL
+from .case_details_parser import parse_case_details_html
+from .case_details_scraper import UKGovernmentCaseScraperError
+from .wait_policy import AdaptiveWaitPolicy, ERROR_TITLE_PATTERN, default_wait_policy
+
+# Marks the tab's current document before navigating; a document without the mark is the new one
+_NAVIGATE_SCRIPT = """
+document.caseScraperPrevious = true;
+window.location.href = arguments[0];
+"""
+
+# "ready" once the tab shows the new document and its DOM is parsed, "missing" when that page
+# is an error page or finished loading without case details, null while still loading.
+# Until the new document commits the tab still shows the previous case, hence the mark; any
+# new document counts, wherever the server redirected the tab to.
+_READY_SCRIPT = """
+if (document.caseScraperPrevious === true) {
+    return null;
+}
+if (%s.test(document.title)) {
+    return "missing";
+}
+if (document.readyState === "loading") {
+    return null;
+}
+if (document.getElementById("divMainContent") !== null) {
+    return "ready";
+}
+return document.readyState === "complete" ? "missing" : null;
+""" % ERROR_TITLE_PATTERN
+
+
+@dataclass
+class _Tab:
+    handle: str
+    case_id: Optional[int] = None
+    url: Optional[str] = None
+    started_at: float = 0.0
+    free_at: float = 0.0
+
+
+class MultiTabCaseScraper:
+    """
+    Scrape case details pages in several tabs of one Chrome.
+
+    Loading a page is mostly waiting on the network, so instead of one Chrome per
+    worker this keeps `tabs` navigations in flight in a single browser: navigations
+    are issued round-robin to free tabs, and every tab is polled until its page is
+    ready, then harvested (page source parsed with `parse_case_details_html`) and
+    reused for the next case.
+
+    The driver must be created with `page_load_strategy="none"`; with the default
+    strategy ChromeDriver holds up commands until a tab's navigation finishes, so the
+    tabs would load one at a time.
+    """
+
+    def __init__(
+            self,
+            webdriver_instance: WebDriver,
+            tabs: int = 4,
+            base_page_url: str = "https://acp.planninginspectorate.gov.uk/ViewCase.aspx",
+            timeout: Optional[float] = None,
+            poll_interval: float = 0.05,
+            politeness_delay: Tuple[float, float] = (0.0, 0.0),
+            page_archive: Optional[PageArchive] = None,
+            wait_policy: Optional[AdaptiveWaitPolicy] = None
+    ):
+        """
+        Args:
+            webdriver_instance: Chrome WebDriver created with page_load_strategy="none"
+            tabs: Number of tabs loading pages at the same time
+            base_page_url: The base URL for the case viewing page
+            timeout: Fixed maximum time for a page to load in its tab (in seconds); by
+                     default the wait policy's timeout learned from recent page loads
+            poll_interval: Pause between rounds of polling the tabs (in seconds)
+            politeness_delay: Range of the random pause of a tab between two cases (in seconds)
+            page_archive: Optional archive that receives the raw page source for offline re-parsing
+            wait_policy: Policy the page load times are learned by (default: the shared adaptive policy)
+        """
+        if tabs < 1:
+            raise ValueError(f"tabs must be at least 1, got: {tabs}")
+
+        self.driver = webdriver_instance
+        self.tabs = tabs
+        self.base_page_url = base_page_url
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.politeness_delay = politeness_delay
+        self.page_archive = page_archive
+        self.wait_policy = wait_policy or default_wait_policy
+        self._tabs = []
+
+    def _open_tabs(self) -> list[_Tab]:
+        if not self._tabs:
+            self._tabs.append(_Tab(handle=self.driver.current_window_handle))
+
+        while len(self._tabs) < self.tabs:
+            self.driver.switch_to.new_window("tab")
+            self._tabs.append(_Tab(handle=self.driver.current_window_handle))
+
+        return self._tabs
+
+    def _navigate(self, tab: _Tab, case_id: int):
+        tab.case_id = case_id
+        tab.url = f"{self.base_page_url}?{urlencode({'CaseID': case_id})}"
+        tab.started_at = time.monotonic()
+
+        print(f"Navigating to case details page for case ID: {case_id}")
+        self.driver.switch_to.window(tab.handle)
+        # Assigning the location returns at once, whatever the page load strategy
+        self.driver.execute_script(_NAVIGATE_SCRIPT, tab.url)
+
+    def _harvest(self, tab: _Tab) -> Dict[str, Optional[str]]:
+        html = self.driver.page_source
+
+        if self.page_archive is not None:
+            self.page_archive.append("view_case", html, url=tab.url, case_id=tab.case_id)
+
+        with FIELD_EXTRACTION_SECONDS.labels(page="view_case").time():
+            return parse_case_details_html(html, page_url=tab.url)
+
+    def _release(self, tab: _Tab):
+        tab.case_id = None
+        tab.url = None
+        tab.free_at = time.monotonic() + random.uniform(*self.politeness_delay)
+
+    def scrape(
+            self,
+            case_ids: Iterable[int]
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Optional[str]]], Optional[UKGovernmentCaseScraperError]]]:
+        """
+        Scrape the details of every case, yielding results in the order pages finish loading.
+
+        Args:
+            case_ids: Case IDs to scrape
+
+        Yields:
+            (case_id, case details, None) for a scraped case, or (case_id, None, error)
+            when its page failed to load in time or the browser raised an error
+
+        Raises:
+            ValueError: If a case_id is invalid
+        """
+        pending = iter(case_ids)
+        exhausted = False
+        tabs = self._open_tabs()
+
+        while True:
+            busy = False
+
+            for tab in tabs:
+                now = time.monotonic()
+
+                if tab.case_id is None:
+                    if exhausted or now < tab.free_at:
+                        continue
+
+                    case_id = next(pending, None)
+                    if case_id is None:
+                        exhausted = True
+                        continue
+                    if not isinstance(case_id, int) or case_id <= 0:
+                        raise ValueError(f"case_id must be a positive integer, got: {case_id}")
+
+                    try:
+                        self._navigate(tab, case_id)
+                    except WebDriverException as e:
+                        SCRAPER_ERRORS_TOTAL.labels(stage="case_details").inc()
+                        self._release(tab)
+                        yield case_id, None, UKGovernmentCaseScraperError(
+                            f"WebDriver error while scraping case {case_id}: {str(e)}"
+                        )
+                        continue
+
+                    busy = True
+                    continue
+
+                busy = True
+                case_id = tab.case_id
+
+                try:
+                    self.driver.switch_to.window(tab.handle)
+                    state = self.driver.execute_script(_READY_SCRIPT)
+
+                    if state == "missing":
+                        self.wait_policy.observe("view_case", now - tab.started_at, outcome="not_found")
+                        raise UKGovernmentCaseScraperError(
+                            f"Page loaded without case details for case ID: {case_id}"
+                        )
+
+                    if state != "ready":
+                        timeout = self.timeout if self.timeout is not None else self.wait_policy.timeout("view_case")
+                        if now - tab.started_at < timeout:
+                            continue
+                        self.wait_policy.observe("view_case", timeout, outcome="timeout")
+                        self.driver.execute_script("window.stop();")
+                        raise UKGovernmentCaseScraperError(
+                            f"Timeout waiting for page to load for case ID: {case_id}"
+                        )
+
+                    PAGE_NAVIGATION_SECONDS.labels(page="view_case").observe(now - tab.started_at)
+                    self.wait_policy.observe("view_case", now - tab.started_at)
+                    case_details = self._harvest(tab)
+                except UKGovernmentCaseScraperError as e:
+                    SCRAPER_ERRORS_TOTAL.labels(stage="case_details").inc()
+                    self._release(tab)
+                    yield case_id, None, e
+                    continue
+                except WebDriverException as e:
+                    SCRAPER_ERRORS_TOTAL.labels(stage="case_details").inc()
+                    self._release(tab)
+                    yield case_id, None, UKGovernmentCaseScraperError(
+                        f"WebDriver error while scraping case {case_id}: {str(e)}"
+                    )
+                    continue
+
+                self._release(tab)
+                print(f"Successfully extracted case details for ID: {case_id}")
+                yield case_id, case_details, None
+
+            if exhausted and not busy:
+                return
+
+            time.sleep(self.poll_interval)
+
+    def close(self):
+        """Close every tab but the first, leaving the driver on the window it started on."""
+        for tab in self._tabs[1:]:
+            try:
+                self.driver.switch_to.window(tab.handle)
+                self.driver.close()
+            except WebDriverException:
+                pass
+
+        if self._tabs:
+            self.driver.switch_to.window(self._tabs[0].handle)
+        self._tabs = self._tabs[:1]
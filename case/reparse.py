@@ -0,0 +1,61 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
+from library.page_archive import PageArchive, ArchivedPage, read_archived_page
+from .case_details_parser import parse_case_details_html
+
+
+def _parse_archived_chunk(root: str, pages: list[ArchivedPage]) -> list[Tuple[int, Dict[str, Optional[str]]]]:
+    """Worker: read a chunk of archived ViewCase.aspx pages and parse each one."""
+    results = []
+    for page in pages:
+        html = read_archived_page(root, page)
+        url_kwargs = {"page_url": page.url} if page.url else {}
+        results.append((page.case_id, parse_case_details_html(html, **url_kwargs)))
+    return results
+
+
+def reparse_archived_case_details(
+        archive: PageArchive,
+        workers: int = None,
+        chunk_size: int = 200
+) -> Iterator[Tuple[int, Dict[str, Optional[str]]]]:
+    """
+    Re-run case details extraction over the latest archived ViewCase.aspx page of every case.
+
+    Pages are read and parsed in a process pool; no network access is needed. At most
+    two chunks per worker are in flight, so memory stays flat however large the archive.
+
+    Args:
+        archive: Page archive written by the case-details scraper
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Pages handed to a worker at a time
+
+    Yields:
+        Tuple of (case_id, case details dictionary), as returned by the live scraper
+    """
+    root = str(archive.root)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    chunk = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Oldest first, so results keep the archive's case ID order
+        futures = deque()
+
+        for page in archive.latest("view_case"):
+            if page.case_id is None:
+                continue
+
+            chunk.append(page)
+            if len(chunk) >= chunk_size:
+                if len(futures) >= max_in_flight:
+                    yield from futures.popleft().result()
+                futures.append(executor.submit(_parse_archived_chunk, root, chunk))
+                chunk = []
+
+        if chunk:
+            futures.append(executor.submit(_parse_archived_chunk, root, chunk))
+
+        while futures:
+            yield from futures.popleft().result()
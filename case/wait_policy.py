@@ -0,0 +1,192 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+from metrics import WAIT_TIMEOUT_SECONDS, WAIT_OUTCOMES_TOTAL
+
+# JavaScript regular expression matching the titles of the site's (and the server's) error pages
+ERROR_TITLE_PATTERN = "/server error|runtime error|not found|service unavailable/i"
+
+# True once the page has finished loading without the element, or is a server error page.
+# The site renders its pages on the server, so an element missing by then never shows up.
+_LOADED_WITHOUT_SCRIPT = """
+if (%s.test(document.title)) {
+    return true;
+}
+return document.readyState === "complete" && document.querySelector(arguments[0]) === null;
+""" % ERROR_TITLE_PATTERN
+
+_NOT_FOUND = object()
+
+
+class PageNotFoundError(TimeoutException):
+    """Raised when a wait stops early because the page shows it will never have the element."""
+    pass
+
+
+def page_loaded_without(css_selector: str) -> Callable[[WebDriver], bool]:
+    """
+    Build a "not found" marker for AdaptiveWaitPolicy.until.
+
+    Args:
+        css_selector (str): Element the wait is for
+
+    Returns:
+        Callable[[WebDriver], bool]: True when the page finished loading without the
+                                     element, or is a server error page
+    """
+    return lambda driver: bool(driver.execute_script(_LOADED_WITHOUT_SCRIPT, css_selector))
+
+
+class AdaptiveWaitPolicy:
+    """
+    Browser wait timeouts and poll intervals learned from observed latencies, per page type.
+
+    Every wait records how long it took under its page type (e.g. "view_case",
+    "case_search_results"). Once a page type has `min_samples` observations its
+    timeout is p99 x `factor`, clamped to [min_timeout, max_timeout], and it is polled
+    at a tenth of its median latency, clamped to [min_poll, max_poll]; until then the
+    fixed `default_timeout` and `default_poll` apply. Waits that time out are recorded
+    at the timeout, so a slow spell raises p99 and the timeouts follow.
+
+    One policy is shared by all scrapers (`default_wait_policy`) and is thread-safe.
+    """
+
+    def __init__(
+            self,
+            default_timeout: float = 10.0,
+            factor: float = 3.0,
+            min_timeout: float = 2.0,
+            max_timeout: float = 30.0,
+            default_poll: float = 0.1,
+            min_poll: float = 0.02,
+            max_poll: float = 0.5,
+            min_samples: int = 20,
+            window: int = 500
+    ):
+        """
+        Args:
+            default_timeout: Timeout of a page type without enough observations (in seconds)
+            factor: Multiple of p99 latency used as the timeout
+            min_timeout: Lower bound of learned timeouts (in seconds)
+            max_timeout: Upper bound of learned timeouts (in seconds)
+            default_poll: Poll interval of a page type without enough observations (in seconds)
+            min_poll: Lower bound of learned poll intervals (in seconds)
+            max_poll: Upper bound of learned poll intervals (in seconds)
+            min_samples: Observations needed before a page type's timeout is learned
+            window: Most recent observations kept per page type
+        """
+        self.default_timeout = default_timeout
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.default_poll = default_poll
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.min_samples = min_samples
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def observe(self, page: str, seconds: float, outcome: str = "found"):
+        """
+        Record the latency of one wait on a page type.
+
+        Args:
+            page (str): Page type
+            seconds (float): How long the wait took; the timeout for waits that timed out
+            outcome (str): "found", "not_found" or "timeout" (default: "found")
+        """
+        with self._lock:
+            samples = self._samples.get(page)
+            if samples is None:
+                samples = self._samples[page] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+        WAIT_OUTCOMES_TOTAL.labels(page=page, outcome=outcome).inc()
+        WAIT_TIMEOUT_SECONDS.labels(page=page).set(self.timeout(page))
+
+    def percentile(self, page: str, q: float) -> Optional[float]:
+        """
+        Return the q-quantile (0 to 1) of the recent latencies of a page type.
+
+        Returns:
+            Optional[float]: Latency in seconds, or None before `min_samples` observations
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(page, ()))
+
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(q * len(samples)) - 1)]
+
+    def timeout(self, page: str) -> float:
+        """Return the timeout of the next wait on a page type (in seconds)."""
+        p99 = self.percentile(page, 0.99)
+        if p99 is None:
+            return self.default_timeout
+        return min(max(p99 * self.factor, self.min_timeout), self.max_timeout)
+
+    def poll_interval(self, page: str) -> float:
+        """Return the poll interval of the next wait on a page type (in seconds)."""
+        p50 = self.percentile(page, 0.5)
+        if p50 is None:
+            return self.default_poll
+        return min(max(p50 / 10, self.min_poll), self.max_poll)
+
+    def until(
+            self,
+            driver: WebDriver,
+            page: str,
+            condition: Callable[[WebDriver], object],
+            not_found: Optional[Callable[[WebDriver], bool]] = None,
+            timeout: Optional[float] = None
+    ):
+        """
+        Wait for an expected condition with the page type's timeout and poll interval.
+
+        Args:
+            driver: WebDriver instance
+            page: Page type the latency is recorded under
+            condition: Expected condition, e.g. ec.presence_of_element_located(...)
+            not_found: Optional marker; when it returns True the wait stops at once
+            timeout: Fixed timeout overriding the learned one (in seconds)
+
+        Returns:
+            Whatever the condition returned
+
+        Raises:
+            PageNotFoundError: If the not-found marker matched first
+            TimeoutException: If the condition was not met in time
+        """
+        timeout = self.timeout(page) if timeout is None else timeout
+
+        def check(d):
+            result = condition(d)
+            if result:
+                return result
+            if not_found is not None and not_found(d):
+                return _NOT_FOUND
+            return False
+
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=self.poll_interval(page)).until(check)
+        except TimeoutException:
+            self.observe(page, timeout, outcome="timeout")
+            raise
+
+        if result is _NOT_FOUND:
+            self.observe(page, time.monotonic() - started, outcome="not_found")
+            raise PageNotFoundError(f"The {page} page loaded without the expected element")
+
+        self.observe(page, time.monotonic() - started)
+        return result
+
+
+# Shared by every scraper, so what one learns about a page type the others use
+default_wait_policy = AdaptiveWaitPolicy()
@@ -1 +1,2 @@
 from .run_scraper import run_scraper
+from .registry import Category, register_category, get_category, list_categories, load_plugins
@@ -0,0 +1,30 @@
+from selenium_webdriver import BrowserDaemon, browser_daemon_status
+from ..common import env_config
+
+
+def run(
+        browsers: int = 2,
+        address: str = None,
+        first_debugging_port: int = 9222,
+        lease_seconds: int = 600,
+        headless: bool = False,
+        status: bool = False
+):
+    address = address or env_config.get("BROWSER_DAEMON_ADDRESS") or "127.0.0.1:9600"
+
+    if status:
+        for browser in browser_daemon_status(address):
+            state = "resetting" if browser.get("resetting") else (
+                f"leased to {browser['owner']}, expires in {browser['expires_in']}s" if browser["leased"] else "free"
+            )
+            print(f"Browser {browser['slot']} (port {browser['port']}, {browser['leases']} leases): {state}")
+        return
+
+    BrowserDaemon(
+        address=address,
+        browsers=browsers,
+        first_debugging_port=first_debugging_port,
+        lease_seconds=lease_seconds,
+        headless=headless,
+        chromedriver_path=env_config.get("CHROMEDRIVER_PATH")
+    ).serve_forever()
@@ -0,0 +1,98 @@
+import random
+import time
+from case import get_uk_gov_case_details_by_id, MultiTabCaseScraper
+from case.case_details_scraper import UKGovernmentCaseScraperError
+from dbcore import claim_cases, release_cases, update_case_by_id
+from metrics import QUEUE_DEPTH, ITEMS_PROCESSED_TOTAL
+from ..common import env_config, open_chromedriver, get_page_archive
+
+
+def _save_case_details(case_id: int, dataset: dict, worker_id: str = None):
+    update_case_by_id(
+        case_id=case_id,
+        reference=dataset.get("reference"),
+        site_address=dataset.get("site_address"),
+        type=dataset.get("type"),
+        local_planning_authority=dataset.get("local_planning_authority"),
+        officer=dataset.get("officer"),
+        status=dataset.get("status"),
+        decision_date=dataset.get("decision_date"),
+        pdf_url=dataset.get("pdf_url"),
+        pdf_name=dataset.get("pdf_name"),
+    )
+    release_cases([case_id], worker_id=worker_id)
+
+    ITEMS_PROCESSED_TOTAL.labels(stage="case_details").inc()
+
+
+def run(limit: int = 1000, batch_size: int = 50, lease_seconds: int = 900, tabs: int = 1):
+    # Initialize Selenium Chrome driver once for all targets; tabs load without blocking each other
+    chromedriver = open_chromedriver(page_load_strategy="none") if tabs > 1 else open_chromedriver()
+
+    print(f"Scraping case-details in {tabs} tab(s)")
+
+    page_archive = get_page_archive()
+    worker_id = env_config.get("WORKER_ID") or None
+    processed = 0
+
+    scraper = None
+    if tabs > 1:
+        # Each tab pauses between its cases like the single-tab loop does
+        scraper = MultiTabCaseScraper(
+            webdriver_instance=chromedriver,
+            tabs=tabs,
+            politeness_delay=(1.0, 6.0),
+            page_archive=page_archive
+        )
+
+    try:
+        # Claim small batches so leases stay short and other nodes can share the backlog
+        while processed < limit:
+            cases = claim_cases(
+                stage="case_details",
+                batch_size=min(batch_size, limit - processed),
+                lease_seconds=lease_seconds,
+                worker_id=worker_id
+            )
+            if not cases:
+                break
+
+            if scraper is not None:
+                remaining = len(cases)
+                for case_id, dataset, error in scraper.scrape([case.id for case in cases]):
+                    remaining -= 1
+                    QUEUE_DEPTH.labels(queue="case_details").set(remaining)
+                    processed += 1
+
+                    if error is not None:
+                        # Keep the lease, so the case is retried by any node once it expires
+                        print(f"Error: {error}")
+                        continue
+
+                    _save_case_details(case_id, dataset, worker_id=worker_id)
+                continue
+
+            for index, case in enumerate(cases):
+                QUEUE_DEPTH.labels(queue="case_details").set(len(cases) - index)
+                processed += 1
+
+                try:
+                    dataset = get_uk_gov_case_details_by_id(
+                        webdriver_instance=chromedriver,
+                        case_id=case.id,
+                        page_archive=page_archive
+                    )
+                except UKGovernmentCaseScraperError as e:
+                    # Keep the lease, so the case is retried by any node once it expires
+                    print(f"Error: {e}")
+                    continue
+
+                # Wait for random second from 1 to 10
+                time.sleep(random.randint(1, 6))
+
+                _save_case_details(case.id, dataset, worker_id=worker_id)
+    finally:
+        # Also hands a leased browser back to the browser daemon
+        chromedriver.quit()
+
+    QUEUE_DEPTH.labels(queue="case_details").set(0)
@@ -0,0 +1,35 @@
+from case import CaseSearchSession
+from dbcore import create_cases
+from library import generate_monthly_dates
+from metrics import QUEUE_DEPTH, ITEMS_PROCESSED_TOTAL
+from ..common import open_chromedriver, get_page_archive
+
+
+def run():
+    # Initialize Selenium Chrome driver once for all targets
+    chromedriver = open_chromedriver()
+
+    monthly_dates = generate_monthly_dates(from_date="01/01/2015", to_date="01/12/2022")
+    page_archive = get_page_archive()
+    # The search form is filled once; each window only changes the start date
+    search_session = CaseSearchSession(chromedriver, page_archive=page_archive)
+
+    print("Scraping: case-id")
+
+    try:
+        for index, monthly_date in enumerate(monthly_dates):
+            QUEUE_DEPTH.labels(queue="case_id").set(len(monthly_dates) - index)
+
+            dataset = search_session.search(monthly_date)
+
+            print(f"Checking > {monthly_date}")
+
+            create_cases(list(dataset))
+
+            ITEMS_PROCESSED_TOTAL.labels(stage="case_id").inc()
+    finally:
+        # Also hands a leased browser back to the browser daemon
+        chromedriver.quit()
+
+    QUEUE_DEPTH.labels(queue="case_id").set(0)
+    print(f"Search form loaded {search_session.form_loads} time(s) for {len(monthly_dates)} windows")
@@ -0,0 +1,77 @@
+from case.case_id_prober import CaseIdRangeProber, VIEW_CASE_URL
+from dbcore import (
+    create_cases, get_probe_high_water_mark, get_lowest_case_id, get_skipped_probe_ranges, record_probed_range
+)
+
+
+def run(
+        start: int = None,
+        end: int = None,
+        workers: int = 8,
+        max_gap: int = 5000,
+        max_stride: int = 64,
+        delay: float = 0.1,
+        base_url: str = None
+):
+    skipped_recorded = []
+
+    def on_found(case_ids: list[int]):
+        created = create_cases(case_ids)
+        if created:
+            print(f"Found {len(case_ids)} cases, {len(created)} new (up to CaseID {case_ids[-1]})")
+
+    def on_range(start_id: int, end_id: int, probed: int, found: int, skipped: list[tuple[int, int]]):
+        record_probed_range(start_id=start_id, end_id=end_id, probed=probed, found=found, skipped=skipped)
+        skipped_recorded.extend(skipped)
+        print(
+            f"Probed CaseID {start_id}-{end_id}: {found} cases from {probed} requests"
+            + (f", {len(skipped)} sparse stretches left for a later run" if skipped else "")
+        )
+
+    def prober(stride: int) -> CaseIdRangeProber:
+        return CaseIdRangeProber(
+            on_found=on_found,
+            on_range=on_range,
+            base_page_url=base_url or VIEW_CASE_URL,
+            workers=workers,
+            max_stride=stride,
+            max_gap=max_gap,
+            delay=delay
+        )
+
+    if start is None:
+        # IDs earlier runs stepped over come first, one by one; the high-water mark waits for them
+        skipped_ranges = get_skipped_probe_ranges()
+        if skipped_ranges:
+            print(f"Scraping: case-id-probe of {len(skipped_ranges)} skipped CaseID ranges")
+
+        gap_prober = prober(stride=1)
+        for skipped_start, skipped_end in skipped_ranges:
+            stats = gap_prober.run(start_id=skipped_start, end_id=skipped_end)
+            if "failed_at" in stats:
+                print(f"Stopped at CaseID {stats['failed_at']} after repeated errors; the next run resumes there")
+                return
+
+        high_water_mark = get_probe_high_water_mark()
+        # Without earlier probe runs, start from the lowest case the search form found
+        start = high_water_mark + 1 if high_water_mark is not None else get_lowest_case_id()
+
+    if start is None:
+        print("Nothing probed yet and no cases known; pass --start")
+        return
+
+    print(f"Scraping: case-id-probe from CaseID {start}" + (f" to {end}" if end is not None else ""))
+
+    stats = prober(stride=max_stride).run(start_id=start, end_id=end)
+
+    print(
+        f"Probed {stats['probed']} IDs, skipped {stats['skipped']}, found {stats['found']} cases; "
+        f"reported up to CaseID {stats['last_settled']}"
+    )
+    if skipped_recorded:
+        print(
+            f"{sum(last - first + 1 for first, last in skipped_recorded)} skipped IDs are recorded; "
+            "the next run without --start probes them first"
+        )
+    if "failed_at" in stats:
+        print(f"Stopped at CaseID {stats['failed_at']} after repeated errors; the next run resumes there")
@@ -0,0 +1,48 @@
+from dbcore import claim_cases, release_cases, update_case_by_id
+from library import download_case_pdfs, PdfDownloadError
+from metrics import QUEUE_DEPTH, ITEMS_PROCESSED_TOTAL, SCRAPER_ERRORS_TOTAL
+from ..common import env_config
+
+
+def run(limit: int = 100, batch_size: int = 20, lease_seconds: int = 900):
+    print("Downloading PDF ...")
+
+    worker_id = env_config.get("WORKER_ID") or None
+    processed = 0
+
+    while processed < limit:
+        cases = claim_cases(
+            stage="download_pdf",
+            batch_size=min(batch_size, limit - processed),
+            lease_seconds=lease_seconds,
+            worker_id=worker_id
+        )
+        if not cases:
+            break
+
+        for index, case in enumerate(cases):
+            QUEUE_DEPTH.labels(queue="download_pdf").set(len(cases) - index)
+            processed += 1
+
+            try:
+                download_case_pdfs(
+                    case_id=case.id,
+                    pdf_url=case.pdf_url,
+                    pdf_name=case.pdf_name,
+                    save_root=env_config.get("CASE_PDF_PATH")
+                )
+            except PdfDownloadError as e:
+                # Keep the lease, so the case is retried once it expires rather than straight away
+                SCRAPER_ERRORS_TOTAL.labels(stage="download_pdf").inc()
+                print(f"Error: {e}")
+                continue
+
+            update_case_by_id(
+                case_id=case.id,
+                pdf_downloaded=True
+            )
+            release_cases([case.id], worker_id=worker_id)
+
+            ITEMS_PROCESSED_TOTAL.labels(stage="download_pdf").inc()
+
+    QUEUE_DEPTH.labels(queue="download_pdf").set(0)
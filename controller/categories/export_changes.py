@@ -0,0 +1,21 @@
+from dbcore import delete_export_watermark
+from library import export_case_changes
+from ..common import env_config
+
+
+def run(
+        consumer: str = "default",
+        format: str = "jsonl",
+        output_dir: str = None,
+        lag_seconds: int = 60,
+        reset: bool = False
+):
+    if reset and delete_export_watermark(consumer):
+        print(f"Watermark for '{consumer}' reset, exporting every case")
+
+    export_case_changes(
+        consumer=consumer,
+        output_dir=output_dir or env_config.get("EXPORT_PATH") or "./exports",
+        export_format=format,
+        lag_seconds=lag_seconds
+    )
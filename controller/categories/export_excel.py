@@ -0,0 +1,5 @@
+from library import export_cases_to_excel
+
+
+def run():
+    export_cases_to_excel()
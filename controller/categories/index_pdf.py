@@ -0,0 +1,12 @@
+from library import index_pdf_store
+from ..common import env_config
+
+
+def run(workers: int = None):
+    stats = index_pdf_store(root=env_config.get("CASE_PDF_PATH"), workers=workers)
+
+    print(
+        f"Indexed {stats['indexed']} PDFs, {stats['failed']} failed, "
+        f"{stats['unchanged']} unchanged, {stats['removed']} removed, "
+        f"{stats['unknown_case']} skipped without a case"
+    )
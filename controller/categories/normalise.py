@@ -0,0 +1,19 @@
+from library.case_normaliser import NORMALISED_COLUMNS, load_lpa_aliases, normalise_cases
+from ..common import env_config
+
+
+def run(lpa_lookup: str = None, chunk_size: int = 50_000, dry_run: bool = False):
+    lpa_lookup = lpa_lookup or env_config.get("LPA_LOOKUP_PATH") or None
+    aliases = load_lpa_aliases(lpa_lookup) if lpa_lookup else None
+
+    print("Normalising case fields" + (f" with {len(aliases)} LPA aliases from {lpa_lookup}" if aliases else ""))
+
+    stats = normalise_cases(lpa_aliases=aliases, chunk_size=chunk_size, dry_run=dry_run)
+
+    for column in NORMALISED_COLUMNS:
+        print(f"  {column:<26} {stats[column]} changed")
+
+    verb = "Would change" if dry_run else "Changed"
+    print(f"{verb} {stats['changed']} of {stats['cases']} cases")
+    if stats["stale"]:
+        print(f"{stats['stale']} values were left alone: their case changed since it was read")
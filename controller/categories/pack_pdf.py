@@ -0,0 +1,28 @@
+from library.pdf_shards import pack_pdf_store
+from ..common import env_config, get_pdf_shard_store
+
+
+def run(
+        min_age_days: float = 7,
+        max_shard_mb: int = 1024,
+        stored: bool = False,
+        limit: int = None,
+        keep_originals: bool = False
+):
+    store = get_pdf_shard_store(max_shard_bytes=max_shard_mb * 1024 * 1024, compress_level=None if stored else 6)
+
+    try:
+        stats = pack_pdf_store(
+            pdf_root=env_config.get("CASE_PDF_PATH"),
+            store=store,
+            min_age_seconds=min_age_days * 24 * 3600,
+            limit=limit,
+            keep_originals=keep_originals
+        )
+    finally:
+        store.close()
+
+    print(
+        f"Packed {stats['documents']} PDFs ({stats['bytes']} bytes) of {stats['cases']} cases into {store.root}; "
+        f"{stats['packed_before']} cases were packed before"
+    )
@@ -0,0 +1,29 @@
+from library import generate_monthly_dates
+from ..common import env_config, open_chromedriver, get_page_archive
+from ..pipeline import StreamingPipeline
+
+
+def run(
+        detail_workers: int = 2,
+        download_workers: int = 4,
+        queue_size: int = 100,
+        from_date: str = "01/01/2015",
+        to_date: str = "01/12/2022",
+        backlog: bool = False
+):
+    print(
+        f"Running pipeline from {from_date} to {to_date} with {detail_workers} detail "
+        f"and {download_workers} download workers"
+    )
+
+    StreamingPipeline(
+        monthly_dates=generate_monthly_dates(from_date=from_date, to_date=to_date),
+        driver_factory=open_chromedriver,
+        pdf_root=env_config.get("CASE_PDF_PATH"),
+        page_archive=get_page_archive(),
+        detail_workers=detail_workers,
+        download_workers=download_workers,
+        queue_size=queue_size,
+        backlog=backlog,
+        worker_id=env_config.get("WORKER_ID") or None
+    ).run()
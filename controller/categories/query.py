@@ -0,0 +1,86 @@
+import itertools
+import json
+import sys
+from dbcore import match_column_values, query_cases
+from dbcore.query import QUERY_COLUMNS
+
+# Width of each column in table output; longer values are cut short
+_TABLE_WIDTHS = {
+    "id": 8,
+    "reference": 22,
+    "type": 22,
+    "local_planning_authority": 30,
+    "officer": 22,
+    "status": 26,
+    "decision_date": 16,
+    "site_address": 48,
+}
+
+
+def _cell(value, width: int) -> str:
+    value = "" if value is None else " ".join(str(value).split())
+    return value if len(value) <= width else value[:width - 3] + "..."
+
+
+def run(
+        lpa: str = None,
+        officer: str = None,
+        status: str = None,
+        type: str = None,
+        text: str = None,
+        fuzzy: bool = False,
+        format: str = "table",
+        columns: str = None,
+        limit: int = None
+):
+    columns = tuple(name.strip() for name in columns.split(",")) if columns else QUERY_COLUMNS
+
+    filters = {}
+    for column_name, term in (
+            ("local_planning_authority", lpa), ("officer", officer), ("status", status), ("type", type)
+    ):
+        if term is None:
+            continue
+
+        try:
+            values = match_column_values(column_name, term, fuzzy=fuzzy)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return
+
+        if not values:
+            print(f"No {column_name} matches '{term}'" + ("" if fuzzy else " (try --fuzzy or a trailing *)"),
+                  file=sys.stderr)
+            return
+
+        if values != [term]:
+            print(f"{column_name} '{term}' -> {', '.join(values)}", file=sys.stderr)
+        filters[column_name] = values
+
+    # Results go to stdout and everything else to stderr, so the output can be piped
+    rows = query_cases(filters=filters, search_text=text, columns=columns, limit=limit)
+    count = 0
+
+    # The query is checked when its first row is asked for; report bad columns or text as usage errors
+    try:
+        first_row = next(rows, None)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return
+    if first_row is not None:
+        rows = itertools.chain([first_row], rows)
+
+    if format == "jsonl":
+        for row in rows:
+            sys.stdout.write(json.dumps(row, default=str) + "\n")
+            count += 1
+    else:
+        widths = [_TABLE_WIDTHS.get(name, 20) for name in columns]
+        print("  ".join(name[:width].ljust(width) for name, width in zip(columns, widths)))
+        print("  ".join("-" * width for width in widths))
+
+        for row in rows:
+            print("  ".join(_cell(row[name], width).ljust(width) for name, width in zip(columns, widths)))
+            count += 1
+
+    print(f"{count} case(s)", file=sys.stderr)
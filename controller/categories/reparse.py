@@ -0,0 +1,36 @@
+from case import reparse_archived_case_details
+from dbcore import bulk_update_cases, get_case_stats
+from library.case_normaliser import build_lpa_lookup, load_lpa_aliases, normalise_case_records
+from metrics import ITEMS_PROCESSED_TOTAL
+from ..common import env_config, get_page_archive
+
+
+def run(workers: int = None):
+    page_archive = get_page_archive()
+    workers = workers or int(env_config.get("REPARSE_WORKERS") or 0) or None
+
+    # Parsed values are normalised as the normalise category would, so they compare equal to cleaned ones
+    lpa_lookup_path = env_config.get("LPA_LOOKUP_PATH") or None
+    lpa_lookup = build_lpa_lookup(
+        get_case_stats("lpa"), load_lpa_aliases(lpa_lookup_path) if lpa_lookup_path else None
+    )
+
+    print(f"Re-parsing the latest archived page of {page_archive.count_cases('view_case')} cases ...")
+
+    batch = []
+    updated = 0
+
+    for case_id, dataset in reparse_archived_case_details(page_archive, workers=workers):
+        batch.append({"id": case_id, **dataset})
+
+        # Large batches for one executemany, still short enough not to hold the write lock for long
+        if len(batch) >= 5000:
+            updated += bulk_update_cases(normalise_case_records(batch, lpa_lookup), skip_unchanged=True)
+            batch = []
+
+    # Only cases already in the table are updated; archived pages of other cases are ignored.
+    # Postcodes are derived from the stored address, so the normalise category refreshes them.
+    updated += bulk_update_cases(normalise_case_records(batch, lpa_lookup), skip_unchanged=True)
+    ITEMS_PROCESSED_TOTAL.labels(stage="reparse").inc(updated)
+
+    print(f"Re-parsed and updated {updated} changed cases")
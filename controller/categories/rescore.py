@@ -0,0 +1,25 @@
+from dbcore import default_policies, rescore_cases
+from ..common import env_config
+
+
+def run(
+        recency_weight: int = 1000,
+        lpa: str = None,
+        lpa_weight: int = 2000,
+        decision_weight: int = 500,
+        retry_weight: int = 300
+):
+    lpas = (lpa or env_config.get("PRIORITY_LPAS") or "").split(",")
+    policies = default_policies(
+        recency_weight=recency_weight,
+        lpas=lpas,
+        lpa_weight=lpa_weight,
+        decision_weight=decision_weight,
+        retry_weight=retry_weight
+    )
+
+    print("Rescoring queued cases with " + ", ".join(f"{policy.name}={policy.weight}" for policy in policies))
+
+    changed = rescore_cases(policies)
+
+    print(f"Priority changed for {changed} cases")
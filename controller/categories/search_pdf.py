@@ -0,0 +1,13 @@
+from dbcore import search_pdf_documents
+
+
+def run(query: str, limit: int = 20):
+    hits = search_pdf_documents(query=query, limit=limit)
+
+    if not hits:
+        print("No matching documents.")
+        return
+
+    for position, hit in enumerate(hits, start=1):
+        print(f"{position:>3}. case {hit['case_id']} - {hit['filename']} (score {hit['rank']:.3f})")
+        print(f"     {' '.join((hit['snippet'] or '').split())}")
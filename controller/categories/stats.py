@@ -0,0 +1,33 @@
+import json
+import sys
+from dbcore import STATS_DIMENSIONS, get_case_stats, rebuild_case_stats
+
+
+def run(by: str = None, limit: int = 20, format: str = "table", rebuild: bool = False):
+    if rebuild:
+        print("Rebuilding case statistics from the cases table", file=sys.stderr)
+        print(f"{rebuild_case_stats()} summary rows written", file=sys.stderr)
+
+    dimensions = (by,) if by else STATS_DIMENSIONS
+    total = sum(cases for _, cases in get_case_stats("total"))
+
+    if format == "jsonl":
+        for dimension in dimensions:
+            for value, cases in get_case_stats(dimension, limit=limit):
+                sys.stdout.write(json.dumps({"dimension": dimension, "value": value, "cases": cases}) + "\n")
+        return
+
+    print(f"Total cases: {total}")
+
+    for dimension in dimensions:
+        rows = get_case_stats(dimension, limit=limit)
+
+        print()
+        print(f"{dimension:<40}  {'cases':>9}  {'share':>6}")
+        print(f"{'-' * 40}  {'-' * 9}  {'-' * 6}")
+
+        for value, cases in rows:
+            value = value or "(none)"
+            value = value if len(value) <= 40 else value[:37] + "..."
+            share = cases / total * 100 if total else 0
+            print(f"{value:<40}  {cases:>9}  {share:>5.1f}%")
@@ -0,0 +1,10 @@
+from dbcore import count_cases_by_stage
+
+
+def run():
+    counts = count_cases_by_stage()
+
+    print(f"Total cases:                {counts['total']}")
+    print(f"Waiting for case details:   {counts['pending_details']}")
+    print(f"Waiting for PDF download:   {counts['pending_download']}")
+    print(f"PDFs downloaded:            {counts['downloaded']}")
@@ -0,0 +1,17 @@
+from library import verify_pdf_store
+from library.pdf_verifier import BAD_STATUSES
+from ..common import env_config
+
+
+def run(workers: int = None, no_requeue: bool = False):
+    stats = verify_pdf_store(root=env_config.get("CASE_PDF_PATH"), workers=workers, requeue=not no_requeue)
+
+    print(f"Verified {stats['verified']} PDFs ({stats['unchanged']} unchanged): {stats['ok']} ok")
+    for status in BAD_STATUSES:
+        if stats.get(status):
+            print(f"  {status}: {stats[status]}")
+    if stats["unknown_case"]:
+        print(f"Skipped {stats['unknown_case']} PDFs without a case")
+
+    if not no_requeue:
+        print(f"Re-queued {stats['requeued']} cases for download")
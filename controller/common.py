@@ -0,0 +1,43 @@
+from dbcore.config import get_config
+
+env_config = get_config()
+
+
+def open_chromedriver(**options):
+    """
+    Initialize the Selenium Chrome driver shared by every target of a run.
+
+    With BROWSER_DAEMON_ADDRESS set, a warm browser is leased from the browser daemon
+    (quit() hands it back); if the daemon is down or busy, Chrome is launched as usual.
+    """
+    from selenium_webdriver import get_selenium_chrome_driver, lease_chromedriver, BrowserDaemonError
+
+    daemon_address = env_config.get("BROWSER_DAEMON_ADDRESS")
+    if daemon_address:
+        try:
+            return lease_chromedriver(
+                daemon_address,
+                chromedriver_path=env_config.get("CHROMEDRIVER_PATH"),
+                owner=env_config.get("WORKER_ID") or None,
+                **options
+            )
+        except BrowserDaemonError as e:
+            print(f"No browser from the daemon ({e}), launching Chrome")
+
+    return get_selenium_chrome_driver(
+        headless=False,
+        chromedriver_path=env_config.get("CHROMEDRIVER_PATH"),
+        **options
+    )
+
+
+def get_page_archive():
+    from library.page_archive import PageArchive
+
+    return PageArchive(env_config.get("PAGE_ARCHIVE_PATH") or "./page_archive")
+
+
+def get_pdf_shard_store(**options):
+    from library.pdf_shards import PdfShardStore
+
+    return PdfShardStore(env_config.get("PDF_SHARD_PATH") or "./PDF_shards", **options)
@@ -0,0 +1,303 @@
+import queue
+import random
+import threading
+import time
+from typing import Callable
+from case import CaseSearchSession, get_uk_gov_case_details_by_id
+from case.case_details_scraper import UKGovernmentCaseScraperError
+from dbcore import create_cases, update_case_by_id, claim_cases, release_cases
+from library import download_case_pdfs, PageArchive
+from selenium_webdriver import BrowserLeaseLostError
+from metrics import QUEUE_DEPTH, ITEMS_PROCESSED_TOTAL, SCRAPER_ERRORS_TOTAL
+
+# Marks the end of a queue for one consumer
+_STOP = object()
+
+
+class StreamingPipeline:
+    """
+    Run discovery, case details and PDF downloads concurrently, linked by bounded queues.
+
+    - One discovery thread walks the monthly search windows and persists new case IDs,
+      handing each one straight to the details stage.
+    - `detail_workers` threads (one Chrome each) scrape and persist case details, and
+      hand cases with decision documents straight to the download stage.
+    - `download_workers` threads download PDFs and mark the case as downloaded.
+
+    Queues are bounded, so a slow stage makes the stages before it wait (backpressure)
+    instead of buffering unbounded work in memory. Every stage persists its output as
+    it goes, so an interrupted run loses at most the items in flight; those are picked
+    up again by the next run (or with `backlog=True`).
+
+    Every case is claimed (see dbcore.claim) before it is queued, so other nodes skip
+    it. Case details are claimed `claim_batch_size` at a time, and only once the queue
+    has run down to that many, so no claimed case waits out its `lease_seconds`.
+    """
+
+    def __init__(
+            self,
+            monthly_dates: list[str],
+            driver_factory: Callable,
+            pdf_root: str,
+            page_archive: PageArchive = None,
+            detail_workers: int = 2,
+            download_workers: int = 4,
+            queue_size: int = 100,
+            backlog: bool = False,
+            worker_id: str = None,
+            politeness_delay: tuple[float, float] = (1.0, 6.0),
+            claim_batch_size: int = 50,
+            lease_seconds: int = 900,
+            backlog_limit: int = 1000
+    ):
+        self.monthly_dates = monthly_dates
+        self.driver_factory = driver_factory
+        self.pdf_root = pdf_root
+        self.page_archive = page_archive
+        self.detail_workers = detail_workers
+        self.download_workers = download_workers
+        self.backlog = backlog
+        self.worker_id = worker_id
+        self.politeness_delay = politeness_delay
+        self.claim_batch_size = claim_batch_size
+        self.lease_seconds = lease_seconds
+        self.backlog_limit = backlog_limit
+
+        self.case_id_queue = queue.Queue(maxsize=queue_size)
+        self.pdf_queue = queue.Queue(maxsize=queue_size)
+        self.stop_event = threading.Event()
+
+        self._alive_lock = threading.Lock()
+        self._alive = {}
+        self._stopping_reason = None
+
+    # ---------------------------------------------------------------
+    # Queue helpers - poll so a stop request is noticed while blocked
+    # ---------------------------------------------------------------
+    def _put(self, q: queue.Queue, name: str, item, force: bool = False) -> bool:
+        while force or not self.stop_event.is_set():
+            try:
+                q.put(item, timeout=1)
+                QUEUE_DEPTH.labels(queue=name).set(q.qsize())
+                return True
+            except queue.Full:
+                if force and self.stop_event.is_set():
+                    return False
+        return False
+
+    def _get(self, q: queue.Queue, name: str):
+        while not self.stop_event.is_set():
+            try:
+                item = q.get(timeout=1)
+                QUEUE_DEPTH.labels(queue=name).set(q.qsize())
+                return item
+            except queue.Empty:
+                continue
+        return _STOP
+
+    def _queue_case_details(self, case_ids: list[int] = None, limit: int = None) -> int:
+        """
+        Claim cases for the details stage in small batches and queue them.
+
+        Args:
+            case_ids: Cases to claim (e.g. just discovered); by default the backlog of the stage
+            limit: Maximum number of cases to queue
+
+        Returns:
+            int: Number of cases queued
+        """
+        queued = 0
+
+        while not self.stop_event.is_set() and (limit is None or queued < limit):
+            # Claim only what the workers reach soon, so leases do not run out in the queue
+            while self.case_id_queue.qsize() > self.claim_batch_size and not self.stop_event.is_set():
+                time.sleep(0.5)
+
+            batch_size = self.claim_batch_size if limit is None else min(self.claim_batch_size, limit - queued)
+            batch_ids = None
+            if case_ids is not None:
+                batch_ids, case_ids = case_ids[:batch_size], case_ids[batch_size:]
+                if not batch_ids:
+                    break
+
+            cases = claim_cases(
+                stage="case_details",
+                batch_size=batch_size,
+                lease_seconds=self.lease_seconds,
+                worker_id=self.worker_id,
+                case_ids=batch_ids
+            )
+            if not cases and batch_ids is None:
+                break
+
+            for case in cases:
+                self._put(self.case_id_queue, "case_details", case.id)
+            queued += len(cases)
+
+        return queued
+
+    def _worker_finished(self, stage: str, completed: bool):
+        with self._alive_lock:
+            self._alive[stage] -= 1
+            if not completed and self._alive[stage] == 0 and not self.stop_event.is_set():
+                # Nobody is left to consume this stage's queue; stop instead of blocking forever
+                self._stopping_reason = f"all {stage} workers failed"
+
+    # ---------------------------------------------------------------
+    # Stages
+    # ---------------------------------------------------------------
+    def _discover(self):
+        driver = None
+
+        try:
+            if self.backlog:
+                # Claim the backlog, so other nodes running the same stages skip these cases
+                for case in claim_cases(
+                        stage="download_pdf", batch_size=100, lease_seconds=self.lease_seconds, worker_id=self.worker_id
+                ):
+                    self._put(self.pdf_queue, "download_pdf", (case.id, case.pdf_url, case.pdf_name))
+                self._queue_case_details(limit=self.backlog_limit)
+
+            driver = self.driver_factory()
+            search_session = CaseSearchSession(driver, page_archive=self.page_archive)
+
+            for monthly_date in self.monthly_dates:
+                if self.stop_event.is_set():
+                    break
+
+                print(f"Checking > {monthly_date}")
+
+                try:
+                    case_ids = search_session.search(monthly_date)
+                except BrowserLeaseLostError:
+                    raise
+                except Exception as e:
+                    SCRAPER_ERRORS_TOTAL.labels(stage="case_id").inc()
+                    print(f"Error searching cases from {monthly_date}: {e}")
+                    continue
+
+                # Only newly created cases flow on; existing ones are done or in the backlog
+                self._queue_case_details(case_ids=create_cases(list(case_ids)))
+
+                ITEMS_PROCESSED_TOTAL.labels(stage="case_id").inc()
+
+        finally:
+            if driver is not None:
+                driver.quit()
+
+            for _ in range(self.detail_workers):
+                self._put(self.case_id_queue, "case_details", _STOP, force=True)
+
+    def _scrape_details(self):
+        driver = None
+        completed = False
+
+        try:
+            driver = self.driver_factory()
+
+            while True:
+                case_id = self._get(self.case_id_queue, "case_details")
+                if case_id is _STOP:
+                    completed = True
+                    break
+
+                try:
+                    dataset = get_uk_gov_case_details_by_id(
+                        case_id=case_id,
+                        webdriver_instance=driver,
+                        page_archive=self.page_archive
+                    )
+                except UKGovernmentCaseScraperError as e:
+                    print(f"Error: {e}")
+                    continue
+
+                update_case_by_id(case_id=case_id, **dataset)
+                release_cases([case_id], worker_id=self.worker_id)
+                ITEMS_PROCESSED_TOTAL.labels(stage="case_details").inc()
+
+                # Claimed for the download stage too, so its release below has a lease to release
+                if dataset.get("pdf_url") and claim_cases(
+                        stage="download_pdf",
+                        batch_size=1,
+                        lease_seconds=self.lease_seconds,
+                        worker_id=self.worker_id,
+                        case_ids=[case_id]
+                ):
+                    self._put(self.pdf_queue, "download_pdf", (case_id, dataset["pdf_url"], dataset.get("pdf_name")))
+
+                # Stay polite to the site, as the case-details category does
+                time.sleep(random.uniform(*self.politeness_delay))
+
+        finally:
+            if driver is not None:
+                driver.quit()
+            self._worker_finished("case_details", completed)
+
+    def _download(self):
+        completed = False
+
+        try:
+            while True:
+                item = self._get(self.pdf_queue, "download_pdf")
+                if item is _STOP:
+                    completed = True
+                    break
+
+                case_id, pdf_url, pdf_name = item
+
+                try:
+                    download_case_pdfs(case_id=case_id, pdf_url=pdf_url, pdf_name=pdf_name, save_root=self.pdf_root)
+                except Exception as e:
+                    SCRAPER_ERRORS_TOTAL.labels(stage="download_pdf").inc()
+                    print(f"Error downloading PDFs for case {case_id}: {e}")
+                    continue
+
+                update_case_by_id(case_id=case_id, pdf_downloaded=True)
+                release_cases([case_id], worker_id=self.worker_id)
+                ITEMS_PROCESSED_TOTAL.labels(stage="download_pdf").inc()
+
+        finally:
+            self._worker_finished("download_pdf", completed)
+
+    # ---------------------------------------------------------------
+    # Orchestration
+    # ---------------------------------------------------------------
+    def _start(self, target: Callable, name: str, count: int) -> list[threading.Thread]:
+        with self._alive_lock:
+            self._alive[name] = count
+
+        threads = [threading.Thread(target=target, name=f"{name}-{i + 1}", daemon=True) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _join(self, threads: list[threading.Thread]):
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1)
+                if self._stopping_reason and not self.stop_event.is_set():
+                    print(f"Stopping pipeline: {self._stopping_reason}")
+                    self.stop_event.set()
+
+    def run(self):
+        """Run all stages until discovery is exhausted and every queue is drained."""
+        download_threads = self._start(self._download, "download_pdf", self.download_workers)
+        detail_threads = self._start(self._scrape_details, "case_details", self.detail_workers)
+        discovery_threads = self._start(self._discover, "case_id", 1)
+
+        try:
+            self._join(discovery_threads)
+            self._join(detail_threads)
+
+            # Details are done, so nothing else will be queued for download
+            for _ in range(self.download_workers):
+                self._put(self.pdf_queue, "download_pdf", _STOP, force=True)
+
+            self._join(download_threads)
+
+        except KeyboardInterrupt:
+            print("Interrupted, finishing in-flight items ...")
+            self.stop_event.set()
+            for thread in discovery_threads + detail_threads + download_threads:
+                thread.join()
+            raise
@@ -0,0 +1,289 @@
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Category:
+    """
+    A CLI category and where its implementation lives.
+
+    The implementation is referenced as "package.module:function" and only imported
+    when the category runs, so heavy dependencies (Selenium, pandas, SQLAlchemy, ...)
+    are never loaded for categories that do not need them.
+
+    Attributes:
+        name: Name used on the command line, e.g. "case-details"
+        target: Import path of the function to run, e.g. "controller.categories.case_details:run"
+        help: One-line description shown in --help
+        arguments: argparse arguments as (flags, kwargs) pairs; parsed values are passed
+                   to the target function as keyword arguments
+    """
+    name: str
+    target: str
+    help: str = ""
+    arguments: tuple = field(default_factory=tuple)
+
+    def load(self) -> Callable:
+        module_name, _, function_name = self.target.partition(":")
+        return getattr(import_module(module_name), function_name)
+
+
+_categories: dict[str, Category] = {}
+
+
+def register_category(name: str, target: str, help: str = "", arguments: tuple = ()) -> Category:
+    """
+    Register a CLI category.
+
+    Args:
+        name (str): Name used on the command line
+        target (str): "package.module:function" implementing the category
+        help (str): One-line description shown in --help
+        arguments (tuple): argparse arguments as (flags, kwargs) pairs
+
+    Returns:
+        Category: The registered category
+
+    Raises:
+        ValueError: If a category with the same name is already registered
+    """
+    if name in _categories:
+        raise ValueError(f"Category '{name}' is already registered")
+
+    category = Category(name=name, target=target, help=help, arguments=tuple(arguments))
+    _categories[name] = category
+    return category
+
+
+def get_category(name: str) -> Category:
+    """
+    Look up a registered category.
+
+    Raises:
+        KeyError: If no category with that name is registered
+    """
+    try:
+        return _categories[name]
+    except KeyError:
+        raise KeyError(f"Unknown category '{name}'. Available: {', '.join(_categories)}") from None
+
+
+def list_categories() -> list[Category]:
+    return list(_categories.values())
+
+
+def load_plugins(module_names: str):
+    """
+    Import plugin modules so they can call `register_category`.
+
+    Args:
+        module_names (str): Comma-separated module names (e.g. from CATEGORY_PLUGINS in .env)
+    """
+    for module_name in filter(None, (name.strip() for name in (module_names or "").split(","))):
+        import_module(module_name)
+
+
+# -------------------------------------------------------------------
+# Built-in categories
+# -------------------------------------------------------------------
+register_category(
+    "case-id",
+    "controller.categories.case_id:run",
+    help="Discover case IDs through the case search form"
+)
+
+register_category(
+    "case-id-probe",
+    "controller.categories.case_id_probe:run",
+    help="Discover case IDs by probing ViewCase.aspx?CaseID=N directly",
+    arguments=(
+        (("--start",), {"type": int, "default": None, "help": "First CaseID (default: IDs earlier runs skipped, then after the last probed range)"}),
+        (("--end",), {"type": int, "default": None, "help": "Last CaseID (default: stop after --max-gap IDs without a case)"}),
+        (("--workers",), {"type": int, "default": 8, "help": "Concurrent requests (default: 8)"}),
+        (("--max-gap",), {"type": int, "default": 5000, "help": "IDs without a case before an open-ended run stops (default: 5000)"}),
+        (("--max-stride",), {"type": int, "default": 64, "help": "Largest step between probes in sparse gaps (default: 64)"}),
+        (("--delay",), {"type": float, "default": 0.1, "help": "Pause before each request per worker, in seconds (default: 0.1)"}),
+        (("--base-url",), {"default": None, "help": "ViewCase.aspx URL to probe (default: the Planning Inspectorate site)"}),
+    )
+)
+
+register_category(
+    "case-details",
+    "controller.categories.case_details:run",
+    help="Scrape details for cases without a reference",
+    arguments=(
+        (("--limit",), {"type": int, "default": 1000, "help": "Maximum cases to process (default: 1000)"}),
+        (("--batch-size",), {"type": int, "default": 50, "help": "Cases claimed per lease (default: 50)"}),
+        (("--lease-seconds",), {"type": int, "default": 900, "help": "Lease duration in seconds (default: 900)"}),
+        (("--tabs",), {"type": int, "default": 1, "help": "Pages loading at once in tabs of one Chrome (default: 1)"}),
+    )
+)
+
+register_category(
+    "download-pdf",
+    "controller.categories.download_pdf:run",
+    help="Download decision PDFs for scraped cases",
+    arguments=(
+        (("--limit",), {"type": int, "default": 100, "help": "Maximum cases to process (default: 100)"}),
+        (("--batch-size",), {"type": int, "default": 20, "help": "Cases claimed per lease (default: 20)"}),
+        (("--lease-seconds",), {"type": int, "default": 900, "help": "Lease duration in seconds (default: 900)"}),
+    )
+)
+
+register_category(
+    "export-excel",
+    "controller.categories.export_excel:run",
+    help="Export all cases to an Excel file"
+)
+
+register_category(
+    "export-changes",
+    "controller.categories.export_changes:run",
+    help="Export cases inserted or updated since the consumer's last export, with a manifest",
+    arguments=(
+        (("--consumer",), {"default": "default", "help": "Consumer whose watermark to use (default: default)"}),
+        (("--format",), {"choices": ("jsonl", "parquet"), "default": "jsonl", "help": "Output format (default: jsonl)"}),
+        (("--output-dir",), {"default": None, "help": "Export root (default: EXPORT_PATH or ./exports)"}),
+        (("--lag-seconds",), {"type": int, "default": 60, "help": "Leave changes younger than this for the next run (default: 60)"}),
+        (("--reset",), {"action": "store_true", "help": "Forget the watermark and export every case"}),
+    )
+)
+
+register_category(
+    "reparse",
+    "controller.categories.reparse:run",
+    help="Re-parse archived case pages into existing cases, normalised (run normalise after it for postcodes)",
+    arguments=(
+        (("--workers",), {"type": int, "default": None, "help": "Worker processes (default: REPARSE_WORKERS or CPU count)"}),
+    )
+)
+
+register_category(
+    "pipeline",
+    "controller.categories.pipeline:run",
+    help="Discover, scrape and download in one run, streaming work between stages",
+    arguments=(
+        (("--detail-workers",), {"type": int, "default": 2, "help": "Chrome instances scraping case details (default: 2)"}),
+        (("--download-workers",), {"type": int, "default": 4, "help": "Threads downloading PDFs (default: 4)"}),
+        (("--queue-size",), {"type": int, "default": 100, "help": "Capacity of each queue between stages (default: 100)"}),
+        (("--from-date",), {"default": "01/01/2015", "help": "First search month, dd/mm/yyyy (default: 01/01/2015)"}),
+        (("--to-date",), {"default": "01/12/2022", "help": "Last search month, dd/mm/yyyy (default: 01/12/2022)"}),
+        (("--backlog",), {"action": "store_true", "help": "Also feed cases left pending by earlier runs"}),
+    )
+)
+
+register_category(
+    "index-pdf",
+    "controller.categories.index_pdf:run",
+    help="Extract text from new or changed downloaded PDFs into the full-text index",
+    arguments=(
+        (("--workers",), {"type": int, "default": None, "help": "Worker processes (default: CPU count)"}),
+    )
+)
+
+register_category(
+    "search-pdf",
+    "controller.categories.search_pdf:run",
+    help="Full-text search over indexed PDFs",
+    arguments=(
+        (("query",), {"help": "Search query, e.g. 'noise AND \"wind turbine\"'"}),
+        (("--limit",), {"type": int, "default": 20, "help": "Maximum number of hits (default: 20)"}),
+    )
+)
+
+register_category(
+    "query",
+    "controller.categories.query:run",
+    help="Look up cases by LPA, officer, status, type or address text",
+    arguments=(
+        (("--lpa",), {"help": "Local planning authority; end with * for a prefix, e.g. 'Leeds*'"}),
+        (("--officer",), {"help": "Case officer; end with * for a prefix"}),
+        (("--status",), {"help": "Case status; end with * for a prefix"}),
+        (("--type",), {"help": "Case type; end with * for a prefix"}),
+        (("--text",), {"help": "Words to find in the site address, LPA or officer, e.g. 'high st'"}),
+        (("--fuzzy",), {"action": "store_true", "help": "Match misspelt --lpa/--officer/--status/--type values"}),
+        (("--format",), {"choices": ("table", "jsonl"), "default": "table", "help": "Output format (default: table)"}),
+        (("--columns",), {"default": None, "help": "Comma-separated columns to output (default: the main case fields)"}),
+        (("--limit",), {"type": int, "default": None, "help": "Maximum number of cases (default: all)"}),
+    )
+)
+
+register_category(
+    "verify-pdf",
+    "controller.categories.verify_pdf:run",
+    help="Check new or changed downloaded PDFs and re-queue damaged ones for download",
+    arguments=(
+        (("--workers",), {"type": int, "default": None, "help": "Worker processes (default: CPU count)"}),
+        (("--no-requeue",), {"action": "store_true", "help": "Only report bad files, do not re-queue their cases"}),
+    )
+)
+
+register_category(
+    "browser-daemon",
+    "controller.categories.browser_daemon:run",
+    help="Keep warm Chrome browsers running for case-id, case-details and pipeline runs to lease",
+    arguments=(
+        (("--browsers",), {"type": int, "default": 2, "help": "Browsers in the pool (default: 2)"}),
+        (("--address",), {"default": None, "help": "host:port to listen on (default: BROWSER_DAEMON_ADDRESS or 127.0.0.1:9600)"}),
+        (("--first-debugging-port",), {"type": int, "default": 9222, "help": "Remote-debugging port of the first browser (default: 9222)"}),
+        (("--lease-seconds",), {"type": int, "default": 600, "help": "Lease length without renewal (default: 600)"}),
+        (("--headless",), {"action": "store_true", "help": "Run the browsers headless"}),
+        (("--status",), {"action": "store_true", "help": "Show the pool of a running daemon and exit"}),
+    )
+)
+
+register_category(
+    "normalise",
+    "controller.categories.normalise:run",
+    help="Clean up scraped fields: spacing, LPA spellings, officer names, ISO decision dates, postcodes",
+    arguments=(
+        (("--lpa-lookup",), {"default": None, "help": "CSV of alias,canonical LPA names (default: LPA_LOOKUP_PATH)"}),
+        (("--chunk-size",), {"type": int, "default": 50_000, "help": "Cases normalised per batch (default: 50000)"}),
+        (("--dry-run",), {"action": "store_true", "help": "Count the changes without writing them"}),
+    )
+)
+
+register_category(
+    "pack-pdf",
+    "controller.categories.pack_pdf:run",
+    help="Move PDFs of completed cases into size-bounded zip shards",
+    arguments=(
+        (("--min-age-days",), {"type": float, "default": 7, "help": "Leave cases downloaded more recently in place (default: 7)"}),
+        (("--max-shard-mb",), {"type": int, "default": 1024, "help": "Start a new shard above this size (default: 1024)"}),
+        (("--stored",), {"action": "store_true", "help": "Store PDFs without compressing them again"}),
+        (("--limit",), {"type": int, "default": None, "help": "Maximum number of cases to pack (default: all)"}),
+        (("--keep-originals",), {"action": "store_true", "help": "Leave the per-case files in place after packing"}),
+    )
+)
+
+register_category(
+    "rescore",
+    "controller.categories.rescore:run",
+    help="Recompute the priority in which queued cases are scraped and downloaded",
+    arguments=(
+        (("--recency-weight",), {"type": int, "default": 1000, "help": "Priority of the newest case over the oldest (default: 1000)"}),
+        (("--lpa",), {"default": None, "help": "Comma-separated LPAs to do first (default: PRIORITY_LPAS)"}),
+        (("--lpa-weight",), {"type": int, "default": 2000, "help": "Priority added for the --lpa authorities (default: 2000)"}),
+        (("--decision-weight",), {"type": int, "default": 500, "help": "Priority added for cases with a decision (default: 500)"}),
+        (("--retry-weight",), {"type": int, "default": 300, "help": "Priority removed per failed attempt (default: 300)"}),
+    )
+)
+
+register_category(
+    "stats",
+    "controller.categories.stats:run",
+    help="Show case counts by LPA, status, type and decision year",
+    arguments=(
+        (("--by",), {"choices": ("lpa", "status", "type", "decision_year"), "default": None, "help": "Only this breakdown (default: all)"}),
+        (("--limit",), {"type": int, "default": 20, "help": "Values per breakdown, largest first (default: 20)"}),
+        (("--format",), {"choices": ("table", "jsonl"), "default": "table", "help": "Output format (default: table)"}),
+        (("--rebuild",), {"action": "store_true", "help": "Recompute the counts from the cases table first"}),
+    )
+)
+
+register_category(
+    "status",
+    "controller.categories.status:run",
+    help="Show how many cases are waiting in each stage"
+)
@@ -1,116 +1,40 @@
-import random
-import time
-from pathlib import Path
-from selenium_webdriver import get_selenium_chrome_driver
-from .get_scrapers import get_scraper_function
-from dbcore import get_config, create_case, get_cases_with_none_reference, update_case_by_id, get_cases_with_pdf_url
-from library import generate_monthly_dates, download_pdf, export_cases_to_excel
+from contextlib import nullcontext
+from metrics import metrics_run, profile_run
+from .common import env_config
+from .registry import get_category
 
-env_config = get_config()
 
-
-def run_scraper(category: str):
+def run_scraper(category: str, profile: str = None, **options):
     """
     Run scraper based on category and target.
 
-    Args:
-        category (str): Scraper category ('case-id' or 'case-details')
-    """
-
-    if category == 'case-id':
-        # Initialize Selenium Chrome driver once for all targets
-        chromedriver = get_selenium_chrome_driver(
-            headless=False,
-            chromedriver_path=env_config.get("CHROMEDRIVER_PATH")
-        )
-
-        monthly_dates = generate_monthly_dates(from_date="01/01/2015", to_date="01/12/2022")
-
-        print(f"Scraping: {category}")
-        scraper_func = get_scraper_function(category)
-
-        for monthly_date in monthly_dates:
-
-            dataset = scraper_func(chromedriver=chromedriver, start_date=monthly_date)
-
-            print(f"Checking > {monthly_date}")
-
-            for data in dataset:
-                create_case(_id=data)
-
-    elif category == 'case-details':
-        # Initialize Selenium Chrome driver once for all targets
-        chromedriver = get_selenium_chrome_driver(
-            headless=False,
-            chromedriver_path=env_config.get("CHROMEDRIVER_PATH")
-        )
-
-        print(f"Scraping {category}")
-        scraper_fuc = get_scraper_function(category)
-
-        cases = get_cases_with_none_reference(offset=11)
-
-        for case in cases:
-            dataset = scraper_fuc(
-                webdriver_instance=chromedriver,
-                case_id=case.id
-            )
-
-            # Wait for random second from 1 to 10
-            time.sleep(random.randint(1, 6))
+    The category is looked up in the registry and its implementation is imported
+    only now, so a run pays only for the dependencies of its own category.
 
-            update_case_by_id(
-                case_id=case.id,
-                reference=dataset.get("reference"),
-                site_address=dataset.get("site_address"),
-                type=dataset.get("type"),
-                local_planning_authority=dataset.get("local_planning_authority"),
-                officer=dataset.get("officer"),
-                status=dataset.get("status"),
-                decision_date=dataset.get("decision_date"),
-                pdf_url=dataset.get("pdf_url"),
-                pdf_name=dataset.get("pdf_name"),
-            )
+    Metrics are collected for the whole run; set METRICS_PROMETHEUS_PATH and/or
+    METRICS_JSON_PATH in .env to have them written periodically (every
+    METRICS_INTERVAL seconds). A summary is printed when the run ends.
 
-    elif category == 'download-pdf':
+    With `profile`, the run is also profiled and the profile files are written to
+    PROFILE_PATH (default ./profiles), see `metrics.profile_run`.
 
-        print("Downloading PDF ...")
-
-        cases = get_cases_with_pdf_url()
-
-        for case in cases:
-
-            # Split both pdf_url and pdf_name by "|" to handle multiple URLs and corresponding names
-            pdf_urls = case.pdf_url.split("|") if case.pdf_url else []
-            pdf_names = case.pdf_name.split("|") if case.pdf_name else []
-
-            # Ensure we have the same number of URLs and names, or handle mismatches
-            max_count = max(len(pdf_urls), len(pdf_names))
-
-            for i in range(max_count):
-
-                # Get URL and name, with fallback handling
-                url = pdf_urls[i].strip() if i < len(pdf_urls) else None
-                filename = pdf_names[i].strip() if i < len(pdf_names) else f"document_{i + 1}.pdf"
-
-                if url:  # Only process non-empty URLs
-
-                    print(f"Downloading PDF {i + 1}/{max_count} for case {case.id}: {filename}")
-
-                    download_pdf(
-                        url=url,
-                        save_path=str(Path(env_config.get("CASE_PDF_PATH")) / str(case.id)),
-                        filename=filename
-                    )
-
-            update_case_by_id(
-                case_id=case.id,
-                pdf_downloaded=True
-            )
-
-    elif category == 'export-excel':
-        export_cases_to_excel()
-
-    else:
-        # Category not recognized, no operation
-        pass
\ No newline at end of file
+    Args:
+        category (str): Registered category name (e.g. 'case-id' or 'case-details')
+        profile (str, optional): Profile mode, "sample" or "cprofile"
+        **options: Category-specific options, passed to the category function
+    """
+    run_category = get_category(category).load()
+
+    profiling = profile_run(
+        category=category,
+        mode=profile,
+        output_dir=env_config.get("PROFILE_PATH") or "./profiles"
+    ) if profile else nullcontext()
+
+    with metrics_run(
+            category=category,
+            prometheus_path=env_config.get("METRICS_PROMETHEUS_PATH"),
+            json_path=env_config.get("METRICS_JSON_PATH"),
+            interval=float(env_config.get("METRICS_INTERVAL") or 15)
+    ), profiling:
+        run_category(**options)
@@ -1,9 +1,72 @@
-from .config import get_config
-from .session import Base
-from .database import Database
-from .models import Case
-from .create import create_case
-from .get import get_cases_with_none_reference
-from .update import update_case_by_id
-from .get import get_cases_with_pdf_url
-from .get import get_all_cases
+from importlib import import_module
+
+# Exports are resolved on first access (PEP 562), so `import dbcore` - or
+# `from dbcore.config import get_config` - does not pull in SQLAlchemy until
+# something actually touches the database. Base is taken from .models, so its
+# metadata carries every table (alembic autogenerate compares against it).
+_exports = {
+    "get_config": ".config",
+    "Base": ".models",
+    "Database": ".database",
+    "Case": ".models",
+    "PdfDocument": ".models",
+    "PdfFile": ".models",
+    "ProbedRange": ".models",
+    "ExportWatermark": ".models",
+    "CaseStat": ".models",
+    "create_case": ".create",
+    "create_cases": ".create",
+    "get_cases_with_none_reference": ".get",
+    "get_cases_with_pdf_url": ".get",
+    "get_all_cases": ".get",
+    "get_existing_case_ids": ".get",
+    "count_cases_by_stage": ".get",
+    "iter_case_chunks": ".get",
+    "update_case_by_id": ".update",
+    "bulk_update_cases": ".update",
+    "upsert_cases": ".update",
+    "update_cases_where_unchanged": ".update",
+    "claim_cases": ".claim",
+    "release_cases": ".claim",
+    "renew_leases": ".claim",
+    "default_worker_id": ".claim",
+    "PriorityPolicy": ".priority",
+    "PRIORITY_POLICIES": ".priority",
+    "default_policies": ".priority",
+    "rescore_cases": ".priority",
+    "STATS_DIMENSIONS": ".stats",
+    "get_case_stats": ".stats",
+    "rebuild_case_stats": ".stats",
+    "get_indexed_pdf_documents": ".pdf_index",
+    "upsert_pdf_documents": ".pdf_index",
+    "delete_pdf_documents": ".pdf_index",
+    "search_pdf_documents": ".pdf_index",
+    "record_pdf_downloads": ".pdf_files",
+    "get_pdf_file_states": ".pdf_files",
+    "save_pdf_verifications": ".pdf_files",
+    "requeue_pdf_downloads": ".pdf_files",
+    "get_completed_pdf_case_ids": ".pdf_files",
+    "mark_pdf_files_packed": ".pdf_files",
+    "get_packed_pdf_paths": ".pdf_files",
+    "match_column_values": ".query",
+    "query_cases": ".query",
+    "get_probe_high_water_mark": ".probe",
+    "get_skipped_probe_ranges": ".probe",
+    "get_lowest_case_id": ".probe",
+    "record_probed_range": ".probe",
+    "get_export_watermark": ".watermark",
+    "set_export_watermark": ".watermark",
+    "delete_export_watermark": ".watermark",
+    "iter_changed_cases": ".watermark",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
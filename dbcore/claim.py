@@ -0,0 +1,182 @@
+import os
+import socket
+import time
+from datetime import timedelta
+from sqlalchemy import select, update, and_, or_, func
+from sqlalchemy.exc import OperationalError
+from .session import db as db_instance
+from .models import Case
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL, RETRIES_TOTAL
+
+# Which cases each stage works on
+CLAIM_STAGES = {
+    "case_details": lambda: Case.reference.is_(None),
+    "download_pdf": lambda: and_(Case.pdf_url.isnot(None), Case.pdf_downloaded == False),
+}
+
+
+def default_worker_id() -> str:
+    """Identify this worker as host:pid, unique across the nodes sharing the database."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _db_now(dialect_name: str):
+    # Lease times come from the database clock, so nodes with skewed clocks agree on expiry
+    if dialect_name == "sqlite":
+        return func.datetime("now")
+    return func.now()
+
+
+def _db_now_plus(dialect_name: str, seconds: int):
+    if dialect_name == "sqlite":
+        return func.datetime("now", f"+{int(seconds)} seconds")
+    return func.now() + timedelta(seconds=seconds)
+
+
+def claim_cases(
+        stage: str,
+        batch_size: int = 100,
+        lease_seconds: int = 900,
+        worker_id: str = None,
+        max_attempts: int = 5,
+        case_ids: list[int] = None
+) -> list[Case]:
+    """
+    Atomically claim a batch of cases for a stage, so concurrent workers never get the same case.
+
+    A case can be claimed when it matches the stage and has no lease, or its lease has
+    expired (e.g. the worker holding it crashed). Cases are claimed highest priority
+    first (see dbcore.priority), then by ID. Claiming sets `lease_owner` and
+    `lease_expires_at` and counts the attempt, in a single UPDATE:
+    - PostgreSQL: candidates are selected with FOR UPDATE SKIP LOCKED, so concurrent
+      claimers skip each other's rows instead of waiting on them.
+    - SQLite: the single UPDATE statement runs under the database write lock; a claimer
+      that loses the race gets "database is locked" and retries with a fresh read.
+
+    Args:
+        stage (str): Stage name, a key of CLAIM_STAGES ("case_details" or "download_pdf")
+        batch_size (int): Maximum number of cases to claim (default: 100)
+        lease_seconds (int): How long the lease is valid (default: 900)
+        worker_id (str, optional): Lease owner; defaults to host:pid
+        max_attempts (int): Attempts when the database is locked (default: 5)
+        case_ids (list[int], optional): Only claim among these cases, e.g. ones just discovered
+
+    Returns:
+        list[Case]: Claimed cases, highest priority first
+
+    Raises:
+        ValueError: If the stage is unknown
+    """
+    if stage not in CLAIM_STAGES:
+        raise ValueError(f"Unknown stage '{stage}'. Available: {', '.join(CLAIM_STAGES)}")
+
+    worker_id = worker_id or default_worker_id()
+    dialect_name = db_instance.engine.dialect.name
+
+    candidates = (
+        select(Case.id)
+        .where(CLAIM_STAGES[stage]())
+        .where(or_(Case.lease_expires_at.is_(None), Case.lease_expires_at < _db_now(dialect_name)))
+        # Served by the stage's partial (priority DESC, id) index, see dbcore.priority
+        .order_by(Case.priority.desc(), Case.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    if case_ids is not None:
+        if not case_ids:
+            return []
+        candidates = candidates.where(Case.id.in_(case_ids))
+
+    statement = (
+        update(Case)
+        .where(Case.id.in_(candidates.scalar_subquery()))
+        # Leases are bookkeeping, not data changes, so updated_at is left untouched
+        .values(
+            lease_owner=worker_id,
+            lease_expires_at=_db_now_plus(dialect_name, lease_seconds),
+            attempts=Case.attempts + 1,
+            last_attempt_at=_db_now(dialect_name),
+            updated_at=Case.updated_at
+        )
+        .returning(Case.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            with DB_OPERATION_SECONDS.labels(operation="claim_cases", kind="write").time():
+                with db_instance.session_scope() as session:
+                    claimed_ids = session.execute(statement).scalars().all()
+
+                    cases = (
+                        session.query(Case)
+                        .filter(Case.id.in_(claimed_ids))
+                        .order_by(Case.priority.desc(), Case.id)
+                        .all()
+                    ) if claimed_ids else []
+            break
+        except OperationalError as e:
+            if attempt == max_attempts or "locked" not in str(e).lower():
+                raise
+            RETRIES_TOTAL.labels(stage="claim_cases").inc()
+            time.sleep(0.1 * 2 ** attempt)
+
+    DB_ROWS_TOTAL.labels(operation="claim_cases", kind="write").inc(len(cases))
+    return cases
+
+
+@DB_OPERATION_SECONDS.labels(operation="release_cases", kind="write").time()
+def release_cases(case_ids: list[int], worker_id: str = None) -> int:
+    """
+    Release leases held by this worker, making the cases claimable again immediately.
+
+    Releasing means the stage completed, so the case's failed attempts are reset.
+
+    Args:
+        case_ids (list[int]): IDs of cases to release
+        worker_id (str, optional): Lease owner; defaults to host:pid
+
+    Returns:
+        int: Number of leases released
+    """
+    if not case_ids:
+        return 0
+
+    with db_instance.session_scope() as session:
+        result = session.execute(
+            update(Case)
+            .where(Case.id.in_(case_ids))
+            .where(Case.lease_owner == (worker_id or default_worker_id()))
+            .values(lease_owner=None, lease_expires_at=None, attempts=0, updated_at=Case.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+@DB_OPERATION_SECONDS.labels(operation="renew_leases", kind="write").time()
+def renew_leases(case_ids: list[int], lease_seconds: int = 900, worker_id: str = None) -> int:
+    """
+    Extend leases held by this worker, for batches that take longer than the lease.
+
+    Args:
+        case_ids (list[int]): IDs of cases whose leases to extend
+        lease_seconds (int): New lease duration from now (default: 900)
+        worker_id (str, optional): Lease owner; defaults to host:pid
+
+    Returns:
+        int: Number of leases extended (leases already taken over by others are not)
+    """
+    if not case_ids:
+        return 0
+
+    dialect_name = db_instance.engine.dialect.name
+
+    with db_instance.session_scope() as session:
+        result = session.execute(
+            update(Case)
+            .where(Case.id.in_(case_ids))
+            .where(Case.lease_owner == (worker_id or default_worker_id()))
+            .values(lease_expires_at=_db_now_plus(dialect_name, lease_seconds), updated_at=Case.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -1,7 +1,9 @@
 from .session import db, Database
 from .models import Case
 from sqlalchemy.exc import IntegrityError
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL
 
+@DB_OPERATION_SECONDS.labels(operation="create_case", kind="write").time()
 def create_case(_id: int, **kwargs) -> Case | None:
     """
     Create and commit a new Case with manually assigned primary key,
@@ -19,7 +21,33 @@ def create_case(_id: int, **kwargs) -> Case | None:
             case = Case(id=_id, **kwargs)
             session.add(case)
             session.flush()  # push to DB but not commit yet
+            DB_ROWS_TOTAL.labels(operation="create_case", kind="write").inc()
             return case
     except IntegrityError as e:
         print(f"IntegrityError when creating case with id={_id}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+@DB_OPERATION_SECONDS.labels(operation="create_cases", kind="write").time()
+def create_cases(case_ids: list[int]) -> list[int]:
+    """
+    Create cases for every ID that does not exist yet, in one transaction.
+
+    Args:
+        case_ids (list[int]): Case IDs to create
+
+    Returns:
+        list[int]: IDs that were newly created, in ascending order
+    """
+    if not case_ids:
+        return []
+
+    # Insert-only upsert: existing IDs are skipped by the database, not looked up first
+    created = sorted(db.bulk_upsert(
+        Case.__table__,
+        ({"id": case_id} for case_id in case_ids),
+        update_fields=(),
+        returning="id"
+    ))
+
+    DB_ROWS_TOTAL.labels(operation="create_cases", kind="write").inc(len(created))
+    return created
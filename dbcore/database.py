@@ -1,16 +1,45 @@
+import io
 from contextlib import contextmanager
-from typing import Generator
-from sqlalchemy import create_engine
+from datetime import date, datetime
+from functools import cached_property
+from typing import Generator, Iterable, Optional, Sequence
+from sqlalchemy import create_engine, func, or_, select, Column, MetaData, Table
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 
+# Characters that must be escaped in COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
 
 class Database:
-    """Database manager for SQLAlchemy Base, engine and session."""
+    """
+    Database manager for SQLAlchemy Base, engine and session.
+
+    The engine and session factory are created on first use, so importing the
+    models (e.g. for a CLI category that never queries) does not load the DB driver.
+    """
 
     def __init__(self, db_url: str):
-        self.engine = create_engine(url=db_url, echo=False)
+        self.db_url = db_url
         self.Base = declarative_base()
-        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+    @cached_property
+    def engine(self):
+        return create_engine(url=self.db_url, echo=False)
+
+    @cached_property
+    def SessionLocal(self):
+        return sessionmaker(bind=self.engine, autocommit=False, autoflush=False, expire_on_commit=False)
 
     def get_session(self) -> Session:
         return self.SessionLocal()
@@ -45,3 +74,131 @@ class Database:
         finally:
             # Always close the session after use
             session.close()
+
+    def bulk_upsert(
+            self,
+            table: Table,
+            rows: Iterable[dict],
+            index_elements: Sequence[str] = ("id",),
+            update_fields: Optional[Sequence[str]] = None,
+            returning: Optional[str] = None,
+            chunk_size: int = 50_000
+    ):
+        """
+        Insert many rows, updating the ones whose key already exists, in one transaction.
+
+        On PostgreSQL (psycopg2 or psycopg 3) each chunk is streamed with COPY into a
+        temporary staging table and merged with a single INSERT ... SELECT ... ON CONFLICT
+        DO UPDATE. Other databases (SQLite) get an executemany of INSERT ... ON CONFLICT.
+        Either way it is one statement per chunk instead of a session round-trip per row.
+
+        Existing rows are only rewritten when a value actually changes, and then
+        `updated_at` is set explicitly (ON CONFLICT does not apply the ORM's onupdate),
+        so unchanged rows keep their timestamp and stay out of delta exports.
+
+        Args:
+            table (Table): Target table, e.g. Case.__table__
+            rows (Iterable[dict]): Rows with the same keys each, holding plain values
+            index_elements (Sequence[str]): Columns of the unique key to upsert on (default: id)
+            update_fields (Sequence[str], optional): Columns to update on conflict
+                                                     (default: every given column but the key;
+                                                     empty: only insert missing rows)
+            returning (str, optional): Column whose value to return for every inserted
+                                       or changed row
+            chunk_size (int): Rows sent per statement (default: 50000)
+
+        Returns:
+            int: Number of rows inserted or changed, or
+            list: The `returning` values of those rows, if `returning` is given
+        """
+        columns = None
+        changed = 0
+        returned = []
+
+        with self.engine.begin() as connection:
+            postgres = connection.dialect.name == "postgresql"
+            driver_cursor = connection.connection.driver_connection.cursor()
+            use_copy = postgres and (hasattr(driver_cursor, "copy") or hasattr(driver_cursor, "copy_expert"))
+            chunk = {}
+
+            def flush():
+                nonlocal changed
+                if not chunk:
+                    return
+
+                options = (columns, index_elements, update_fields, returning)
+                if use_copy:
+                    result = self._copy_upsert(connection, driver_cursor, table, list(chunk.values()), *options)
+                else:
+                    insert = postgresql.insert(table) if postgres else sqlite.insert(table)
+                    result = connection.execute(self._upsert_statement(insert, *options), list(chunk.values()))
+
+                if returning:
+                    returned.extend(result.scalars())
+                else:
+                    changed += result.rowcount
+                chunk.clear()
+
+            for row in rows:
+                if columns is None:
+                    columns = list(row)
+                # Later rows win; ON CONFLICT cannot touch the same row twice in one statement
+                chunk[tuple(row[name] for name in index_elements)] = row
+                if len(chunk) >= chunk_size:
+                    flush()
+
+            flush()
+
+        return returned if returning else changed
+
+    @staticmethod
+    def _upsert_statement(insert, columns, index_elements, update_fields, returning):
+        target = insert.table.c
+        fields = update_fields if update_fields is not None else [
+            name for name in columns if name not in index_elements
+        ]
+
+        if fields:
+            set_ = {name: insert.excluded[name] for name in fields}
+            if "updated_at" in target and "updated_at" not in set_:
+                set_["updated_at"] = func.now()
+            insert = insert.on_conflict_do_update(
+                index_elements=[target[name] for name in index_elements],
+                set_=set_,
+                where=or_(*(target[name].is_distinct_from(insert.excluded[name]) for name in fields))
+            )
+        else:
+            insert = insert.on_conflict_do_nothing(index_elements=[target[name] for name in index_elements])
+
+        return insert.returning(target[returning]) if returning else insert
+
+    @staticmethod
+    def _copy_upsert(connection, driver_cursor, table: Table, rows: list[dict], columns, *options):
+        quote = connection.dialect.identifier_preparer.quote
+        staging_name = f"_bulk_{table.name}"
+        column_list = ", ".join(quote(name) for name in columns)
+
+        # Column types come from the target; no constraints, dropped at commit
+        connection.exec_driver_sql(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {quote(staging_name)} ON COMMIT DROP AS "
+            f"SELECT {column_list} FROM {quote(table.name)} WITH NO DATA"
+        )
+        connection.exec_driver_sql(f"TRUNCATE {quote(staging_name)}")
+
+        data = "".join(
+            "\t".join(_copy_value(row[name]) for name in columns) + "\n"
+            for row in rows
+        )
+        copy_sql = f"COPY {quote(staging_name)} ({column_list}) FROM STDIN"
+
+        if hasattr(driver_cursor, "copy"):
+            # psycopg 3
+            with driver_cursor.copy(copy_sql) as copy:
+                copy.write(data)
+        else:
+            # psycopg2
+            driver_cursor.copy_expert(copy_sql, io.StringIO(data))
+
+        staging = Table(staging_name, MetaData(), *(Column(name, table.c[name].type) for name in columns))
+        insert = postgresql.insert(table).from_select(columns, select(*staging.c))
+        return connection.execute(Database._upsert_statement(insert, columns, *options))
@@ -1,12 +1,16 @@
+from typing import Iterator
+from sqlalchemy import select, func, case
 from .session import db as db_instance
 from .models import Case
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL
 
 
+@DB_OPERATION_SECONDS.labels(operation="get_cases_with_none_reference", kind="read").time()
 def get_cases_with_none_reference(limit: int = 1000, offset: int = None) -> list[Case]:
     """
     Retrieve cases that:
     - have reference field as None
-    - ordered by ID ascending
+    - ordered by priority descending, then ID ascending
 
     Args:
         limit (int): Maximum number of records to retrieve (default: 1000)
@@ -14,46 +18,52 @@ def get_cases_with_none_reference(limit: int = 1000, offset: int = None) -> list
                                If None, no records are skipped.
 
     Returns:
-        list[Case]: Cases with None reference, ordered by ID
+        list[Case]: Cases with None reference, highest priority first
     """
     with db_instance.session_scope() as session:
         query = (
             session.query(Case)
             .filter(Case.reference.is_(None))
-            .order_by(Case.id)
+            .order_by(Case.priority.desc(), Case.id)
         )
 
         # Apply offset if provided
         if offset is not None:
             query = query.offset(offset)
 
-        return query.limit(limit).all()
+        cases = query.limit(limit).all()
+        DB_ROWS_TOTAL.labels(operation="get_cases_with_none_reference", kind="read").inc(len(cases))
+        return cases
 
 
+@DB_OPERATION_SECONDS.labels(operation="get_cases_with_pdf_url", kind="read").time()
 def get_cases_with_pdf_url(limit: int = 100) -> list[Case]:
     """
     Retrieve cases that:
     - have pdf_url field as not null
     - have pdf_downloaded field as False
-    - ordered by ID ascending
+    - ordered by priority descending, then ID ascending
 
     Args:
         limit (int): Maximum number of records to retrieve (default: 100)
 
     Returns:
-        list[Case]: Cases with non-null pdf_url and pdf_downloaded=False, ordered by ID
+        list[Case]: Cases with non-null pdf_url and pdf_downloaded=False, highest priority first
     """
     with db_instance.session_scope() as session:
-        return (
+        cases = (
             session.query(Case)
             .filter(Case.pdf_url.isnot(None))
             .filter(Case.pdf_downloaded == False)
-            .order_by(Case.id)
+            .order_by(Case.priority.desc(), Case.id)
             .limit(limit)
             .all()
         )
+        DB_ROWS_TOTAL.labels(operation="get_cases_with_pdf_url", kind="read").inc(len(cases))
+        return cases
 
 
+@DB_OPERATION_SECONDS.labels(operation="get_all_cases", kind="read").time()
 def get_all_cases(limit: int = None) -> list[Case]:
     """
     Retrieve all cases from the table ordered by ID ascending.
@@ -71,4 +81,87 @@ def get_all_cases(limit: int = None) -> list[Case]:
         if limit is not None:
             query = query.limit(limit)
 
-        return query.all()
+        cases = query.all()
+        DB_ROWS_TOTAL.labels(operation="get_all_cases", kind="read").inc(len(cases))
+        return cases
+
+
+@DB_OPERATION_SECONDS.labels(operation="get_existing_case_ids", kind="read").time()
+def get_existing_case_ids(case_ids: list[int], chunk_size: int = 500) -> set[int]:
+    """
+    Filter case IDs down to those that have a row in the cases table.
+
+    Args:
+        case_ids (list[int]): Candidate case IDs
+        chunk_size (int): IDs looked up per query (default: 500)
+
+    Returns:
+        set[int]: IDs of existing cases
+    """
+    existing = set()
+
+    with db_instance.session_scope() as session:
+        for i in range(0, len(case_ids), chunk_size):
+            existing.update(session.scalars(select(Case.id).where(Case.id.in_(case_ids[i:i + chunk_size]))))
+
+    DB_ROWS_TOTAL.labels(operation="get_existing_case_ids", kind="read").inc(len(existing))
+    return existing
+
+
+@DB_OPERATION_SECONDS.labels(operation="count_cases_by_stage", kind="read").time()
+def count_cases_by_stage() -> dict[str, int]:
+    """
+    Count cases by pipeline stage in a single query.
+
+    Returns:
+        dict[str, int]: Counts keyed by "total", "pending_details",
+                        "pending_download" and "downloaded"
+    """
+    with db_instance.session_scope() as session:
+        total, pending_details, pending_download, downloaded = session.query(
+            func.count(Case.id),
+            func.count(case((Case.reference.is_(None), 1))),
+            func.count(case(((Case.pdf_url.isnot(None)) & (Case.pdf_downloaded == False), 1))),
+            func.count(case((Case.pdf_downloaded == True, 1))),
+        ).one()
+
+    return {
+        "total": total,
+        "pending_details": pending_details,
+        "pending_download": pending_download,
+        "downloaded": downloaded,
+    }
+
+
+def iter_case_chunks(columns: tuple[str, ...], chunk_size: int = 50_000) -> Iterator[list[tuple]]:
+    """
+    Read the given columns of every case, in CaseID order, one chunk at a time.
+
+    Chunks are read by CaseID ranges (keyset pagination), each in its own short
+    session, so reading stays fast however deep into the table it gets.
+
+    Args:
+        columns (tuple[str, ...]): Case column names; "id" is always the first value
+        chunk_size (int): Cases per chunk (default: 50000)
+
+    Yields:
+        list[tuple]: Rows of (id, *columns) values
+    """
+    selected = [Case.id] + [getattr(Case, name) for name in columns if name != "id"]
+    last_id = None
+
+    while True:
+        with DB_OPERATION_SECONDS.labels(operation="iter_case_chunks", kind="read").time():
+            with db_instance.session_scope() as session:
+                query = select(*selected).order_by(Case.id).limit(chunk_size)
+                if last_id is not None:
+                    query = query.where(Case.id > last_id)
+                rows = [tuple(row) for row in session.execute(query)]
+
+        if not rows:
+            return
+
+        DB_ROWS_TOTAL.labels(operation="iter_case_chunks", kind="read").inc(len(rows))
+        yield rows
+
+        last_id = rows[-1][0]
@@ -1,6 +1,6 @@
 from dbcore.session import Base
 from sqlalchemy import (
-    Column, String, Integer, DateTime, func, Boolean, Text
+    Column, String, Integer, DateTime, func, Boolean, Text, Float, ForeignKey, DDL, event, Index
 )
 
 # -------------------------------------------------------------------
@@ -13,18 +13,313 @@ class Case(Base):
 
     reference = Column(String, nullable=True, default=None)
     site_address = Column(Text, nullable=True, default=None)
-    type = Column(String, nullable=True, default=None)
-    local_planning_authority = Column(String, nullable=True, default=None)
-    officer = Column(String, nullable=True, default=None)
-    status = Column(String, nullable=True, default=None)
+    # Extracted from site_address by the normalise stage (see library.case_normaliser)
+    postcode = Column(String, nullable=True, default=None, index=True)
+    type = Column(String, nullable=True, default=None, index=True)
+    local_planning_authority = Column(String, nullable=True, default=None, index=True)
+    officer = Column(String, nullable=True, default=None, index=True)
+    status = Column(String, nullable=True, default=None, index=True)
     decision_date = Column(String, nullable=True, default=None)
     pdf_url = Column(Text, nullable=True, default=None)
     pdf_name = Column(Text, nullable=True, default=None)
     pdf_downloaded = Column(Boolean, nullable=False, default=False)
 
+    # Lease held by the worker currently processing this case (see dbcore.claim)
+    lease_owner = Column(String, nullable=True, default=None)
+    lease_expires_at = Column(DateTime, nullable=True, default=None, index=True)
 
-    updated_at = Column(DateTime, onupdate=func.now())
+    # Scheduling: higher priority is claimed first (see dbcore.priority); attempts counts claims
+    # that have not been completed yet, so failures can be pushed back
+    priority = Column(Integer, nullable=False, default=0, server_default="0")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_attempt_at = Column(DateTime, nullable=True, default=None)
+
+    # Set on insert too, so (updated_at, id) orders every change for delta exports (see dbcore.watermark)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     created_at = Column(DateTime, default=func.now())
 
+    __table_args__ = (
+        Index("ix_cases_updated_at_id", "updated_at", "id"),
+        # One partial index per claim stage, in claim order, covering only the cases still queued
+        Index(
+            "ix_cases_details_queue", priority.desc(), id,
+            sqlite_where=reference.is_(None),
+            postgresql_where=reference.is_(None)
+        ),
+        Index(
+            "ix_cases_download_queue", priority.desc(), id,
+            sqlite_where=pdf_url.isnot(None) & (pdf_downloaded == False),
+            postgresql_where=pdf_url.isnot(None) & (pdf_downloaded == False)
+        ),
+    )
+
     def __repr__(self):
         return f"Case(id={self.id}, view_case=ViewCase.aspx?CaseID={self.id})"
+
+
+# Full-text index over the free-text case columns - FTS5 on SQLite, a generated tsvector on PostgreSQL
+_CASE_FULLTEXT_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5("
+        "site_address, local_planning_authority, officer, content='cases', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS cases_fts_ai AFTER INSERT ON cases BEGIN "
+        "INSERT INTO cases_fts(rowid, site_address, local_planning_authority, officer) "
+        "VALUES (new.id, new.site_address, new.local_planning_authority, new.officer); END",
+        "CREATE TRIGGER IF NOT EXISTS cases_fts_ad AFTER DELETE ON cases BEGIN "
+        "INSERT INTO cases_fts(cases_fts, rowid, site_address, local_planning_authority, officer) "
+        "VALUES ('delete', old.id, old.site_address, old.local_planning_authority, old.officer); END",
+        "CREATE TRIGGER IF NOT EXISTS cases_fts_au AFTER UPDATE OF site_address, local_planning_authority, officer "
+        "ON cases BEGIN "
+        "INSERT INTO cases_fts(cases_fts, rowid, site_address, local_planning_authority, officer) "
+        "VALUES ('delete', old.id, old.site_address, old.local_planning_authority, old.officer); "
+        "INSERT INTO cases_fts(rowid, site_address, local_planning_authority, officer) "
+        "VALUES (new.id, new.site_address, new.local_planning_authority, new.officer); END",
+    ],
+    "postgresql": [
+        "ALTER TABLE cases ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', "
+        "coalesce(site_address, '') || ' ' || coalesce(local_planning_authority, '') || ' ' || coalesce(officer, ''))"
+        ") STORED",
+        "CREATE INDEX IF NOT EXISTS ix_cases_search_tsv ON cases USING gin (search_tsv)",
+    ],
+}
+
+for _dialect, _statements in _CASE_FULLTEXT_DDL.items():
+    for _statement in _statements:
+        event.listen(Case.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+
+# -------------------------------------------------------------------
+# CaseStat model - number of cases per value of a dashboard dimension
+# -------------------------------------------------------------------
+class CaseStat(Base):
+    __tablename__ = "case_stats"
+
+    dimension = Column(String, primary_key=True)
+    # "" stands for cases without a value (not scraped yet, or no decision)
+    value = Column(String, primary_key=True)
+    cases = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"CaseStat(dimension={self.dimension}, value={self.value}, cases={self.cases})"
+
+
+# Value of each dimension for a row of cases; "{row}" is the row (new, old, a table alias).
+# decision_date is "22 Nov 2019" as scraped, or ISO once normalised, so the year is taken from either end.
+CASE_STATS_DIMENSIONS = {
+    "sqlite": {
+        "total": "''",
+        "lpa": "coalesce({row}.local_planning_authority, '')",
+        "status": "coalesce({row}.status, '')",
+        "type": "coalesce({row}.type, '')",
+        "decision_year": (
+            "CASE WHEN {row}.decision_date GLOB '[0-9][0-9][0-9][0-9]-*' THEN substr({row}.decision_date, 1, 4) "
+            "WHEN {row}.decision_date GLOB '*[0-9][0-9][0-9][0-9]' THEN substr({row}.decision_date, -4) ELSE '' END"
+        ),
+    },
+    "postgresql": {
+        "total": "''",
+        "lpa": "coalesce({row}.local_planning_authority, '')",
+        "status": "coalesce({row}.status, '')",
+        "type": "coalesce({row}.type, '')",
+        "decision_year": (
+            "coalesce(substring({row}.decision_date from '^([0-9]{{4}})-'), "
+            "substring({row}.decision_date from '([0-9]{{4}})$'), '')"
+        ),
+    },
+}
+
+
+def _sqlite_case_stats_ddl() -> list[str]:
+    # Row triggers: one upsert per dimension, and on update only for the dimensions that changed
+    dimensions = CASE_STATS_DIMENSIONS["sqlite"]
+
+    def bump(dimension: str, row: str, delta: int, condition: str = None) -> str:
+        value = dimensions[dimension].format(row=row)
+        where = f" WHERE {condition}" if condition else " WHERE true"
+        return (
+            f"INSERT INTO case_stats(dimension, value, cases) SELECT '{dimension}', {value}, {delta}{where} "
+            "ON CONFLICT(dimension, value) DO UPDATE SET cases = cases + excluded.cases; "
+        )
+
+    changed = {
+        dimension: f"{dimensions[dimension].format(row='old')} IS NOT {dimensions[dimension].format(row='new')}"
+        for dimension in dimensions if dimension != "total"
+    }
+    return [
+        "CREATE TRIGGER IF NOT EXISTS case_stats_ai AFTER INSERT ON cases BEGIN "
+        + "".join(bump(dimension, "new", 1) for dimension in dimensions) + "END",
+        "CREATE TRIGGER IF NOT EXISTS case_stats_ad AFTER DELETE ON cases BEGIN "
+        + "".join(bump(dimension, "old", -1) for dimension in dimensions) + "END",
+        "CREATE TRIGGER IF NOT EXISTS case_stats_au AFTER UPDATE OF local_planning_authority, status, type, "
+        "decision_date ON cases BEGIN "
+        + "".join(
+            bump(dimension, "old", -1, condition) + bump(dimension, "new", 1, condition)
+            for dimension, condition in changed.items()
+        ) + "END",
+    ]
+
+
+def _postgresql_case_stats_ddl() -> list[str]:
+    # Statement triggers with transition tables: one grouped upsert per statement, so bulk
+    # writers (COPY upserts, bulk updates) pay once per statement instead of once per row
+    values = ", ".join(
+        f"('{dimension}', {expression.format(row='r')})"
+        for dimension, expression in CASE_STATS_DIMENSIONS["postgresql"].items()
+    )
+
+    def changes(table: str, delta: int) -> str:
+        return f"SELECT d.dimension, d.value, {delta} AS delta FROM {table} r CROSS JOIN LATERAL (VALUES {values}) AS d(dimension, value)"
+
+    def apply(source: str) -> str:
+        # Sorted, so concurrent writers lock the summary rows in the same order
+        return (
+            "INSERT INTO case_stats (dimension, value, cases) "
+            f"SELECT dimension, value, sum(delta) FROM ({source}) AS c GROUP BY dimension, value "
+            "HAVING sum(delta) <> 0 ORDER BY dimension, value "
+            "ON CONFLICT (dimension, value) DO UPDATE SET cases = case_stats.cases + excluded.cases;"
+        )
+
+    return [
+        "CREATE OR REPLACE FUNCTION case_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+        f"IF TG_OP = 'INSERT' THEN {apply(changes('new_rows', 1))} "
+        f"ELSIF TG_OP = 'DELETE' THEN {apply(changes('old_rows', -1))} "
+        f"ELSE {apply(changes('new_rows', 1) + ' UNION ALL ' + changes('old_rows', -1))} "
+        "END IF; RETURN NULL; END $$",
+        "CREATE TRIGGER case_stats_ai AFTER INSERT ON cases REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION case_stats_apply()",
+        "CREATE TRIGGER case_stats_ad AFTER DELETE ON cases REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION case_stats_apply()",
+        "CREATE TRIGGER case_stats_au AFTER UPDATE ON cases REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION case_stats_apply()",
+    ]
+
+
+# Kept in sync with cases by triggers, so every writer - ORM, bulk upserts, raw SQL - is covered
+_CASE_STATS_DDL = {
+    "sqlite": _sqlite_case_stats_ddl(),
+    "postgresql": _postgresql_case_stats_ddl(),
+}
+
+for _dialect, _statements in _CASE_STATS_DDL.items():
+    for _statement in _statements:
+        event.listen(Case.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+
+# -------------------------------------------------------------------
+# PdfDocument model - a downloaded decision PDF and its extracted text
+# -------------------------------------------------------------------
+class PdfDocument(Base):
+    __tablename__ = "pdf_documents"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    case_id = Column(Integer, ForeignKey("cases.id"), nullable=False, index=True)
+
+    filename = Column(String, nullable=False)
+    path = Column(String, nullable=False, unique=True)
+    size = Column(Integer, nullable=False)
+    mtime = Column(Float, nullable=False)
+    page_count = Column(Integer, nullable=True, default=None)
+    text = Column(Text, nullable=True, default=None)
+    error = Column(Text, nullable=True, default=None)
+
+    indexed_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"PdfDocument(id={self.id}, case_id={self.case_id}, filename={self.filename})"
+
+
+# Full-text index over PdfDocument.text - FTS5 on SQLite, a generated tsvector on PostgreSQL.
+# Kept in sync by triggers (SQLite) or by the generated column (PostgreSQL), so every writer is covered.
+_PDF_FULLTEXT_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS pdf_documents_fts USING fts5("
+        "text, content='pdf_documents', content_rowid='id', tokenize='porter unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS pdf_documents_fts_ai AFTER INSERT ON pdf_documents BEGIN "
+        "INSERT INTO pdf_documents_fts(rowid, text) VALUES (new.id, new.text); END",
+        "CREATE TRIGGER IF NOT EXISTS pdf_documents_fts_ad AFTER DELETE ON pdf_documents BEGIN "
+        "INSERT INTO pdf_documents_fts(pdf_documents_fts, rowid, text) VALUES ('delete', old.id, old.text); END",
+        "CREATE TRIGGER IF NOT EXISTS pdf_documents_fts_au AFTER UPDATE OF text ON pdf_documents BEGIN "
+        "INSERT INTO pdf_documents_fts(pdf_documents_fts, rowid, text) VALUES ('delete', old.id, old.text); "
+        "INSERT INTO pdf_documents_fts(rowid, text) VALUES (new.id, new.text); END",
+    ],
+    "postgresql": [
+        "ALTER TABLE pdf_documents ADD COLUMN IF NOT EXISTS text_tsv tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_pdf_documents_text_tsv ON pdf_documents USING gin (text_tsv)",
+    ],
+}
+
+for _dialect, _statements in _PDF_FULLTEXT_DDL.items():
+    for _statement in _statements:
+        event.listen(PdfDocument.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+
+# -------------------------------------------------------------------
+# PdfFile model - a PDF in the store, as downloaded and as last verified
+# -------------------------------------------------------------------
+class PdfFile(Base):
+    __tablename__ = "pdf_files"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    case_id = Column(Integer, ForeignKey("cases.id"), nullable=False, index=True)
+
+    filename = Column(String, nullable=False)
+    path = Column(String, nullable=False, unique=True)
+
+    # Recorded when the file is downloaded
+    url = Column(Text, nullable=True, default=None)
+    content_length = Column(Integer, nullable=True, default=None)
+    sha256 = Column(String(64), nullable=True, default=None)
+    downloaded_at = Column(DateTime, nullable=True, default=None)
+
+    # Recorded by verify-pdf; size and mtime tell whether the file changed since
+    size = Column(Integer, nullable=True, default=None)
+    mtime = Column(Float, nullable=True, default=None)
+    status = Column(String, nullable=True, default=None, index=True)
+    problem = Column(Text, nullable=True, default=None)
+    verified_at = Column(DateTime, nullable=True, default=None)
+
+    def __repr__(self):
+        return f"PdfFile(id={self.id}, case_id={self.case_id}, filename={self.filename}, status={self.status})"
+
+
+# -------------------------------------------------------------------
+# ProbedRange model - a CaseID range already covered by the range prober
+# -------------------------------------------------------------------
+class ProbedRange(Base):
+    __tablename__ = "probed_ranges"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    start_id = Column(Integer, nullable=False)
+    end_id = Column(Integer, nullable=False, index=True)
+    probed = Column(Integer, nullable=False, default=0)
+    found = Column(Integer, nullable=False, default=0)
+    # True for IDs the prober stepped over in a sparse stretch; a later run probes them one by one
+    skipped = Column(Boolean, nullable=False, default=False)
+
+    created_at = Column(DateTime, default=func.now())
+
+    def __repr__(self):
+        return (
+            f"ProbedRange(start_id={self.start_id}, end_id={self.end_id}, found={self.found}, skipped={self.skipped})"
+        )
+
+
+# -------------------------------------------------------------------
+# ExportWatermark model - how far each delta export consumer has read
+# -------------------------------------------------------------------
+class ExportWatermark(Base):
+    __tablename__ = "export_watermarks"
+
+    consumer = Column(String, primary_key=True)
+
+    # Every case with updated_at up to and including this time has been exported
+    watermark = Column(DateTime, nullable=False)
+    rows_exported = Column(Integer, nullable=False, default=0)
+    manifest_path = Column(Text, nullable=True, default=None)
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"ExportWatermark(consumer={self.consumer}, watermark={self.watermark})"
@@ -0,0 +1,183 @@
+import os
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects import postgresql, sqlite
+from .session import db as db_instance
+from .models import Case, PdfFile
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL
+
+_VERIFICATION_FIELDS = ("size", "mtime", "status", "problem", "verified_at")
+
+
+def _upsert(rows: list[dict], update_fields: tuple[str, ...]):
+    # Rows are keyed by absolute path, so a relative CASE_PDF_PATH ("./PDF") records one row per file
+    rows = [{**row, "path": os.path.abspath(row["path"])} for row in rows]
+    insert = postgresql.insert if db_instance.engine.dialect.name == "postgresql" else sqlite.insert
+    statement = insert(PdfFile).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[PdfFile.path],
+        set_={field: statement.excluded[field] for field in update_fields}
+    )
+
+
+@DB_OPERATION_SECONDS.labels(operation="record_pdf_downloads", kind="write").time()
+def record_pdf_downloads(files: list[dict]) -> int:
+    """
+    Record downloaded PDFs, with what the server sent, for later verification.
+
+    Any earlier verification of the same path is cleared, since the file was replaced.
+
+    Args:
+        files (list[dict]): Dictionaries with case_id, filename, path, url,
+                            content_length and sha256
+
+    Returns:
+        int: Number of files recorded
+    """
+    if not files:
+        return 0
+
+    rows = [
+        {**file, "downloaded_at": func.now(), **{field: None for field in _VERIFICATION_FIELDS}}
+        for file in files
+    ]
+
+    with db_instance.session_scope() as session:
+        session.execute(_upsert(rows, update_fields=(
+            "case_id", "filename", "url", "content_length", "sha256", "downloaded_at", *_VERIFICATION_FIELDS
+        )))
+
+    DB_ROWS_TOTAL.labels(operation="record_pdf_downloads", kind="write").inc(len(rows))
+    return len(rows)
+
+
+@DB_OPERATION_SECONDS.labels(operation="get_pdf_file_states", kind="read").time()
+def get_pdf_file_states() -> dict[str, dict]:
+    """
+    Return what is known about every PDF in the store.
+
+    Returns:
+        dict[str, dict]: case_id, content_length, sha256, status and the verified
+                         size and mtime, keyed by absolute file path
+    """
+    with db_instance.session_scope() as session:
+        rows = session.query(
+            PdfFile.path, PdfFile.case_id, PdfFile.content_length, PdfFile.sha256,
+            PdfFile.status, PdfFile.size, PdfFile.mtime
+        ).all()
+
+    DB_ROWS_TOTAL.labels(operation="get_pdf_file_states", kind="read").inc(len(rows))
+    # A row recorded under a relative path before paths were made absolute gives way to the absolute one
+    rows = sorted(rows, key=lambda row: os.path.isabs(row.path))
+    return {os.path.abspath(row.path): row._asdict() for row in rows}
+
+
+@DB_OPERATION_SECONDS.labels(operation="save_pdf_verifications", kind="write").time()
+def save_pdf_verifications(results: list[dict]) -> int:
+    """
+    Store verification results, adding files that were downloaded before downloads were recorded.
+
+    Args:
+        results (list[dict]): Dictionaries with case_id, filename, path, size, mtime,
+                              status and problem
+
+    Returns:
+        int: Number of results stored
+    """
+    if not results:
+        return 0
+
+    rows = [{**result, "verified_at": func.now()} for result in results]
+
+    with db_instance.session_scope() as session:
+        session.execute(_upsert(rows, update_fields=_VERIFICATION_FIELDS))
+
+    DB_ROWS_TOTAL.labels(operation="save_pdf_verifications", kind="write").inc(len(rows))
+    return len(rows)
+
+
+@DB_OPERATION_SECONDS.labels(operation="requeue_pdf_downloads", kind="write").time()
+def requeue_pdf_downloads(case_ids: list[int]) -> int:
+    """
+    Put cases back in the download queue, so the download stage fetches their PDFs again.
+
+    Args:
+        case_ids (list[int]): IDs of cases with missing or damaged PDFs
+
+    Returns:
+        int: Number of cases re-queued
+    """
+    if not case_ids:
+        return 0
+
+    with db_instance.session_scope() as session:
+        requeued = session.execute(
+            update(Case)
+            .where(Case.id.in_(case_ids))
+            .where(Case.pdf_url.isnot(None))
+            .where(Case.pdf_downloaded == True)
+            .values(pdf_downloaded=False)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    DB_ROWS_TOTAL.labels(operation="requeue_pdf_downloads", kind="write").inc(requeued)
+    return requeued
+
+
+@DB_OPERATION_SECONDS.labels(operation="get_completed_pdf_case_ids", kind="read").time()
+def get_completed_pdf_case_ids(case_ids: list[int], chunk_size: int = 500) -> list[int]:
+    """
+    Filter case IDs down to cases whose PDFs are complete: marked downloaded, and no
+    file of the case failed verification.
+
+    Args:
+        case_ids (list[int]): Candidate case IDs
+        chunk_size (int): IDs looked up per query (default: 500)
+
+    Returns:
+        list[int]: Completed case IDs, in ascending order
+    """
+    completed = []
+
+    with db_instance.session_scope() as session:
+        for i in range(0, len(case_ids), chunk_size):
+            chunk = case_ids[i:i + chunk_size]
+            failed = (
+                select(PdfFile.case_id)
+                .where(PdfFile.case_id.in_(chunk))
+                .where(PdfFile.status.isnot(None))
+                .where(PdfFile.status.notin_(("ok", "packed")))
+            )
+            completed.extend(session.scalars(
+                select(Case.id)
+                .where(Case.id.in_(chunk))
+                .where(Case.pdf_downloaded == True)
+                .where(Case.id.notin_(failed))
+            ))
+
+    DB_ROWS_TOTAL.labels(operation="get_completed_pdf_case_ids", kind="read").inc(len(completed))
+    return sorted(completed)
+
+
+@DB_OPERATION_SECONDS.labels(operation="mark_pdf_files_packed", kind="write").time()
+def mark_pdf_files_packed(files: list[dict]) -> int:
+    """
+    Record that files moved from the per-case layout into the shard store.
+
+    Packed files are no longer on disk at their path; verify-pdf and index-pdf
+    leave them alone instead of treating them as missing.
+
+    Args:
+        files (list[dict]): Dictionaries with case_id, filename, path, size and mtime
+
+    Returns:
+        int: Number of files marked
+    """
+    return save_pdf_verifications([{**file, "status": "packed", "problem": None} for file in files])
+
+
+@DB_OPERATION_SECONDS.labels(operation="get_packed_pdf_paths", kind="read").time()
+def get_packed_pdf_paths() -> set[str]:
+    """Return the original absolute paths of every PDF moved into the shard store."""
+    with db_instance.session_scope() as session:
+        paths = session.scalars(select(PdfFile.path).where(PdfFile.status == "packed"))
+        return {os.path.abspath(path) for path in paths}
@@ -0,0 +1,129 @@
+import os
+from sqlalchemy import delete, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import OperationalError
+from .session import db as db_instance
+from .models import PdfDocument
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL
+
+_UPSERT_FIELDS = ("case_id", "filename", "size", "mtime", "page_count", "text", "error")
+
+
+@DB_OPERATION_SECONDS.labels(operation="get_indexed_pdf_documents", kind="read").time()
+def get_indexed_pdf_documents() -> dict[str, tuple[int, float]]:
+    """
+    Return the size and mtime recorded for every indexed PDF.
+
+    Returns:
+        dict[str, tuple[int, float]]: (size, mtime) keyed by file path
+    """
+    with db_instance.session_scope() as session:
+        rows = session.query(PdfDocument.path, PdfDocument.size, PdfDocument.mtime).all()
+
+    DB_ROWS_TOTAL.labels(operation="get_indexed_pdf_documents", kind="read").inc(len(rows))
+    return {path: (size, mtime) for path, size, mtime in rows}
+
+
+@DB_OPERATION_SECONDS.labels(operation="upsert_pdf_documents", kind="write").time()
+def upsert_pdf_documents(documents: list[dict]) -> int:
+    """
+    Insert or update indexed PDFs by path.
+
+    Args:
+        documents (list[dict]): Dictionaries with path, case_id, filename, size, mtime,
+                                page_count, text and error
+
+    Returns:
+        int: Number of documents written
+    """
+    if not documents:
+        return 0
+
+    documents = [{**document, "path": os.path.abspath(document["path"])} for document in documents]
+    insert = postgresql.insert if db_instance.engine.dialect.name == "postgresql" else sqlite.insert
+    statement = insert(PdfDocument).values(documents)
+    statement = statement.on_conflict_do_update(
+        index_elements=[PdfDocument.path],
+        set_={field: statement.excluded[field] for field in _UPSERT_FIELDS}
+    )
+
+    with db_instance.session_scope() as session:
+        session.execute(statement)
+
+    DB_ROWS_TOTAL.labels(operation="upsert_pdf_documents", kind="write").inc(len(documents))
+    return len(documents)
+
+
+@DB_OPERATION_SECONDS.labels(operation="delete_pdf_documents", kind="write").time()
+def delete_pdf_documents(paths: list[str]) -> int:
+    """Remove indexed PDFs whose files no longer exist."""
+    if not paths:
+        return 0
+
+    with db_instance.session_scope() as session:
+        deleted = session.execute(delete(PdfDocument).where(PdfDocument.path.in_(paths))).rowcount
+
+    DB_ROWS_TOTAL.labels(operation="delete_pdf_documents", kind="write").inc(deleted)
+    return deleted
+
+
+def _quote_fts5_terms(query: str) -> str:
+    # Treat every whitespace-separated term literally, for queries that are not valid FTS5 syntax
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+@DB_OPERATION_SECONDS.labels(operation="search_pdf_documents", kind="read").time()
+def search_pdf_documents(query: str, limit: int = 20) -> list[dict]:
+    """
+    Full-text search over the extracted text of downloaded PDFs.
+
+    On SQLite the query uses FTS5 syntax (terms, "phrases", prefix*, AND/OR/NOT,
+    NEAR); anything that is not valid FTS5 is searched as plain terms. On PostgreSQL
+    it uses websearch syntax ("phrases", -exclude, or).
+
+    Args:
+        query (str): Search query
+        limit (int): Maximum number of hits (default: 20)
+
+    Returns:
+        list[dict]: Hits ordered by relevance, each with case_id, filename, path, rank and snippet
+    """
+    if db_instance.engine.dialect.name == "postgresql":
+        statement = text("""
+            SELECT d.case_id, d.filename, d.path, hits.rank,
+                   ts_headline('english', d.text, websearch_to_tsquery('english', :query),
+                               'MaxWords=30, MinWords=10, StartSel=[, StopSel=]') AS snippet
+            FROM (
+                SELECT id, ts_rank(text_tsv, websearch_to_tsquery('english', :query)) AS rank
+                FROM pdf_documents
+                WHERE text_tsv @@ websearch_to_tsquery('english', :query)
+                ORDER BY rank DESC
+                LIMIT :limit
+            ) AS hits
+            JOIN pdf_documents d ON d.id = hits.id
+            ORDER BY hits.rank DESC
+        """)
+        queries = [query]
+    else:
+        statement = text("""
+            SELECT d.case_id, d.filename, d.path, bm25(pdf_documents_fts) AS rank,
+                   snippet(pdf_documents_fts, 0, '[', ']', ' ... ', 16) AS snippet
+            FROM pdf_documents_fts
+            JOIN pdf_documents d ON d.id = pdf_documents_fts.rowid
+            WHERE pdf_documents_fts MATCH :query
+            ORDER BY rank
+            LIMIT :limit
+        """)
+        queries = [query, _quote_fts5_terms(query)]
+
+    for attempt, fts_query in enumerate(queries):
+        try:
+            with db_instance.session_scope() as session:
+                rows = session.execute(statement, {"query": fts_query, "limit": limit}).mappings().all()
+            break
+        except OperationalError:
+            if attempt == len(queries) - 1:
+                raise
+
+    DB_ROWS_TOTAL.labels(operation="search_pdf_documents", kind="read").inc(len(rows))
+    return [dict(row) for row in rows]
@@ -0,0 +1,140 @@
+from sqlalchemy import select, update, func, case, or_, and_, literal
+from .session import db as db_instance
+from .models import Case
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL
+
+
+class PriorityPolicy:
+    """
+    A rule that adds to (or takes from) the priority of every queued case.
+
+    A case's priority is the sum of the active policies' expressions, computed in
+    SQL by `rescore_cases` and stored in Case.priority, so claiming is an index scan
+    instead of a sort. Subclasses set `name` and implement `expression`.
+    """
+    name = None
+
+    def __init__(self, weight: int):
+        self.weight = int(weight)
+
+    def expression(self, low_id: int, high_id: int):
+        """
+        Return the SQL expression of this policy's contribution.
+
+        Args:
+            low_id (int): Lowest CaseID in the table
+            high_id (int): Highest CaseID in the table
+        """
+        raise NotImplementedError
+
+
+class RecencyPolicy(PriorityPolicy):
+    """Newer cases first: from 0 for the lowest CaseID up to `weight` for the highest (CaseIDs are issued in order)."""
+    name = "recency"
+
+    def expression(self, low_id: int, high_id: int):
+        return (Case.id - low_id) * self.weight // max(high_id - low_id, 1)
+
+
+class LpaAllowlistPolicy(PriorityPolicy):
+    """Cases of the listed local planning authorities (case-insensitive) get `weight` more."""
+    name = "lpa"
+
+    def __init__(self, weight: int, lpas: list[str]):
+        super().__init__(weight)
+        self.lpas = [lpa.strip().lower() for lpa in lpas if lpa.strip()]
+
+    def expression(self, low_id: int, high_id: int):
+        if not self.lpas:
+            return literal(0)
+        return case((func.lower(Case.local_planning_authority).in_(self.lpas), self.weight), else_=0)
+
+
+class DecisionFirstPolicy(PriorityPolicy):
+    """Cases with a decision (a decision date or document) get `weight` more."""
+    name = "decision"
+
+    def expression(self, low_id: int, high_id: int):
+        return case((or_(Case.decision_date.isnot(None), Case.pdf_url.isnot(None)), self.weight), else_=0)
+
+
+class RetryPenaltyPolicy(PriorityPolicy):
+    """Cases lose `weight` per claim that did not complete, so repeated failures go after fresh work."""
+    name = "retry"
+
+    def expression(self, low_id: int, high_id: int):
+        return -self.weight * Case.attempts
+
+
+PRIORITY_POLICIES = {
+    policy.name: policy for policy in (RecencyPolicy, LpaAllowlistPolicy, DecisionFirstPolicy, RetryPenaltyPolicy)
+}
+
+
+def default_policies(
+        recency_weight: int = 1000,
+        lpas: list[str] = None,
+        lpa_weight: int = 2000,
+        decision_weight: int = 500,
+        retry_weight: int = 300
+) -> list[PriorityPolicy]:
+    """
+    Build the standard policy set; a weight of 0 (or no LPAs) leaves that policy out.
+
+    With the default weights an allowlisted LPA outranks recency, a decision is worth
+    half the range of recency, and a case that failed twice drops below most new work.
+
+    Returns:
+        list[PriorityPolicy]: Policies for `rescore_cases`
+    """
+    policies = [
+        RecencyPolicy(recency_weight),
+        LpaAllowlistPolicy(lpa_weight, lpas or []),
+        DecisionFirstPolicy(decision_weight),
+        RetryPenaltyPolicy(retry_weight),
+    ]
+    return [
+        policy for policy in policies
+        if policy.weight and not (isinstance(policy, LpaAllowlistPolicy) and not policy.lpas)
+    ]
+
+
+def rescore_cases(policies: list[PriorityPolicy], chunk_size: int = 50_000) -> int:
+    """
+    Recompute the stored priority of every case still queued for details or download.
+
+    Cases are rescored in CaseID ranges, each in its own short transaction, and only
+    cases whose priority actually changes are written. updated_at is left untouched:
+    a priority is scheduling bookkeeping, not case data.
+
+    Args:
+        policies (list[PriorityPolicy]): Policies to sum; an empty list resets priorities to 0
+        chunk_size (int): CaseIDs per transaction (default: 50000)
+
+    Returns:
+        int: Number of cases whose priority changed
+    """
+    with db_instance.session_scope() as session:
+        low_id, high_id = session.execute(select(func.min(Case.id), func.max(Case.id))).one()
+
+    if low_id is None:
+        return 0
+
+    score = sum((policy.expression(low_id, high_id) for policy in policies), literal(0))
+    queued = or_(Case.reference.is_(None), and_(Case.pdf_url.isnot(None), Case.pdf_downloaded == False))
+    changed = 0
+
+    for start in range(low_id, high_id + 1, chunk_size):
+        with DB_OPERATION_SECONDS.labels(operation="rescore_cases", kind="write").time():
+            with db_instance.session_scope() as session:
+                changed += session.execute(
+                    update(Case)
+                    .where(Case.id.between(start, start + chunk_size - 1))
+                    .where(queued)
+                    .where(Case.priority != score)
+                    .values(priority=score, updated_at=Case.updated_at)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+
+    DB_ROWS_TOTAL.labels(operation="rescore_cases", kind="write").inc(changed)
+    return changed
@@ -0,0 +1,100 @@
+from typing import Optional
+from sqlalchemy import func
+from .session import db as db_instance
+from .models import Case, ProbedRange
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL
+
+
+@DB_OPERATION_SECONDS.labels(operation="get_probe_high_water_mark", kind="read").time()
+def get_probe_high_water_mark() -> Optional[int]:
+    """
+    Return the highest CaseID up to which every ID has been probed.
+
+    IDs the prober skipped hold the mark back: it stays below the first skipped range
+    until a later run has probed it (see get_skipped_probe_ranges).
+
+    Returns:
+        Optional[int]: Highest probed CaseID, or None if nothing was probed yet
+    """
+    with db_instance.session_scope() as session:
+        first_skipped = session.query(func.min(ProbedRange.start_id)).filter(ProbedRange.skipped.is_(True)).scalar()
+        if first_skipped is not None:
+            return first_skipped - 1
+        return session.query(func.max(ProbedRange.end_id)).scalar()
+
+
+@DB_OPERATION_SECONDS.labels(operation="get_skipped_probe_ranges", kind="read").time()
+def get_skipped_probe_ranges() -> list[tuple[int, int]]:
+    """
+    Return the CaseID ranges the prober stepped over without probing them.
+
+    Returns:
+        list[tuple[int, int]]: (start_id, end_id) pairs, inclusive, lowest first
+    """
+    with db_instance.session_scope() as session:
+        rows = (
+            session.query(ProbedRange.start_id, ProbedRange.end_id)
+            .filter(ProbedRange.skipped.is_(True))
+            .order_by(ProbedRange.start_id)
+            .all()
+        )
+
+    DB_ROWS_TOTAL.labels(operation="get_skipped_probe_ranges", kind="read").inc(len(rows))
+    return [(start_id, end_id) for start_id, end_id in rows]
+
+
+@DB_OPERATION_SECONDS.labels(operation="get_lowest_case_id", kind="read").time()
+def get_lowest_case_id() -> Optional[int]:
+    """Return the lowest known CaseID, or None if there are no cases."""
+    with db_instance.session_scope() as session:
+        return session.query(func.min(Case.id)).scalar()
+
+
+@DB_OPERATION_SECONDS.labels(operation="record_probed_range", kind="write").time()
+def record_probed_range(
+        start_id: int,
+        end_id: int,
+        probed: int,
+        found: int,
+        skipped: list[tuple[int, int]] = ()
+) -> ProbedRange:
+    """
+    Record a probed CaseID range, and the IDs inside it that were skipped.
+
+    Skipped ranges recorded earlier are trimmed by the part this range covers, so a
+    run probing them again settles them.
+
+    Args:
+        start_id (int): First CaseID of the range
+        end_id (int): Last CaseID of the range (inclusive)
+        probed (int): Number of IDs actually requested in the range
+        found (int): Number of existing cases found in the range
+        skipped (list[tuple[int, int]]): (start_id, end_id) ranges inside it that were
+                                         not probed, inclusive
+
+    Returns:
+        ProbedRange: The recorded range
+    """
+    with db_instance.session_scope() as session:
+        overlapping = (
+            session.query(ProbedRange)
+            .filter(ProbedRange.skipped.is_(True))
+            .filter(ProbedRange.start_id <= end_id, ProbedRange.end_id >= start_id)
+            .all()
+        )
+        for earlier in overlapping:
+            if earlier.start_id < start_id:
+                session.add(ProbedRange(start_id=earlier.start_id, end_id=start_id - 1, skipped=True))
+            if earlier.end_id > end_id:
+                session.add(ProbedRange(start_id=end_id + 1, end_id=earlier.end_id, skipped=True))
+            session.delete(earlier)
+
+        probed_range = ProbedRange(start_id=start_id, end_id=end_id, probed=probed, found=found)
+        session.add(probed_range)
+        session.add_all(
+            ProbedRange(start_id=skipped_start, end_id=skipped_end, skipped=True)
+            for skipped_start, skipped_end in skipped
+        )
+        session.flush()
+        DB_ROWS_TOTAL.labels(operation="record_probed_range", kind="write").inc(1 + len(skipped))
+        return probed_range
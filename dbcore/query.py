@@ -0,0 +1,164 @@
+import difflib
+import re
+from typing import Iterator
+from sqlalchemy import select, text, and_, or_, literal_column, func
+from .session import db as db_instance
+from .models import Case
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL
+
+# Columns returned by `query_cases` unless others are asked for
+QUERY_COLUMNS = (
+    "id", "reference", "type", "local_planning_authority", "officer", "status", "decision_date", "site_address"
+)
+
+# Indexed columns that can be filtered on by value
+FILTER_COLUMNS = ("local_planning_authority", "officer", "status", "type")
+
+
+@DB_OPERATION_SECONDS.labels(operation="match_column_values", kind="read").time()
+def match_column_values(column_name: str, term: str, fuzzy: bool = False, max_matches: int = 5) -> list[str]:
+    """
+    Resolve a filter term to the values actually stored in an indexed column.
+
+    Matching is case-insensitive. A term ending in "*" matches every value starting
+    with the rest of the term; otherwise the term has to match a value exactly, or -
+    with `fuzzy` and no exact match - the closest values by similarity, so
+    misspellings such as "Maidstne" still find "Maidstone". The distinct values come
+    from the column index, so this stays cheap however many cases there are.
+
+    Args:
+        column_name (str): One of FILTER_COLUMNS
+        term (str): Filter term, e.g. "Leeds City Council", "Leeds*" or "Leds"
+        fuzzy (bool): Fall back to similarity matching (default: False)
+        max_matches (int): Maximum values a fuzzy term resolves to (default: 5)
+
+    Returns:
+        list[str]: Matching stored values (empty when nothing matches)
+
+    Raises:
+        ValueError: If the column cannot be filtered on
+    """
+    if column_name not in FILTER_COLUMNS:
+        raise ValueError(f"Cannot filter on '{column_name}'. Available: {', '.join(FILTER_COLUMNS)}")
+
+    column = getattr(Case, column_name)
+
+    with db_instance.session_scope() as session:
+        values = session.execute(select(column).where(column.isnot(None)).distinct()).scalars().all()
+
+    by_folded = {}
+    for value in values:
+        by_folded.setdefault(value.casefold().strip(), []).append(value)
+
+    folded_term = term.casefold().strip()
+
+    if folded_term.endswith("*"):
+        prefix = folded_term.rstrip("*")
+        return sorted(value for folded, group in by_folded.items() if folded.startswith(prefix) for value in group)
+
+    if folded_term in by_folded:
+        return sorted(by_folded[folded_term])
+
+    if fuzzy:
+        scores = {folded: difflib.SequenceMatcher(None, folded_term, folded).ratio() for folded in by_folded}
+        best = max(scores.values(), default=0.0)
+        # Only the values about as close as the best one - shared words such as
+        # "Borough Council" make many values similar to any LPA name
+        close = sorted(
+            (folded for folded, score in scores.items() if score >= 0.6 and score >= best - 0.05),
+            key=scores.get,
+            reverse=True
+        )[:max_matches]
+        return [value for folded in close for value in sorted(by_folded[folded])]
+
+    return []
+
+
+def _text_condition(search_text: str):
+    # Every word of the search text has to appear, matched as a prefix ("high str" finds "High Street")
+    words = re.findall(r"\w+", search_text)
+    if not words:
+        raise ValueError("Search text must contain at least one word")
+
+    dialect_name = db_instance.engine.dialect.name
+
+    if dialect_name == "sqlite":
+        fts_query = " ".join(f'"{word}"*' for word in words)
+        return Case.id.in_(
+            text("SELECT rowid FROM cases_fts WHERE cases_fts MATCH :fts_query").bindparams(fts_query=fts_query)
+        )
+
+    if dialect_name == "postgresql":
+        ts_query = " & ".join(f"{word}:*" for word in words)
+        return literal_column("cases.search_tsv").op("@@")(func.to_tsquery("simple", ts_query))
+
+    # No full-text index on other databases - fall back to scanning
+    columns = (Case.site_address, Case.local_planning_authority, Case.officer)
+    return and_(*(or_(*(column.ilike(f"%{word}%") for column in columns)) for word in words))
+
+
+def query_cases(
+        filters: dict[str, list[str]] = None,
+        search_text: str = None,
+        columns: tuple[str, ...] = QUERY_COLUMNS,
+        limit: int = None,
+        batch_size: int = 500
+) -> Iterator[dict]:
+    """
+    Stream cases matching the given filters, ordered by ID.
+
+    Rows are fetched through a server-side cursor (PostgreSQL) or an incremental
+    cursor (SQLite) in batches of `batch_size`, so the first rows arrive straight
+    away and memory stays flat however many cases match.
+
+    Args:
+        filters (dict[str, list[str]], optional): Allowed values per FILTER_COLUMNS column,
+                                                 e.g. from `match_column_values`
+        search_text (str, optional): Words to find in site_address, local_planning_authority
+                                     or officer (full-text index, prefix match per word)
+        columns (tuple[str, ...]): Case columns to return (default: QUERY_COLUMNS)
+        limit (int, optional): Maximum number of rows
+        batch_size (int): Rows fetched from the database at a time (default: 500)
+
+    Yields:
+        dict: One case per row, keyed by column name
+
+    Raises:
+        ValueError: If a filter or output column is unknown
+    """
+    unknown = [name for name in columns if name not in Case.__table__.columns]
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+
+    statement = select(*(getattr(Case, name) for name in columns)).order_by(Case.id)
+
+    for column_name, values in (filters or {}).items():
+        if column_name not in FILTER_COLUMNS:
+            raise ValueError(f"Cannot filter on '{column_name}'. Available: {', '.join(FILTER_COLUMNS)}")
+        statement = statement.where(getattr(Case, column_name).in_(values))
+
+    if search_text:
+        statement = statement.where(_text_condition(search_text))
+
+    if limit is not None:
+        statement = statement.limit(limit)
+
+    rows = 0
+    try:
+        with db_instance.session_scope() as session:
+            # Timed per batch fetched, so the time the caller spends on each row is left out
+            with DB_OPERATION_SECONDS.labels(operation="query_cases", kind="read").time():
+                result = session.execute(statement.execution_options(stream_results=True, yield_per=batch_size))
+            batches = result.mappings().partitions()
+
+            while True:
+                with DB_OPERATION_SECONDS.labels(operation="query_cases", kind="read").time():
+                    batch = next(batches, None)
+                if batch is None:
+                    break
+
+                for row in batch:
+                    rows += 1
+                    yield dict(row)
+    finally:
+        DB_ROWS_TOTAL.labels(operation="query_cases", kind="read").inc(rows)
@@ -0,0 +1,74 @@
+from sqlalchemy import select, delete, text
+from .session import db as db_instance
+from .models import CaseStat, CASE_STATS_DIMENSIONS
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL
+
+# Dimensions a dashboard can break the cases down by ("total" is a single row)
+STATS_DIMENSIONS = ("lpa", "status", "type", "decision_year")
+
+
+@DB_OPERATION_SECONDS.labels(operation="get_case_stats", kind="read").time()
+def get_case_stats(dimension: str, limit: int = None) -> list[tuple[str, int]]:
+    """
+    Return the number of cases per value of a dimension, from the case_stats summary.
+
+    The summary is maintained by triggers on cases, so this reads one row per distinct
+    value however many cases there are.
+
+    Args:
+        dimension (str): One of STATS_DIMENSIONS, or "total"
+        limit (int, optional): Maximum number of values, largest counts first
+
+    Returns:
+        list[tuple[str, int]]: (value, cases) pairs, largest counts first; "" is the
+                               value of cases without one
+
+    Raises:
+        ValueError: If the dimension is unknown
+    """
+    if dimension != "total" and dimension not in STATS_DIMENSIONS:
+        raise ValueError(f"Unknown dimension '{dimension}'. Available: {', '.join(STATS_DIMENSIONS)}")
+
+    query = (
+        select(CaseStat.value, CaseStat.cases)
+        .where(CaseStat.dimension == dimension)
+        .where(CaseStat.cases > 0)
+        .order_by(CaseStat.cases.desc(), CaseStat.value)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+
+    with db_instance.session_scope() as session:
+        rows = [tuple(row) for row in session.execute(query)]
+
+    DB_ROWS_TOTAL.labels(operation="get_case_stats", kind="read").inc(len(rows))
+    return rows
+
+
+@DB_OPERATION_SECONDS.labels(operation="rebuild_case_stats", kind="write").time()
+def rebuild_case_stats() -> int:
+    """
+    Recompute the case_stats summary from the cases table in one transaction.
+
+    Only needed when cases was written with the triggers missing (a database restored
+    from a dump without them, rows changed by hand with triggers off); the triggers
+    keep the summary current otherwise. This scans the whole table.
+
+    Returns:
+        int: Number of summary rows written
+    """
+    dimensions = CASE_STATS_DIMENSIONS[db_instance.engine.dialect.name]
+    written = 0
+
+    with db_instance.session_scope() as session:
+        session.execute(delete(CaseStat))
+
+        for dimension, expression in dimensions.items():
+            value = expression.format(row="cases")
+            written += session.execute(text(
+                "INSERT INTO case_stats (dimension, value, cases) "
+                f"SELECT '{dimension}', {value}, count(*) FROM cases GROUP BY 2"
+            )).rowcount
+
+    DB_ROWS_TOTAL.labels(operation="rebuild_case_stats", kind="write").inc(written)
+    return written
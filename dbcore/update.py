@@ -1,6 +1,9 @@
+from sqlalchemy import update, bindparam, or_
 from .session import db as db_instance
 from .models import Case
+from metrics import DB_OPERATION_SECONDS, DB_ROWS_TOTAL
 
+@DB_OPERATION_SECONDS.labels(operation="update_case_by_id", kind="write").time()
 def update_case_by_id(case_id: int, **kwargs) -> Case:
     """
     Update a case by ID with provided field values.
@@ -27,4 +30,108 @@ def update_case_by_id(case_id: int, **kwargs) -> Case:
                 setattr(case, field, value)
 
         session.commit()
+        DB_ROWS_TOTAL.labels(operation="update_case_by_id", kind="write").inc()
         return case
+
+
+@DB_OPERATION_SECONDS.labels(operation="bulk_update_cases", kind="write").time()
+def bulk_update_cases(rows: list[dict], skip_unchanged: bool = False) -> int:
+    """
+    Update many cases in a single transaction.
+
+    Rows whose ID does not exist are skipped rather than raising.
+
+    Args:
+        rows (list[dict]): One dictionary per case, each containing "id" plus the
+                           field names and values to update (the same fields in every row)
+        skip_unchanged (bool): Leave cases whose values are all equal alone, so their
+                               updated_at does not move (default: False)
+
+    Returns:
+        int: Number of cases updated
+    """
+    if not rows:
+        return 0
+
+    table = Case.__table__
+    fields = [field for field in rows[0] if field != "id" and field in table.c]
+
+    # A single executemany instead of a SELECT + UPDATE per case
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("_case_id"))
+        .values({field: bindparam(field) for field in fields})
+    )
+    if skip_unchanged:
+        statement = statement.where(or_(
+            *(table.c[field].is_distinct_from(bindparam(field, type_=table.c[field].type)) for field in fields)
+        ))
+    parameters = [{"_case_id": row["id"], **{field: row.get(field) for field in fields}} for row in rows]
+
+    with db_instance.session_scope() as session:
+        updated = session.execute(statement, parameters).rowcount
+
+    DB_ROWS_TOTAL.labels(operation="bulk_update_cases", kind="write").inc(updated)
+    return updated
+
+
+@DB_OPERATION_SECONDS.labels(operation="update_cases_where_unchanged", kind="write").time()
+def update_cases_where_unchanged(field: str, rows: list[tuple]) -> int:
+    """
+    Set one field of many cases, but only where it still holds the value read before.
+
+    A batch job deriving new values from what it read earlier does not overwrite
+    what a scraper stored in the meantime; those cases are skipped.
+
+    Args:
+        field (str): Case column to set
+        rows (list[tuple]): (id, value read, new value) per case
+
+    Returns:
+        int: Number of cases updated
+    """
+    if not rows:
+        return 0
+
+    table = Case.__table__
+    column = table.c[field]
+
+    # One executemany; "IS NOT DISTINCT FROM" (IS on SQLite) also matches a NULL read before
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("_case_id"))
+        .where(column.is_not_distinct_from(bindparam("_expected", type_=column.type)))
+        .values({field: bindparam("_value", type_=column.type)})
+    )
+    parameters = [{"_case_id": case_id, "_expected": expected, "_value": value} for case_id, expected, value in rows]
+
+    with db_instance.session_scope() as session:
+        updated = session.execute(statement, parameters).rowcount
+
+    DB_ROWS_TOTAL.labels(operation="update_cases_where_unchanged", kind="write").inc(updated)
+    return updated
+
+
+@DB_OPERATION_SECONDS.labels(operation="upsert_cases", kind="write").time()
+def upsert_cases(rows: list[dict]) -> int:
+    """
+    Insert or update many cases through the dialect's bulk path (COPY on PostgreSQL).
+
+    Cases whose values are unchanged are left alone, so their updated_at does not move.
+
+    Args:
+        rows (list[dict]): One dictionary per case, each containing "id" plus the
+                           field names and values to set (the same fields in every row)
+
+    Returns:
+        int: Number of cases inserted or changed
+    """
+    if not rows:
+        return 0
+
+    table = Case.__table__
+    rows = [{field: value for field, value in row.items() if field in table.c} for row in rows]
+    changed = db_instance.bulk_upsert(table, rows)
+
+    DB_ROWS_TOTAL.labels(operation="upsert_cases", kind="write").inc(changed)
+    return changed
@@ -1,3 +1,38 @@
-from .pdf_downloader import download_pdf
-from .date_generator import generate_monthly_dates
-from .excel_exporter import export_cases_to_excel
+from importlib import import_module
+
+# Exports are resolved on first access (PEP 562), so importing one helper does not
+# load the dependencies of the others (requests, pandas/openpyxl, ...).
+_exports = {
+    "download_pdf": ".pdf_downloader",
+    "download_case_pdfs": ".pdf_downloader",
+    "fetch_pdf": ".pdf_downloader",
+    "FetchedPdf": ".pdf_downloader",
+    "PdfDownloadError": ".pdf_downloader",
+    "verify_pdf_store": ".pdf_verifier",
+    "generate_monthly_dates": ".date_generator",
+    "export_cases_to_excel": ".excel_exporter",
+    "export_case_changes": ".delta_exporter",
+    "PageArchive": ".page_archive",
+    "ArchivedPage": ".page_archive",
+    "index_pdf_store": ".pdf_indexer",
+    "PdfShardStore": ".pdf_shards",
+    "PackedDocument": ".pdf_shards",
+    "read_case_pdf": ".pdf_shards",
+    "pack_pdf_store": ".pdf_shards",
+    "normalise_cases": ".case_normaliser",
+    "normalise_case_frame": ".case_normaliser",
+    "normalise_case_records": ".case_normaliser",
+    "build_lpa_lookup": ".case_normaliser",
+    "load_lpa_aliases": ".case_normaliser",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,214 @@
+import pandas as pd
+from typing import Optional
+from metrics import ITEMS_PROCESSED_TOTAL
+
+# Columns read and written by the normalise stage
+NORMALISED_COLUMNS = (
+    "site_address", "postcode", "type", "local_planning_authority", "officer", "status", "decision_date"
+)
+
+# UK postcode: outward code (area, district) and inward code (sector, unit), spaced or not
+_POSTCODE = r"\b([A-Z]{1,2}[0-9][A-Z0-9]?)\s*([0-9][A-Z]{2})\b"
+
+
+def _collapse(values: pd.Series) -> pd.Series:
+    """Collapse runs of whitespace to one space and trim; empty values become None."""
+    values = values.astype("string").str.replace(r"\s+", " ", regex=True).str.strip()
+    return values.mask(values == "")
+
+
+def _lpa_key(values: pd.Series) -> pd.Series:
+    """Fold LPA names for matching: lower case, punctuation and spacing ignored."""
+    return values.str.lower().str.replace(r"[^a-z0-9]+", " ", regex=True).str.strip()
+
+
+def build_lpa_lookup(lpa_counts: list[tuple[str, int]], aliases: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """
+    Build the lookup from folded LPA names to their canonical spelling.
+
+    Spellings that fold to the same key ("LEEDS CITY COUNCIL", "Leeds  City Council")
+    resolve to the mixed-case spelling most cases use. Explicit aliases win over that, and can
+    also merge names that do not fold together ("Leeds CC" -> "Leeds City Council").
+
+    Args:
+        lpa_counts (list[tuple[str, int]]): (LPA as stored, number of cases) pairs
+        aliases (dict[str, str], optional): Alias -> canonical name overrides
+
+    Returns:
+        dict[str, str]: Canonical LPA names keyed by folded name
+    """
+    counts = pd.DataFrame(lpa_counts, columns=["value", "cases"])
+    counts["value"] = _collapse(counts["value"])
+    counts = counts.dropna(subset=["value"])
+    counts["key"] = _lpa_key(counts["value"])
+
+    # Mixed-case spellings over ALL CAPS or all lower case, then most cases, then alphabetical for a stable choice
+    best = counts.groupby(["key", "value"], as_index=False)["cases"].sum()
+    best["single_case"] = best["value"].str.isupper() | best["value"].str.islower()
+    best = best.sort_values(
+        ["key", "single_case", "cases", "value"], ascending=[True, True, False, True]
+    ).drop_duplicates("key")
+    lookup = dict(zip(best["key"], best["value"]))
+
+    if aliases:
+        alias_keys = _lpa_key(pd.Series(list(aliases), dtype="string"))
+        lookup.update(zip(alias_keys, aliases.values()))
+
+    return lookup
+
+
+def load_lpa_aliases(path: str) -> dict[str, str]:
+    """
+    Read LPA aliases from a CSV file with "alias" and "canonical" columns.
+
+    Args:
+        path (str): Path of the CSV file
+
+    Returns:
+        dict[str, str]: Canonical names keyed by alias
+    """
+    aliases = pd.read_csv(path, dtype="string").dropna(subset=["alias", "canonical"])
+    return dict(zip(aliases["alias"].str.strip(), aliases["canonical"].str.strip()))
+
+
+def normalise_case_frame(cases: pd.DataFrame, lpa_lookup: dict[str, str]) -> pd.DataFrame:
+    """
+    Normalise scraped case fields, column by column with vectorised operations.
+
+    - every text field: whitespace collapsed and trimmed, empty values to None
+    - site_address: one space after each comma, no trailing comma; the postcode is
+      extracted into "postcode" (upper case, outward and inward code spaced)
+    - local_planning_authority: the canonical spelling from `lpa_lookup`
+    - officer: names in all capitals or all lower case are title-cased
+    - decision_date: ISO yyyy-mm-dd when it parses as a date; left as is otherwise
+
+    Args:
+        cases (pd.DataFrame): Cases with an "id" column and the NORMALISED_COLUMNS
+        lpa_lookup (dict[str, str]): Canonical LPA names keyed by folded name (see build_lpa_lookup)
+
+    Returns:
+        pd.DataFrame: Normalised copy of the frame
+    """
+    cases = cases.copy()
+
+    for column in ("type", "status"):
+        cases[column] = _collapse(cases[column])
+
+    address = _collapse(cases["site_address"])
+    address = address.str.replace(r"\s*,\s*", ", ", regex=True).str.replace(r"(,\s*)+$", "", regex=True)
+    cases["site_address"] = address.mask(address == "")
+
+    postcode = address.str.upper().str.extract(_POSTCODE)
+    extracted = (postcode[0] + " " + postcode[1]).astype("string")
+    # Keep a postcode known from before if the address no longer carries one
+    cases["postcode"] = extracted.fillna(cases["postcode"].astype("string"))
+
+    lpa = _collapse(cases["local_planning_authority"])
+    cases["local_planning_authority"] = _lpa_key(lpa).map(lpa_lookup).astype("string").fillna(lpa)
+
+    officer = _collapse(cases["officer"])
+    single_case = officer.str.isupper().fillna(False) | officer.str.islower().fillna(False)
+    cases["officer"] = officer.mask(single_case, officer.str.title())
+
+    decision_date = _collapse(cases["decision_date"])
+    # The site renders "22 Nov 2019"; ISO dates come from an earlier run; anything else is read day-first
+    parsed = pd.to_datetime(decision_date, format="%d %b %Y", errors="coerce")
+    for date_format, options in (("%Y-%m-%d", {}), ("mixed", {"dayfirst": True})):
+        unparsed = parsed.isna() & decision_date.notna()
+        if not unparsed.any():
+            break
+        parsed[unparsed] = pd.to_datetime(decision_date[unparsed], format=date_format, errors="coerce", **options)
+    cases["decision_date"] = parsed.dt.strftime("%Y-%m-%d").astype("string").fillna(decision_date)
+
+    return cases
+
+
+def normalise_case_records(records: list[dict], lpa_lookup: dict[str, str]) -> list[dict]:
+    """
+    Normalise case dictionaries, e.g. freshly parsed pages, the way the normalise stage does.
+
+    Args:
+        records (list[dict]): One dictionary per case with "id" and any other case fields
+        lpa_lookup (dict[str, str]): Canonical LPA names keyed by folded name (see build_lpa_lookup)
+
+    Returns:
+        list[dict]: The records with their NORMALISED_COLUMNS normalised; keys are kept as they were
+    """
+    if not records:
+        return []
+
+    cases = pd.DataFrame(records)
+    for column in NORMALISED_COLUMNS:
+        # Missing fields (a parsed page has no postcode) are normalised as empty and dropped again below
+        cases[column] = cases[column].astype("string") if column in cases else pd.NA
+        cases[column] = cases[column].astype("string")
+
+    cases = normalise_case_frame(cases, lpa_lookup)[list(records[0])].astype(object)
+    return cases.where(cases.notna(), None).to_dict("records")
+
+
+def normalise_cases(
+        lpa_aliases: Optional[dict[str, str]] = None,
+        chunk_size: int = 50_000,
+        dry_run: bool = False
+) -> dict[str, int]:
+    """
+    Normalise the scraped fields of every case and write back only the values that changed.
+
+    The table is read in CaseID chunks; each chunk is normalised as a DataFrame and
+    its changed values are written with one bulk update per column. A value is only
+    written where the column still holds what was read, so a case a scraper updated
+    meanwhile keeps its fresh values (it is normalised on the next run). Running it
+    again changes nothing, so it can follow every scrape or re-parse.
+
+    Args:
+        lpa_aliases (dict[str, str], optional): Alias -> canonical LPA name overrides
+        chunk_size (int): Cases per chunk (default: 50000)
+        dry_run (bool): Count the changes without writing them (default: False)
+
+    Returns:
+        dict[str, int]: "cases" read, "changed" cases, changed values per column, and
+                        "stale" values left alone because the case changed meanwhile
+    """
+    from dbcore import get_case_stats, iter_case_chunks, update_cases_where_unchanged
+
+    lpa_lookup = build_lpa_lookup(get_case_stats("lpa"), lpa_aliases)
+    totals = {"cases": 0, "changed": 0, "stale": 0, **{column: 0 for column in NORMALISED_COLUMNS}}
+
+    for rows in iter_case_chunks(NORMALISED_COLUMNS, chunk_size=chunk_size):
+        before = pd.DataFrame(rows, columns=["id", *NORMALISED_COLUMNS])
+        for column in NORMALISED_COLUMNS:
+            before[column] = before[column].astype("string")
+
+        after = normalise_case_frame(before, lpa_lookup)
+
+        # A value changed unless it is equal, or missing both before and after
+        differs = pd.DataFrame({
+            column: (before[column] != after[column]).fillna(True) & ~(before[column].isna() & after[column].isna())
+            for column in NORMALISED_COLUMNS
+        })
+        changed = differs.any(axis=1)
+
+        totals["cases"] += len(before)
+        totals["changed"] += int(changed.sum())
+        for column in NORMALISED_COLUMNS:
+            totals[column] += int(differs[column].sum())
+
+        if not dry_run:
+            for column in NORMALISED_COLUMNS:
+                if not differs[column].any():
+                    continue
+
+                values = pd.DataFrame({
+                    "id": before.loc[differs[column], "id"],
+                    "before": before.loc[differs[column], column],
+                    "after": after.loc[differs[column], column],
+                }).astype(object)
+                values = values.where(values.notna(), None)
+
+                rows = list(values.itertuples(index=False, name=None))
+                totals["stale"] += len(rows) - update_cases_where_unchanged(column, rows)
+
+        ITEMS_PROCESSED_TOTAL.labels(stage="normalise").inc(len(before))
+
+    return totals
@@ -2,6 +2,7 @@ import pandas as pd
 from datetime import datetime
 from typing import Optional
 from dbcore import get_all_cases
+from metrics import FILE_IO_SECONDS
 
 
 def export_cases_to_excel(
@@ -56,28 +57,29 @@ def export_cases_to_excel(
     df = pd.DataFrame(cases_data)
 
     # Export to Excel with formatting
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Cases', index=False)
-
-        # Get the workbook and worksheet for formatting
-        workbook = writer.book
-        worksheet = writer.sheets['Cases']
-
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except Exception as e:
-                    print(e)
-
-            # Set column width with some padding
-            adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    with FILE_IO_SECONDS.labels(operation="excel_write").time():
+        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            df.to_excel(writer, sheet_name='Cases', index=False)
+
+            # Get the workbook and worksheet for formatting
+            workbook = writer.book
+            worksheet = writer.sheets['Cases']
+
+            # Auto-adjust column widths
+            for column in worksheet.columns:
+                max_length = 0
+                column_letter = column[0].column_letter
+
+                for cell in column:
+                    try:
+                        if len(str(cell.value)) > max_length:
+                            max_length = len(str(cell.value))
+                    except Exception as e:
+                        print(e)
+
+                # Set column width with some padding
+                adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
+                worksheet.column_dimensions[column_letter].width = adjusted_width
 
     print(f"Successfully exported {len(cases)} cases to: {output_path}")
     return output_path
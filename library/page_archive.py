@@ -0,0 +1,203 @@
+import gzip
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+from metrics import FILE_IO_SECONDS
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialised within one process
+    fcntl = None
+
+
+@dataclass(frozen=True)
+class ArchivedPage:
+    """Location and metadata of a single archived page."""
+    kind: str
+    case_id: Optional[int]
+    key: Optional[str]
+    url: Optional[str]
+    fetched_at: float
+    segment: str
+    offset: int
+    length: int
+
+
+def read_archived_page(root: str, page: ArchivedPage) -> str:
+    """
+    Read and decompress a single archived page.
+
+    This is a plain function (rather than a PageArchive method) so worker
+    processes can read pages without opening the index.
+
+    Args:
+        root (str): Archive root directory
+        page (ArchivedPage): Index entry of the page
+
+    Returns:
+        str: Page HTML
+    """
+    with open(Path(root) / page.segment, "rb") as segment:
+        segment.seek(page.offset)
+        return gzip.decompress(segment.read(page.length)).decode("utf-8")
+
+
+class PageArchive:
+    """
+    Compressed, append-only archive of fetched pages.
+
+    Pages are appended as independent gzip members to segment files
+    (`segment-000001.gz`, ...), which roll over at `max_segment_bytes`.
+    A SQLite index maps (kind, case_id, fetched_at) to (segment, offset, length),
+    so any page can be read back without scanning the segments.
+
+    Segments are never rewritten; re-fetching a page appends a new version.
+    Several processes may share one archive (e.g. a case-id and a case-details run):
+    each append holds an exclusive lock on the segment file while it writes.
+    """
+
+    def __init__(self, root: str, max_segment_bytes: int = 256 * 1024 * 1024, compress_level: int = 6):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+
+        self._index = sqlite3.connect(str(self.root / "index.sqlite3"), check_same_thread=False)
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                case_id INTEGER,
+                key TEXT,
+                url TEXT,
+                fetched_at REAL NOT NULL,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            )
+        """)
+        self._index.execute("CREATE INDEX IF NOT EXISTS ix_pages_kind_case ON pages (kind, case_id, fetched_at)")
+        self._index.execute("CREATE INDEX IF NOT EXISTS ix_pages_kind_key ON pages (kind, key, fetched_at)")
+        self._index.commit()
+
+    def _current_segment(self) -> Path:
+        segments = sorted(self.root.glob("segment-*.gz"))
+        if segments and segments[-1].stat().st_size < self.max_segment_bytes:
+            return segments[-1]
+
+        number = int(segments[-1].stem.split("-")[1]) + 1 if segments else 1
+        return self.root / f"segment-{number:06d}.gz"
+
+    def append(
+            self,
+            kind: str,
+            html: str,
+            url: str = None,
+            case_id: int = None,
+            key: str = None,
+            fetched_at: float = None
+    ) -> ArchivedPage:
+        """
+        Append a fetched page to the archive.
+
+        Args:
+            kind (str): Page type, e.g. "view_case" or "case_search"
+            html (str): Page source
+            url (str, optional): URL the page was fetched from (used to resolve relative links)
+            case_id (int, optional): CaseID the page belongs to
+            key (str, optional): Secondary key, e.g. the search start date
+            fetched_at (float, optional): Fetch time as a UNIX timestamp (default: now)
+
+        Returns:
+            ArchivedPage: Index entry of the stored page
+        """
+        data = gzip.compress(html.encode("utf-8"), compresslevel=self.compress_level)
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+
+        with self._lock, FILE_IO_SECONDS.labels(operation="page_archive_append").time():
+            segment = self._current_segment()
+            with open(segment, "ab") as file:
+                # Another process may have appended since the file was opened; take the offset under the
+                # lock, which is held until the file is closed
+                if fcntl is not None:
+                    fcntl.flock(file, fcntl.LOCK_EX)
+                offset = file.seek(0, os.SEEK_END)
+                file.write(data)
+                file.flush()
+
+            page = ArchivedPage(
+                kind=kind,
+                case_id=case_id,
+                key=key,
+                url=url,
+                fetched_at=fetched_at,
+                segment=segment.name,
+                offset=offset,
+                length=len(data)
+            )
+            self._index.execute(
+                "INSERT INTO pages (kind, case_id, key, url, fetched_at, segment, offset, length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (page.kind, page.case_id, page.key, page.url, page.fetched_at, page.segment, page.offset, page.length)
+            )
+            self._index.commit()
+
+        return page
+
+    def read(self, page: ArchivedPage) -> str:
+        """Return the HTML of an archived page."""
+        return read_archived_page(str(self.root), page)
+
+    def history(self, kind: str, case_id: int) -> list[ArchivedPage]:
+        """Return every archived version of a case page, oldest first."""
+        with self._lock:
+            rows = self._index.execute(
+                "SELECT kind, case_id, key, url, fetched_at, segment, offset, length FROM pages "
+                "WHERE kind = ? AND case_id = ? ORDER BY fetched_at",
+                (kind, case_id)
+            ).fetchall()
+        return [ArchivedPage(*row) for row in rows]
+
+    def latest(self, kind: str) -> Iterator[ArchivedPage]:
+        """
+        Yield the most recent version of every archived page of a kind, ordered by case ID.
+
+        Args:
+            kind (str): Page type, e.g. "view_case"
+
+        Yields:
+            ArchivedPage: Latest index entry per case ID (or per key for pages without one)
+        """
+        with self._lock:
+            # SQLite returns the bare columns of the row holding MAX() in an aggregate query
+            rows = self._index.execute(
+                "SELECT kind, case_id, key, url, MAX(fetched_at), segment, offset, length FROM pages "
+                "WHERE kind = ? GROUP BY COALESCE(case_id, key) ORDER BY case_id, key",
+                (kind,)
+            ).fetchall()
+
+        for row in rows:
+            yield ArchivedPage(*row)
+
+    def count_cases(self, kind: str) -> int:
+        """Return the number of distinct cases with at least one archived page of a kind."""
+        with self._lock:
+            return self._index.execute(
+                "SELECT COUNT(DISTINCT case_id) FROM pages WHERE kind = ? AND case_id IS NOT NULL", (kind,)
+            ).fetchone()[0]
+
+    def count(self, kind: str = None) -> int:
+        with self._lock:
+            if kind is None:
+                return self._index.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            return self._index.execute("SELECT COUNT(*) FROM pages WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._index.close()
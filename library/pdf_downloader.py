@@ -1,7 +1,37 @@
+import hashlib
 import requests
 import os
+import time
+from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
+from typing import Optional
 from urllib.parse import urlparse
+from metrics import PDF_DOWNLOAD_SECONDS, PDF_BYTES_TOTAL, PDF_DOWNLOADS_TOTAL
+
+
+@dataclass
+class FetchedPdf:
+    """
+    A downloaded PDF and what the server sent for it.
+
+    Attributes:
+        path: Absolute path of the saved file
+        url: URL the file was downloaded from
+        size: Number of bytes written
+        content_length: Content-Length sent by the server (None if unknown or compressed)
+        sha256: SHA-256 of the file content
+    """
+    path: str
+    url: str
+    size: int
+    content_length: Optional[int]
+    sha256: str
+
+
+class PdfDownloadError(Exception):
+    """Raised when one or more PDFs of a case could not be downloaded."""
+    pass
 
 
 def download_pdf(url, save_path, filename=None, timeout=30, chunk_size=8192):
@@ -19,7 +49,33 @@ def download_pdf(url, save_path, filename=None, timeout=30, chunk_size=8192):
         str: Full path of the downloaded file if successful
 
     Raises:
-        ValueError: If URL is invalid or save_path doesn't exist
+        ValueError: If URL is invalid, or the response is not a complete PDF
+        requests.RequestException: If download fails
+        IOError: If file cannot be written
+    """
+    return fetch_pdf(url=url, save_path=save_path, filename=filename, timeout=timeout, chunk_size=chunk_size).path
+
+
+def fetch_pdf(url, save_path, filename=None, timeout=30, chunk_size=8192) -> FetchedPdf:
+    """
+    Download a PDF file from a URL and save it to a specified path.
+
+    The response is written to a temporary ".part" file and only moved into place
+    once it is complete, so an interrupted download never leaves a partial PDF.
+
+    Args:
+        url (str): The URL of the PDF file to download
+        save_path (str): The directory path where the PDF should be saved
+        filename (str, optional): Custom filename for the PDF. If None, extracts from URL
+        timeout (int): Request timeout in seconds (default: 30)
+        chunk_size (int): Size of chunks to download at a time (default: 8192 bytes)
+
+    Returns:
+        FetchedPdf: The saved file with its size, Content-Length and SHA-256
+
+    Raises:
+        ValueError: If URL is invalid, the response is not a PDF (e.g. an HTML error
+                    page) or it is shorter than its Content-Length
         requests.RequestException: If download fails
         IOError: If file cannot be written
     """
@@ -32,8 +88,8 @@ def download_pdf(url, save_path, filename=None, timeout=30, chunk_size=8192):
     if not parsed_url.scheme or not parsed_url.netloc:
         raise ValueError("Invalid URL format")
 
-    # Create save directory if it doesn't exist
-    save_dir = Path(save_path)
+    # Create save directory if it doesn't exist; absolute, so the recorded path matches what verify-pdf scans
+    save_dir = Path(os.path.abspath(save_path))
     save_dir.mkdir(parents=True, exist_ok=True)
 
     # Determine filename
@@ -52,6 +108,9 @@ def download_pdf(url, save_path, filename=None, timeout=30, chunk_size=8192):
 
     # Full file path
     file_path = save_dir / filename
+    part_path = save_dir / f"{filename}.part"
+
+    started = time.perf_counter()
 
     try:
         # Send GET request with stream=True for large files
@@ -62,38 +121,138 @@ def download_pdf(url, save_path, filename=None, timeout=30, chunk_size=8192):
         response = requests.get(url, headers=headers, stream=True, timeout=timeout)
         response.raise_for_status()  # Raise an exception for bad status codes
 
-        # Check if the content is actually a PDF
+        # Filter out keep-alive chunks
+        chunks = (chunk for chunk in response.iter_content(chunk_size=chunk_size) if chunk)
+
+        # Check if the content is actually a PDF - the site answers some requests with an HTML error page
         content_type = response.headers.get('content-type', '').lower()
-        if 'application/pdf' not in content_type and not url.lower().endswith('.pdf'):
-            # Try to guess from content
-            first_chunk = response.iter_content(chunk_size=1024).__next__()
-            if not first_chunk.startswith(b'%PDF'):
-                print(f"Warning: Content may not be a PDF file (Content-Type: {content_type})")
+        first_chunk = next(chunks, b'')
+        if b'%PDF' not in first_chunk[:1024]:
+            PDF_DOWNLOADS_TOTAL.labels(result="not_pdf").inc()
+            raise ValueError(f"Content is not a PDF file (Content-Type: {content_type})")
 
-        # Download and save the file
-        total_size = int(response.headers.get('content-length', 0))
+        # Content-Length counts the encoded bytes, so it can only be checked for uncompressed responses
+        encoded = response.headers.get('content-encoding', 'identity').lower() != 'identity'
+        total_size = 0 if encoded else int(response.headers.get('content-length', 0))
         downloaded_size = 0
+        digest = hashlib.sha256()
 
-        with open(file_path, 'wb') as file:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:  # Filter out keep-alive chunks
-                    file.write(chunk)
-                    downloaded_size += len(chunk)
+        # Download and save the file
+        with open(part_path, 'wb') as file:
+            for chunk in chain([first_chunk], chunks):
+                file.write(chunk)
+                digest.update(chunk)
+                downloaded_size += len(chunk)
 
-                    # Optional: Print progress for large files
-                    if total_size > 0:
-                        progress = (downloaded_size / total_size) * 100
-                        print(f"\rDownloading: {progress:.1f}%", end='', flush=True)
+                # Optional: Print progress for large files
+                if total_size > 0:
+                    progress = (downloaded_size / total_size) * 100
+                    print(f"\rDownloading: {progress:.1f}%", end='', flush=True)
 
         if total_size > 0:
             print()  # New line after progress
 
+        if total_size > 0 and downloaded_size != total_size:
+            PDF_DOWNLOADS_TOTAL.labels(result="truncated").inc()
+            raise ValueError(f"Incomplete download: got {downloaded_size} of {total_size} bytes")
+
+        os.replace(part_path, file_path)
+
+        PDF_DOWNLOAD_SECONDS.observe(time.perf_counter() - started)
+        PDF_BYTES_TOTAL.inc(downloaded_size)
+        PDF_DOWNLOADS_TOTAL.labels(result="success").inc()
+
         print(f"PDF downloaded successfully: {file_path}")
-        return str(file_path)
+        return FetchedPdf(
+            path=str(file_path),
+            url=url,
+            size=downloaded_size,
+            content_length=total_size or None,
+            sha256=digest.hexdigest()
+        )
 
     except requests.exceptions.Timeout:
+        PDF_DOWNLOADS_TOTAL.labels(result="timeout").inc()
         raise requests.RequestException(f"Download timed out after {timeout} seconds")
     except requests.exceptions.RequestException as e:
+        PDF_DOWNLOADS_TOTAL.labels(result="http_error").inc()
         raise requests.RequestException(f"Failed to download PDF: {str(e)}")
     except IOError as e:
+        PDF_DOWNLOADS_TOTAL.labels(result="io_error").inc()
         raise IOError(f"Failed to save file: {str(e)}")
+    finally:
+        # Left behind only if the download failed
+        part_path.unlink(missing_ok=True)
+
+
+def download_case_pdfs(case_id: int, pdf_url: str, pdf_name: str, save_root: str) -> list[str]:
+    """
+    Download every decision PDF of a case into `save_root/<case_id>/`.
+
+    Every file is attempted even if an earlier one fails, and each downloaded file is
+    recorded (URL, Content-Length, SHA-256) for `verify-pdf`. The case only counts as
+    downloaded when this returns without raising.
+
+    Args:
+        case_id (int): Case ID, used as the directory name
+        pdf_url (str): "|"-separated PDF URLs as stored on the case
+        pdf_name (str): "|"-separated file names matching `pdf_url`
+        save_root (str): Root PDF directory (CASE_PDF_PATH)
+
+    Returns:
+        list[str]: Paths of the downloaded files
+
+    Raises:
+        PdfDownloadError: If any PDF failed to download, or the case has no PDF URL
+    """
+    # Imported here so download_pdf itself can be used without a database
+    from dbcore.pdf_files import record_pdf_downloads
+
+    # Split both pdf_url and pdf_name by "|" to handle multiple URLs and corresponding names
+    pdf_urls = pdf_url.split("|") if pdf_url else []
+    pdf_names = pdf_name.split("|") if pdf_name else []
+
+    # Ensure we have the same number of URLs and names, or handle mismatches
+    max_count = max(len(pdf_urls), len(pdf_names))
+    fetched = []
+    errors = []
+
+    for i in range(max_count):
+
+        # Get URL and name, with fallback handling
+        url = pdf_urls[i].strip() if i < len(pdf_urls) else None
+        filename = pdf_names[i].strip() if i < len(pdf_names) else f"document_{i + 1}.pdf"
+
+        if url:  # Only process non-empty URLs
+
+            print(f"Downloading PDF {i + 1}/{max_count} for case {case_id}: {filename}")
+
+            try:
+                fetched.append(fetch_pdf(
+                    url=url,
+                    save_path=str(Path(save_root) / str(case_id)),
+                    filename=filename
+                ))
+            except (ValueError, IOError) as e:
+                errors.append(f"{filename}: {e}")
+
+    record_pdf_downloads([
+        {
+            "case_id": case_id,
+            "filename": os.path.basename(pdf.path),
+            "path": pdf.path,
+            "url": pdf.url,
+            "content_length": pdf.content_length,
+            "sha256": pdf.sha256,
+        }
+        for pdf in fetched
+    ])
+
+    if errors:
+        raise PdfDownloadError(
+            f"Case {case_id}: {len(errors)} of {len(errors) + len(fetched)} PDFs failed - " + "; ".join(errors)
+        )
+    if not fetched:
+        raise PdfDownloadError(f"Case {case_id}: no PDF URL to download")
+
+    return [pdf.path for pdf in fetched]
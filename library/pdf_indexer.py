@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+from dbcore.get import get_existing_case_ids
+from dbcore.pdf_files import get_packed_pdf_paths
+from dbcore.pdf_index import get_indexed_pdf_documents, upsert_pdf_documents, delete_pdf_documents
+from metrics import ITEMS_PROCESSED_TOTAL
+
+
+def scan_pdf_store(root: str) -> Iterator[dict]:
+    """
+    Walk the per-case PDF layout (`root/<case_id>/<filename>.pdf`).
+
+    Args:
+        root (str): PDF store root (CASE_PDF_PATH)
+
+    Yields:
+        dict: path (absolute), case_id, filename, size and mtime of every PDF file
+    """
+    # pdf_files and pdf_documents are keyed by absolute path; "./PDF" and "PDF" must give the same key
+    root = os.path.abspath(root)
+    if not Path(root).is_dir():
+        return
+
+    with os.scandir(root) as case_dirs:
+        for case_dir in case_dirs:
+            if not (case_dir.is_dir() and case_dir.name.isdigit()):
+                continue
+
+            with os.scandir(case_dir.path) as files:
+                for file in files:
+                    if file.is_file() and file.name.lower().endswith(".pdf"):
+                        stat = file.stat()
+                        yield {
+                            "path": file.path,
+                            "case_id": int(case_dir.name),
+                            "filename": file.name,
+                            "size": stat.st_size,
+                            "mtime": stat.st_mtime,
+                        }
+
+
+def extract_pdf_text(path: str) -> dict:
+    """
+    Extract the text of a PDF.
+
+    Args:
+        path (str): Path of the PDF file
+
+    Returns:
+        dict: page_count, text and error (error is None on success)
+    """
+    # Imported here so only the worker processes pay for it
+    from pypdf import PdfReader
+
+    try:
+        reader = PdfReader(path)
+        pages = [page.extract_text() or "" for page in reader.pages]
+        # PostgreSQL text columns cannot hold NUL characters
+        return {"page_count": len(pages), "text": "\n".join(pages).replace("\x00", ""), "error": None}
+    except Exception as e:
+        return {"page_count": None, "text": None, "error": f"{type(e).__name__}: {e}"}
+
+
+def _extract_batch(files: list[dict]) -> list[dict]:
+    return [{**file, **extract_pdf_text(file["path"])} for file in files]
+
+
+def index_pdf_store(root: str, workers: int = None, batch_size: int = 20) -> dict:
+    """
+    Incrementally index the text of every PDF in the store.
+
+    Only files that are new or whose size or mtime changed since they were last
+    indexed are read; rows for files that disappeared are removed, except files
+    moved into the shard store by pack-pdf. Directories whose name is not the ID of
+    a known case are skipped and reported, since their documents could not reference
+    a case row. Text extraction runs in a process pool and results are written in
+    batches as they complete.
+
+    Args:
+        root (str): PDF store root (CASE_PDF_PATH)
+        workers (int, optional): Worker processes (default: CPU count)
+        batch_size (int): Files handed to a worker at a time (default: 20)
+
+    Returns:
+        dict: Counts of scanned, indexed, failed, unchanged and removed files, and of
+              files skipped because their case is unknown
+    """
+    # Rows indexed before paths were made absolute still match their file
+    indexed = {os.path.abspath(path): (path, state) for path, state in get_indexed_pdf_documents().items()}
+    seen = set()
+    pending = []
+
+    for file in scan_pdf_store(root):
+        seen.add(file["path"])
+        if indexed.get(file["path"], (None, None))[1] != (file["size"], file["mtime"]):
+            pending.append(file)
+
+    # Packed PDFs left the per-case layout but not the store; their text stays searchable
+    packed = get_packed_pdf_paths()
+    removed = delete_pdf_documents([
+        stored_path for path, (stored_path, _) in indexed.items() if path not in seen and path not in packed
+    ])
+    stats = {"scanned": len(seen), "indexed": 0, "failed": 0, "unchanged": len(seen) - len(pending), "removed": removed}
+
+    # One document without a case row would fail its whole batch on the case_id foreign key
+    known = get_existing_case_ids(sorted({file["case_id"] for file in pending}))
+    unknown = sorted({file["case_id"] for file in pending if file["case_id"] not in known})
+    pending = [file for file in pending if file["case_id"] in known]
+    stats["unknown_case"] = stats["scanned"] - stats["unchanged"] - len(pending)
+
+    if unknown:
+        shown = ", ".join(str(case_id) for case_id in unknown[:10]) + (", ..." if len(unknown) > 10 else "")
+        print(f"Skipping {stats['unknown_case']} PDFs in {len(unknown)} directories with no case row: {shown}")
+
+    print(f"Indexing {len(pending)} new or changed PDFs ({stats['unchanged']} unchanged, {removed} removed)")
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for documents in executor.map(_extract_batch, batches):
+            upsert_pdf_documents(documents)
+
+            failed = sum(1 for document in documents if document["error"])
+            stats["failed"] += failed
+            stats["indexed"] += len(documents) - failed
+            ITEMS_PROCESSED_TOTAL.labels(stage="index_pdf").inc(len(documents))
+
+            print(f"Indexed {stats['indexed'] + stats['failed']}/{len(pending)} PDFs")
+
+    return stats
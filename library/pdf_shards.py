@@ -0,0 +1,338 @@
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from metrics import ITEMS_PROCESSED_TOTAL
+
+# Fixed part of a zip local file header; the name and extra field lengths are its last two fields
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+@dataclass(frozen=True)
+class PackedDocument:
+    """Location of a PDF inside a shard: the raw (possibly deflated) bytes at offset/length."""
+    case_id: int
+    document: str
+    shard: str
+    offset: int
+    length: int
+    size: int
+    compression: int
+    crc32: int
+
+
+def read_packed_document(root: str, document: PackedDocument) -> bytes:
+    """
+    Read a single PDF from a shard, without parsing the zip directory.
+
+    This is a plain function (rather than a PdfShardStore method) so worker
+    processes can read documents without opening the index.
+
+    Args:
+        root (str): Shard root directory
+        document (PackedDocument): Index entry of the document
+
+    Returns:
+        bytes: PDF content
+
+    Raises:
+        zipfile.BadZipFile: If the content does not match its CRC-32
+    """
+    with open(Path(root) / document.shard, "rb") as shard:
+        shard.seek(document.offset)
+        data = shard.read(document.length)
+
+    if document.compression == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(data, -zlib.MAX_WBITS)
+
+    if zlib.crc32(data) != document.crc32:
+        raise zipfile.BadZipFile(f"CRC mismatch for {document.case_id}/{document.document} in {document.shard}")
+
+    return data
+
+
+class PdfShardStore:
+    """
+    PDFs of completed cases packed into size-bounded zip shards.
+
+    Shards (`shard-000001.zip`, ...) are ordinary zip files, one entry per PDF named
+    `<case_id>/<filename>`, and roll over at `max_shard_bytes`. A SQLite index maps
+    (case_id, document) to (shard, offset, length) of the entry's data, so any PDF
+    is read with a single seek instead of opening the zip directory.
+
+    Packing the same document again appends a new entry and repoints the index to it.
+    """
+
+    def __init__(self, root: str, max_shard_bytes: int = 1024 * 1024 * 1024, compress_level: Optional[int] = 6):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_shard_bytes = max_shard_bytes
+        # PDFs are mostly compressed streams already; None stores them as they are
+        self.compression = zipfile.ZIP_STORED if compress_level is None else zipfile.ZIP_DEFLATED
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+
+        self._index = sqlite3.connect(str(self.root / "index.sqlite3"), check_same_thread=False)
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                case_id INTEGER NOT NULL,
+                document TEXT NOT NULL,
+                shard TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                compression INTEGER NOT NULL,
+                crc32 INTEGER NOT NULL,
+                packed_at REAL NOT NULL,
+                PRIMARY KEY (case_id, document)
+            )
+        """)
+        self._index.commit()
+
+    def _current_shard(self, incoming_bytes: int) -> Path:
+        shards = sorted(self.root.glob("shard-*.zip"))
+        if shards and shards[-1].stat().st_size + incoming_bytes <= self.max_shard_bytes:
+            return shards[-1]
+
+        number = int(shards[-1].stem.split("-")[1]) + 1 if shards else 1
+        return self.root / f"shard-{number:06d}.zip"
+
+    def pack_case(self, case_id: int, paths: list[str]) -> list[PackedDocument]:
+        """
+        Add the PDFs of one case to the current shard.
+
+        All documents of a case go into the same shard. The original files are left in
+        place; remove them once the packed copies are verified.
+
+        Args:
+            case_id (int): Case ID
+            paths (list[str]): PDF files of the case
+
+        Returns:
+            list[PackedDocument]: Index entries of the packed documents
+        """
+        incoming_bytes = sum(os.path.getsize(path) for path in paths)
+
+        with self._lock:
+            shard = self._current_shard(incoming_bytes)
+
+            with zipfile.ZipFile(shard, "a", compression=self.compression, compresslevel=self.compress_level) as archive:
+                for path in paths:
+                    archive.write(path, arcname=f"{case_id}/{os.path.basename(path)}")
+                infos = archive.infolist()[-len(paths):]
+
+            documents = []
+            with open(shard, "rb") as file:
+                for info in infos:
+                    # The data starts after the local header, whose extra field can differ from the directory's
+                    file.seek(info.header_offset)
+                    header = _LOCAL_HEADER.unpack(file.read(_LOCAL_HEADER.size))
+                    documents.append(PackedDocument(
+                        case_id=case_id,
+                        document=info.filename.split("/", 1)[1],
+                        shard=shard.name,
+                        offset=info.header_offset + _LOCAL_HEADER.size + header[-2] + header[-1],
+                        length=info.compress_size,
+                        size=info.file_size,
+                        compression=info.compress_type,
+                        crc32=info.CRC
+                    ))
+
+            packed_at = time.time()
+            self._index.executemany(
+                "INSERT OR REPLACE INTO documents "
+                "(case_id, document, shard, offset, length, size, compression, crc32, packed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (d.case_id, d.document, d.shard, d.offset, d.length, d.size, d.compression, d.crc32, packed_at)
+                    for d in documents
+                ]
+            )
+            self._index.commit()
+
+        return documents
+
+    def documents(self, case_id: int) -> list[PackedDocument]:
+        """Return the packed documents of a case, by name."""
+        with self._lock:
+            rows = self._index.execute(
+                "SELECT case_id, document, shard, offset, length, size, compression, crc32 FROM documents "
+                "WHERE case_id = ? ORDER BY document",
+                (case_id,)
+            ).fetchall()
+        return [PackedDocument(*row) for row in rows]
+
+    def find(self, case_id: int, document: str) -> Optional[PackedDocument]:
+        """Return the index entry of a packed document, or None if it is not packed."""
+        with self._lock:
+            row = self._index.execute(
+                "SELECT case_id, document, shard, offset, length, size, compression, crc32 FROM documents "
+                "WHERE case_id = ? AND document = ?",
+                (case_id, document)
+            ).fetchone()
+        return PackedDocument(*row) if row else None
+
+    def read(self, case_id: int, document: str) -> bytes:
+        """
+        Return the content of a packed PDF.
+
+        Raises:
+            KeyError: If the document is not packed
+        """
+        entry = self.find(case_id, document)
+        if entry is None:
+            raise KeyError(f"{case_id}/{document} is not packed")
+        return read_packed_document(str(self.root), entry)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._index.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._index.close()
+
+
+def read_case_pdf(case_id: int, document: str, pdf_root: str, store: PdfShardStore = None) -> bytes:
+    """
+    Read a case PDF from wherever it lives: the per-case directory for recent
+    downloads, or the shards once the case has been packed.
+
+    Args:
+        case_id (int): Case ID
+        document (str): PDF file name
+        pdf_root (str): Per-case PDF directory root (CASE_PDF_PATH)
+        store (PdfShardStore, optional): Shard store to fall back to
+
+    Returns:
+        bytes: PDF content
+
+    Raises:
+        FileNotFoundError: If the PDF is in neither place
+    """
+    path = Path(pdf_root, str(case_id), document)
+    if path.is_file():
+        return path.read_bytes()
+
+    if store is not None:
+        entry = store.find(case_id, document)
+        if entry is not None:
+            return read_packed_document(str(store.root), entry)
+
+    raise FileNotFoundError(f"No PDF {document} for case {case_id}")
+
+
+def pack_pdf_store(
+        pdf_root: str,
+        store: PdfShardStore,
+        min_age_seconds: float = 7 * 24 * 3600,
+        limit: int = None,
+        keep_originals: bool = False
+) -> dict:
+    """
+    Move the PDFs of completed cases from the per-case layout into shards.
+
+    A case is packed when it is marked downloaded, none of its files failed
+    verification, and none was modified within `min_age_seconds` - recent downloads
+    stay in the per-case layout. Every packed document is read back and checked
+    against its CRC before the original file is removed. Originals kept from an
+    earlier run are not packed again while their packed copy is current.
+
+    Args:
+        pdf_root (str): Per-case PDF directory root (CASE_PDF_PATH)
+        store (PdfShardStore): Shards to pack into
+        min_age_seconds (float): Minimum time since a case's newest file was written (default: 7 days)
+        limit (int, optional): Maximum number of cases to pack
+        keep_originals (bool): Leave the original files in place (default: False)
+
+    Returns:
+        dict: Counts of cases packed, documents packed, bytes packed, cases skipped as
+              recent and cases whose files were all packed before
+    """
+    # Imported here so the shard store and read helpers can be used without a database
+    from dbcore.pdf_files import get_completed_pdf_case_ids, get_pdf_file_states, mark_pdf_files_packed
+
+    stats = {"cases": 0, "documents": 0, "bytes": 0, "recent": 0, "packed_before": 0}
+    cutoff = time.time() - min_age_seconds
+    candidates = {}
+
+    if not Path(pdf_root).is_dir():
+        return stats
+
+    file_states = get_pdf_file_states()
+
+    def packed_before(case_id: int, entry: os.DirEntry) -> bool:
+        # A kept original whose packed copy is unchanged since (a re-download clears the packed status)
+        state = file_states.get(entry.path)
+        return (
+            state is not None
+            and state["status"] == "packed"
+            and state["size"] == entry.stat().st_size
+            and state["mtime"] == entry.stat().st_mtime
+            and store.find(case_id, entry.name) is not None
+        )
+
+    # Absolute, like the paths pdf_files records
+    with os.scandir(os.path.abspath(pdf_root)) as case_dirs:
+        for case_dir in case_dirs:
+            if not (case_dir.is_dir() and case_dir.name.isdigit()):
+                continue
+
+            with os.scandir(case_dir.path) as entries:
+                files = [entry for entry in entries if entry.is_file() and entry.name.lower().endswith(".pdf")]
+            if not files:
+                continue
+            if max(entry.stat().st_mtime for entry in files) > cutoff:
+                stats["recent"] += 1
+                continue
+
+            case_id = int(case_dir.name)
+            files = [entry for entry in files if not packed_before(case_id, entry)]
+            if not files:
+                stats["packed_before"] += 1
+                continue
+
+            candidates[case_id] = sorted(entry.path for entry in files)
+
+    completed = get_completed_pdf_case_ids(sorted(candidates))[:limit]
+    print(
+        f"Packing {len(completed)} completed cases "
+        f"({stats['recent']} recent left in place, {stats['packed_before']} packed before)"
+    )
+
+    for case_id in completed:
+        paths = candidates[case_id]
+        files = [
+            {"case_id": case_id, "filename": os.path.basename(path), "path": path,
+             "size": os.path.getsize(path), "mtime": os.path.getmtime(path)}
+            for path in paths
+        ]
+        documents = store.pack_case(case_id, paths)
+
+        # Read every packed copy back before the originals go
+        for document in documents:
+            read_packed_document(str(store.root), document)
+
+        mark_pdf_files_packed(files)
+
+        if not keep_originals:
+            for path in paths:
+                os.remove(path)
+            try:
+                os.rmdir(Path(pdf_root, str(case_id)))
+            except OSError:
+                pass  # Something else is in the directory; leave it
+
+        stats["cases"] += 1
+        stats["documents"] += len(documents)
+        stats["bytes"] += sum(document.size for document in documents)
+        ITEMS_PROCESSED_TOTAL.labels(stage="pack_pdf").inc()
+
+    return stats
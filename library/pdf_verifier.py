@@ -0,0 +1,155 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from dbcore.get import get_existing_case_ids
+from dbcore.pdf_files import get_pdf_file_states, save_pdf_verifications, requeue_pdf_downloads
+from metrics import ITEMS_PROCESSED_TOTAL
+from .pdf_indexer import scan_pdf_store
+
+# Statuses that mean the file has to be downloaded again
+BAD_STATUSES = ("missing", "empty", "html", "no_header", "truncated", "size_mismatch", "hash_mismatch")
+
+
+def verify_pdf_file(path: str, content_length: Optional[int] = None, sha256: Optional[str] = None) -> dict:
+    """
+    Check that a file in the PDF store is a complete PDF, and the one that was downloaded.
+
+    Checks, in order: the %PDF header in the first 1 KB (an HTML error page saved as
+    .pdf is reported as "html"), the %%EOF trailer in the last 1 KB, the size against
+    the recorded Content-Length and the content against the recorded SHA-256.
+
+    Args:
+        path (str): Path of the file
+        content_length (int, optional): Content-Length recorded at download
+        sha256 (str, optional): SHA-256 recorded at download
+
+    Returns:
+        dict: status ("ok" or one of BAD_STATUSES) and problem (None when ok)
+    """
+    try:
+        size = os.path.getsize(path)
+        if size == 0:
+            return {"status": "empty", "problem": "File is empty"}
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            head = file.read(1024)
+            digest.update(head)
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+            file.seek(max(size - 1024, 0))
+            tail = file.read()
+    except FileNotFoundError:
+        return {"status": "missing", "problem": "File does not exist"}
+    except OSError as e:
+        return {"status": "missing", "problem": f"{type(e).__name__}: {e}"}
+
+    if b"%PDF" not in head:
+        lowered = head.lstrip().lower()
+        if lowered.startswith(b"<!doctype html") or b"<html" in lowered:
+            return {"status": "html", "problem": "HTML page saved as PDF"}
+        return {"status": "no_header", "problem": "No %PDF header in the first 1 KB"}
+
+    if b"%%EOF" not in tail:
+        return {"status": "truncated", "problem": "No %%EOF trailer in the last 1 KB"}
+
+    if content_length is not None and size != content_length:
+        return {"status": "size_mismatch", "problem": f"{size} bytes on disk, Content-Length was {content_length}"}
+
+    if sha256 is not None and digest.hexdigest() != sha256:
+        return {"status": "hash_mismatch", "problem": "Content differs from the downloaded file"}
+
+    return {"status": "ok", "problem": None}
+
+
+def _verify_batch(files: list[dict]) -> list[dict]:
+    return [
+        {
+            "case_id": file["case_id"],
+            "filename": file["filename"],
+            "path": file["path"],
+            "size": file["size"],
+            "mtime": file["mtime"],
+            **verify_pdf_file(file["path"], content_length=file.get("content_length"), sha256=file.get("sha256")),
+        }
+        for file in files
+    ]
+
+
+def verify_pdf_store(root: str, workers: int = None, batch_size: int = 50, requeue: bool = True) -> dict:
+    """
+    Verify every new or changed PDF in the store, and re-queue cases with bad files.
+
+    A file is verified again only when its size or mtime differs from the last
+    verification, so re-running over a large store is cheap. Files recorded at
+    download that are no longer on disk are reported as "missing". Directories whose
+    name is not the ID of a known case are skipped and reported. Verification runs
+    in a process pool; results are saved in batches as they complete.
+
+    Args:
+        root (str): PDF store root (CASE_PDF_PATH)
+        workers (int, optional): Worker processes (default: CPU count)
+        batch_size (int): Files handed to a worker at a time (default: 50)
+        requeue (bool): Mark cases with bad files as not downloaded (default: True)
+
+    Returns:
+        dict: Counts of scanned, verified, unchanged, ok, requeued and files skipped
+              because their case is unknown, plus one per bad status
+    """
+    states = get_pdf_file_states()
+    seen = set()
+    pending = []
+
+    for file in scan_pdf_store(root):
+        seen.add(file["path"])
+        state = states.get(file["path"], {})
+        if (state.get("size"), state.get("mtime")) != (file["size"], file["mtime"]):
+            pending.append({**file, "content_length": state.get("content_length"), "sha256": state.get("sha256")})
+
+    missing = [
+        {"case_id": state["case_id"], "filename": os.path.basename(path), "path": path, "size": None, "mtime": None,
+         "status": "missing", "problem": "File does not exist"}
+        for path, state in states.items()
+        if path not in seen and state["status"] not in ("missing", "packed")
+    ]
+
+    stats = {"scanned": len(seen), "verified": 0, "unchanged": len(seen) - len(pending), "ok": 0, "requeued": 0}
+    bad_case_ids = set()
+
+    # A result without a case row would fail its whole batch on the case_id foreign key
+    known = get_existing_case_ids(sorted({file["case_id"] for file in pending}))
+    unknown = sorted({file["case_id"] for file in pending if file["case_id"] not in known})
+    pending = [file for file in pending if file["case_id"] in known]
+    stats["unknown_case"] = stats["scanned"] - stats["unchanged"] - len(pending)
+
+    if unknown:
+        shown = ", ".join(str(case_id) for case_id in unknown[:10]) + (", ..." if len(unknown) > 10 else "")
+        print(f"Skipping {stats['unknown_case']} PDFs in {len(unknown)} directories with no case row: {shown}")
+
+    print(f"Verifying {len(pending)} new or changed PDFs ({stats['unchanged']} unchanged, {len(missing)} missing)")
+
+    def collect(results: list[dict]):
+        save_pdf_verifications(results)
+        for result in results:
+            stats[result["status"]] = stats.get(result["status"], 0) + 1
+            if result["status"] != "ok":
+                bad_case_ids.add(result["case_id"])
+        ITEMS_PROCESSED_TOTAL.labels(stage="verify_pdf").inc(len(results))
+
+    for i in range(0, len(missing), batch_size):
+        collect(missing[i:i + batch_size])
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(_verify_batch, batches):
+            collect(results)
+            stats["verified"] += len(results)
+            print(f"Verified {stats['verified']}/{len(pending)} PDFs")
+
+    if requeue:
+        stats["requeued"] = requeue_pdf_downloads(sorted(bad_case_ids))
+
+    return stats
@@ -1,22 +1,35 @@
 import argparse
-from controller import run_scraper
+from controller import run_scraper, list_categories, load_plugins
+from dbcore.config import get_config
 
 
 def main():
+    # Plugin modules register extra categories before the parser is built
+    load_plugins(get_config().get("CATEGORY_PLUGINS"))
+
     parser = argparse.ArgumentParser(description="Case Scraper Tool")
 
-    parser.add_argument(
-        "category",
-        choices=["case-id", "case-details", "download-pdf", "export-excel"],
-        help="Category to perform"
+    # Options every category accepts, after the category name
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument(
+        "--profile", nargs="?", const="sample", choices=("sample", "cprofile"), default=None,
+        help="Profile the run (default mode: sample) and write stacks, spans and memory to PROFILE_PATH"
     )
 
+    subparsers = parser.add_subparsers(dest="category", required=True, metavar="category", help="Category to perform")
+
+    for category in list_categories():
+        category_parser = subparsers.add_parser(category.name, help=category.help, parents=[common_parser])
+        for flags, kwargs in category.arguments:
+            category_parser.add_argument(*flags, **kwargs)
+
     # Parse full args
     args = parser.parse_args()
+    options = {key: value for key, value in vars(args).items() if key not in ("category", "profile")}
 
     # Run scraper with parsed arguments
-    run_scraper(args.category)
+    run_scraper(args.category, profile=args.profile, **options)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
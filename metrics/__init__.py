@@ -0,0 +1,21 @@
+from .registry import MetricsRegistry, Counter, Gauge, Histogram, registry, add_span_hook, remove_span_hook
+from .catalog import (
+    PAGE_NAVIGATION_SECONDS,
+    FIELD_EXTRACTION_SECONDS,
+    FIELDS_MISSING_TOTAL,
+    SCRAPER_ERRORS_TOTAL,
+    WAIT_TIMEOUT_SECONDS,
+    WAIT_OUTCOMES_TOTAL,
+    ITEMS_PROCESSED_TOTAL,
+    RETRIES_TOTAL,
+    QUEUE_DEPTH,
+    DB_OPERATION_SECONDS,
+    DB_ROWS_TOTAL,
+    PDF_DOWNLOAD_SECONDS,
+    PDF_BYTES_TOTAL,
+    PDF_DOWNLOADS_TOTAL,
+    FILE_IO_SECONDS,
+)
+from .exporters import render_prometheus, snapshot, write_prometheus_textfile, write_json_snapshot, SnapshotWriter
+from .run import metrics_run, format_summary
+from .profiling import profile_run
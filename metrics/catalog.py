@@ -0,0 +1,102 @@
+from .registry import registry
+
+# -------------------------------------------------------------------
+# Scraping - page navigation and field extraction
+# -------------------------------------------------------------------
+PAGE_NAVIGATION_SECONDS = registry.histogram(
+    "scraper_page_navigation_seconds",
+    "Time spent loading a page until its main content is present",
+    labelnames=("page",)
+)
+
+FIELD_EXTRACTION_SECONDS = registry.histogram(
+    "scraper_field_extraction_seconds",
+    "Time spent extracting fields from a loaded page",
+    labelnames=("page",)
+)
+
+FIELDS_MISSING_TOTAL = registry.counter(
+    "scraper_fields_missing_total",
+    "Fields that were not present on a scraped page",
+    labelnames=("field",)
+)
+
+SCRAPER_ERRORS_TOTAL = registry.counter(
+    "scraper_errors_total",
+    "Errors raised while scraping, by stage",
+    labelnames=("stage",)
+)
+
+WAIT_TIMEOUT_SECONDS = registry.gauge(
+    "scraper_wait_timeout_seconds",
+    "Current adaptive timeout of browser waits, by page",
+    labelnames=("page",)
+)
+
+WAIT_OUTCOMES_TOTAL = registry.counter(
+    "scraper_wait_outcomes_total",
+    "Browser waits by page and outcome (found, not_found, timeout)",
+    labelnames=("page", "outcome")
+)
+
+ITEMS_PROCESSED_TOTAL = registry.counter(
+    "pipeline_items_processed_total",
+    "Work items completed, by stage",
+    labelnames=("stage",)
+)
+
+RETRIES_TOTAL = registry.counter(
+    "pipeline_retries_total",
+    "Work items retried after a failure, by stage",
+    labelnames=("stage",)
+)
+
+QUEUE_DEPTH = registry.gauge(
+    "pipeline_queue_depth",
+    "Work items waiting to be processed, by queue",
+    labelnames=("queue",)
+)
+
+# -------------------------------------------------------------------
+# Database - reads and writes through dbcore
+# -------------------------------------------------------------------
+DB_OPERATION_SECONDS = registry.histogram(
+    "db_operation_seconds",
+    "Time spent in dbcore operations",
+    labelnames=("operation", "kind")
+)
+
+DB_ROWS_TOTAL = registry.counter(
+    "db_rows_total",
+    "Rows read or written through dbcore",
+    labelnames=("operation", "kind")
+)
+
+# -------------------------------------------------------------------
+# PDF downloads
+# -------------------------------------------------------------------
+PDF_DOWNLOAD_SECONDS = registry.histogram(
+    "pdf_download_seconds",
+    "Time spent downloading a single PDF",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+
+PDF_BYTES_TOTAL = registry.counter(
+    "pdf_downloaded_bytes_total",
+    "Bytes written to disk for downloaded PDFs"
+)
+
+PDF_DOWNLOADS_TOTAL = registry.counter(
+    "pdf_downloads_total",
+    "PDF download attempts, by result",
+    labelnames=("result",)
+)
+
+# -------------------------------------------------------------------
+# File I/O - archives and exports written to disk
+# -------------------------------------------------------------------
+FILE_IO_SECONDS = registry.histogram(
+    "file_io_seconds",
+    "Time spent writing archives and exports to disk",
+    labelnames=("operation",)
+)
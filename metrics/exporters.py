@@ -0,0 +1,162 @@
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from .registry import MetricsRegistry, Histogram, registry as default_registry
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+
+    escaped = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _atomic_write(path: str, content: str):
+    """Write to a temporary sibling file and rename it, so readers never see a partial file."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, target)
+
+
+def render_prometheus(registry: MetricsRegistry = default_registry) -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Args:
+        registry (MetricsRegistry): Registry to render (default: process-wide registry)
+
+    Returns:
+        str: Exposition text suitable for the node_exporter textfile collector
+    """
+    lines = []
+
+    for metric in registry.collect():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+
+        for labels, child in metric.samples():
+            if isinstance(metric, Histogram):
+                cumulative = 0
+                for upper_bound, bucket_count in zip(child.buckets, child.bucket_counts):
+                    cumulative += bucket_count
+                    bucket_labels = _format_labels({**labels, "le": _format_value(upper_bound)})
+                    lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(child.sum)}")
+                lines.append(f"{metric.name}_count{_format_labels(labels)} {child.count}")
+            else:
+                lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(child.value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def snapshot(registry: MetricsRegistry = default_registry) -> dict:
+    """
+    Build a JSON-serialisable snapshot of every metric.
+
+    Args:
+        registry (MetricsRegistry): Registry to snapshot (default: process-wide registry)
+
+    Returns:
+        dict: Snapshot with a timestamp, the run uptime and one entry per metric
+    """
+    metrics = {}
+
+    for metric in registry.collect():
+        samples = []
+        for labels, child in metric.samples():
+            if isinstance(metric, Histogram):
+                samples.append({
+                    "labels": labels,
+                    "count": child.count,
+                    "sum": child.sum,
+                    "p50": child.quantile(0.5),
+                    "p95": child.quantile(0.95),
+                    "p99": child.quantile(0.99),
+                })
+            else:
+                samples.append({"labels": labels, "value": child.value})
+
+        metrics[metric.name] = {"type": metric.type_name, "samples": samples}
+
+    return {
+        "timestamp": time.time(),
+        "uptime_seconds": time.time() - registry.started_at,
+        "metrics": metrics,
+    }
+
+
+def write_prometheus_textfile(path: str, registry: MetricsRegistry = default_registry):
+    """Atomically write the Prometheus exposition text to `path`."""
+    _atomic_write(path, render_prometheus(registry))
+
+
+def write_json_snapshot(path: str, registry: MetricsRegistry = default_registry):
+    """Atomically write a JSON snapshot of all metrics to `path`."""
+    # Infinity is not valid JSON, so histogram quantiles falling in the last bucket are written as null
+    data = snapshot(registry)
+    for metric in data["metrics"].values():
+        for sample in metric["samples"]:
+            for key in ("p50", "p95", "p99"):
+                if sample.get(key) is not None and math.isinf(sample[key]):
+                    sample[key] = None
+    _atomic_write(path, json.dumps(data, indent=2, default=str))
+
+
+class SnapshotWriter:
+    """
+    Background thread that periodically writes metrics to a Prometheus textfile and/or JSON file.
+    """
+
+    def __init__(
+            self,
+            prometheus_path: str = None,
+            json_path: str = None,
+            interval: float = 15.0,
+            registry: MetricsRegistry = default_registry
+    ):
+        self.prometheus_path = prometheus_path
+        self.json_path = json_path
+        self.interval = interval
+        self.registry = registry
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot-writer", daemon=True)
+
+    def start(self):
+        if self.prometheus_path or self.json_path:
+            self._thread.start()
+
+    def write(self):
+        try:
+            if self.prometheus_path:
+                write_prometheus_textfile(self.prometheus_path, self.registry)
+            if self.json_path:
+                write_json_snapshot(self.json_path, self.registry)
+        except OSError as e:
+            print(f"Warning: Failed to write metrics snapshot: {e}")
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def stop(self):
+        """Stop the background thread and write one final snapshot."""
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self.prometheus_path or self.json_path:
+            self.write()
@@ -0,0 +1,173 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter as _Tally
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Generator
+from .registry import add_span_hook, remove_span_hook
+
+PROFILE_MODES = ("sample", "cprofile")
+
+
+class _StackSampler(threading.Thread):
+    """Sample the stacks of every other thread at a fixed interval and tally them."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = _Tally()
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._labels = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.stacks[";".join(reversed(stack))] += 1
+
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class _SpanRecorder:
+    """Collect metric timer spans as Chrome trace events (chrome://tracing, Perfetto)."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.events = []
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str, start: float, duration: float):
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": round((start - self.started) * 1_000_000),
+            "dur": round(duration * 1_000_000),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        with self._lock:
+            self.events.append(event)
+
+
+@contextmanager
+def profile_run(
+        category: str,
+        mode: str = "sample",
+        output_dir: str = "./profiles",
+        interval: float = 0.005,
+        memory: bool = True
+) -> Generator[Path, None, None]:
+    """
+    Profile the block and write the results to `output_dir`, one set of files per run.
+
+    Always written, named `<category>-<timestamp>`:
+    - `.collapsed`: stacks of every thread sampled every `interval` seconds, in the
+      collapsed format flamegraph.pl, speedscope and inferno read ("a;b;c count")
+    - `-spans.json`: every metrics timer (page navigation, field extraction, dbcore
+      operations, PDF downloads, file I/O) as a Chrome trace event, per thread
+    - `-memory.txt`: peak traced memory and the top allocation sites (tracemalloc)
+    With mode "cprofile", also `.prof` (open with pstats or snakeviz) and `-cprofile.txt`,
+    the top functions by cumulative time. cProfile only sees the main thread.
+
+    Args:
+        category (str): CLI category being run, used in the file names
+        mode (str): "sample" or "cprofile" (default: "sample")
+        output_dir (str): Directory for the profile files (default: ./profiles)
+        interval (float): Seconds between stack samples (default: 0.005)
+        memory (bool): Trace allocations with tracemalloc (default: True)
+
+    Yields:
+        Path: Common path prefix of the files written
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}'. Available: {', '.join(PROFILE_MODES)}")
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    stem = Path(output_dir, f"{category}-{datetime.now().strftime('%Y%m%dT%H%M%S')}")
+
+    spans = _SpanRecorder(time.perf_counter())
+    add_span_hook(spans)
+
+    if memory:
+        tracemalloc.start(1)
+
+    profiler = cProfile.Profile() if mode == "cprofile" else None
+    sampler = _StackSampler(interval)
+    sampler.start()
+
+    if profiler is not None:
+        profiler.enable()
+
+    try:
+        yield stem
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        sampler.stop()
+        remove_span_hook(spans)
+
+        written = []
+
+        with open(f"{stem}.collapsed", "w", encoding="utf-8") as file:
+            for stack, count in sampler.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        written.append(f"{stem}.collapsed")
+
+        with open(f"{stem}-spans.json", "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": spans.events, "displayTimeUnit": "ms"}, file)
+        written.append(f"{stem}-spans.json")
+
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            with open(f"{stem}-memory.txt", "w", encoding="utf-8") as file:
+                file.write(f"Traced memory: current {current / 1_000_000:.1f} MB, peak {peak / 1_000_000:.1f} MB\n\n")
+                for statistic in snapshot.statistics("lineno")[:30]:
+                    file.write(f"{statistic}\n")
+            written.append(f"{stem}-memory.txt")
+
+        if profiler is not None:
+            profiler.dump_stats(f"{stem}.prof")
+            with open(f"{stem}-cprofile.txt", "w", encoding="utf-8") as file:
+                pstats.Stats(profiler, stream=file).sort_stats("cumulative").print_stats(40)
+            written.append(f"{stem}.prof")
+            written.append(f"{stem}-cprofile.txt")
+
+        print(
+            f"Profile of '{category}' ({sampler.samples} samples, {len(spans.events)} spans) written to:\n"
+            + "\n".join(f"  {path}" for path in written),
+            file=sys.stderr
+        )
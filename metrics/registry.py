@@ -0,0 +1,246 @@
+import threading
+import time
+from contextlib import ContextDecorator
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+# Called with (span name, start perf_counter, duration) for every finished histogram timer
+_span_hooks = []
+
+
+def add_span_hook(hook):
+    """Receive every histogram timer as a span, e.g. for a profiler's timeline."""
+    _span_hooks.append(hook)
+
+
+def remove_span_hook(hook):
+    _span_hooks.remove(hook)
+
+
+class _Timer(ContextDecorator):
+    """
+    Context manager / decorator that observes elapsed wall time into a histogram child.
+    """
+
+    def __init__(self, child: "_HistogramChild"):
+        self._child = child
+        self._start = None
+
+    def _recreate_cm(self):
+        # A fresh timer per decorated call keeps the decorator thread-safe and re-entrant
+        return _Timer(self._child)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self._start
+        self._child.observe(duration)
+        for hook in _span_hooks:
+            hook(self._child.span_name, self._start, duration)
+        return False
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Sequence[float]):
+        self._lock = threading.Lock()
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    self.bucket_counts[index] += 1
+                    break
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile from the bucket counts (upper bound of the matching bucket).
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            float: Estimated quantile, or None if nothing was observed
+        """
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = q * self.count
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, self.bucket_counts):
+                cumulative += bucket_count
+                if cumulative >= rank:
+                    return upper_bound
+            return self.buckets[-1]
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        """Return the child metric for the given label values, creating it on first use."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+                label_text = ",".join(f"{name}={value}" for name, value in zip(self.labelnames, key))
+                child.span_name = f"{self.name}{{{label_text}}}" if label_text else self.name
+            return child
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} is labelled, call .labels() first")
+        return self.labels()
+
+    def samples(self) -> Iterator[Tuple[Dict[str, str], object]]:
+        """Yield (labels, child) pairs for every label combination seen so far."""
+        with self._lock:
+            items = list(self._children.items())
+        for key, child in items:
+            yield dict(zip(self.labelnames, key)), child
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._unlabelled().dec(amount)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        buckets = tuple(sorted(buckets))
+        if buckets[-1] != float("inf"):
+            buckets += (float("inf"),)
+        self.buckets = buckets
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._unlabelled().observe(value)
+
+    def time(self) -> _Timer:
+        return self._unlabelled().time()
+
+
+class MetricsRegistry:
+    """Container for every metric exposed by the scraper."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self.started_at = time.time()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def collect(self) -> list[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+
+# Process-wide default registry
+registry = MetricsRegistry()
@@ -0,0 +1,108 @@
+import math
+import sys
+import time
+from contextlib import contextmanager
+from typing import Generator, Optional
+from .registry import MetricsRegistry, Histogram, registry as default_registry
+from .exporters import SnapshotWriter
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if math.isinf(value):
+        return "> last bucket"
+    return f"{value:.3f}s"
+
+
+def format_summary(category: str, elapsed: float, registry: MetricsRegistry = default_registry) -> str:
+    """
+    Render a human-readable summary of the metrics collected during a run.
+
+    Args:
+        category (str): CLI category that was run
+        elapsed (float): Run duration in seconds
+        registry (MetricsRegistry): Registry to summarise (default: process-wide registry)
+
+    Returns:
+        str: Multi-line summary text
+    """
+    lines = [f"Metrics summary for '{category}' ({elapsed:.1f}s)"]
+
+    for metric in registry.collect():
+        for labels, child in metric.samples():
+            label_text = ",".join(f"{key}={value}" for key, value in labels.items())
+            name = f"{metric.name}{{{label_text}}}" if label_text else metric.name
+
+            if isinstance(metric, Histogram):
+                if child.count == 0:
+                    continue
+                lines.append(
+                    f"  {name}: count={child.count} total={child.sum:.3f}s "
+                    f"mean={child.sum / child.count:.3f}s "
+                    f"p50={_format_seconds(child.quantile(0.5))} p95={_format_seconds(child.quantile(0.95))}"
+                )
+            elif metric.type_name == "counter":
+                if child.value:
+                    value = int(child.value) if float(child.value).is_integer() else round(child.value, 3)
+                    lines.append(f"  {name}: {value}")
+
+    # Derived PDF throughput, since that is the number people ask about first
+    pdf_bytes = sum(child.value for _, child in _samples(registry, "pdf_downloaded_bytes_total"))
+    pdf_seconds = sum(child.sum for _, child in _samples(registry, "pdf_download_seconds"))
+    if pdf_bytes and pdf_seconds:
+        lines.append(f"  pdf throughput: {pdf_bytes / pdf_seconds / 1_000_000:.2f} MB/s")
+
+    if len(lines) == 1:
+        lines.append("  (no metrics recorded)")
+
+    return "\n".join(lines)
+
+
+def _samples(registry: MetricsRegistry, name: str):
+    for metric in registry.collect():
+        if metric.name == name:
+            return list(metric.samples())
+    return []
+
+
+@contextmanager
+def metrics_run(
+        category: str,
+        prometheus_path: str = None,
+        json_path: str = None,
+        interval: float = 15.0,
+        registry: MetricsRegistry = default_registry
+) -> Generator[MetricsRegistry, None, None]:
+    """
+    Collect metrics for the duration of a CLI run.
+
+    While the block runs, snapshots are written periodically to the configured
+    Prometheus textfile and/or JSON file. On exit (including errors and Ctrl+C)
+    a final snapshot is written and a per-run summary is printed to stderr.
+
+    Args:
+        category (str): CLI category being run
+        prometheus_path (str, optional): Prometheus textfile collector output path
+        json_path (str, optional): JSON snapshot output path
+        interval (float): Seconds between periodic snapshots (default: 15)
+        registry (MetricsRegistry): Registry to export (default: process-wide registry)
+
+    Yields:
+        MetricsRegistry: The registry being exported
+    """
+    writer = SnapshotWriter(
+        prometheus_path=prometheus_path,
+        json_path=json_path,
+        interval=interval,
+        registry=registry
+    )
+    started = time.perf_counter()
+    writer.start()
+
+    try:
+        yield registry
+    finally:
+        writer.stop()
+        # stderr, so categories that write data to stdout (e.g. query --format jsonl) stay pipeable
+        print(format_summary(category, time.perf_counter() - started, registry), file=sys.stderr)
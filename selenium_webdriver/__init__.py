@@ -1 +1,9 @@
-from .chrome_driver import get_selenium_chrome_driver
\ No newline at end of file
+from .chrome_driver import get_selenium_chrome_driver
+from .browser_daemon import (
+    BrowserDaemon,
+    BrowserDaemonError,
+    BrowserLeaseLostError,
+    LeasedChromeDriver,
+    lease_chromedriver,
+    browser_daemon_status,
+)
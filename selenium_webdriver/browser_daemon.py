@@ -0,0 +1,417 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Optional
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.remote.command import Command
+from .chrome_driver import get_selenium_chrome_driver
+
+
+class BrowserDaemonError(Exception):
+    """Raised when no browser could be leased from the daemon (not running, busy, or attach failed)."""
+    pass
+
+
+class BrowserLeaseLostError(BrowserDaemonError):
+    """Raised when a lease expired: its browser went back to the pool and may be driven by another run."""
+    pass
+
+
+def _parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def _request(address: str, message: dict, timeout: float = 10) -> dict:
+    """Send one JSON request to the daemon and return its JSON reply."""
+    try:
+        with socket.create_connection(_parse_address(address), timeout=timeout) as connection:
+            connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+            with connection.makefile("r", encoding="utf-8") as reader:
+                line = reader.readline()
+    except (OSError, ValueError) as e:
+        raise BrowserDaemonError(f"Browser daemon at {address} is not reachable: {e}") from e
+
+    if not line:
+        raise BrowserDaemonError(f"Browser daemon at {address} closed the connection")
+
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        if reply.get("lease_lost"):
+            raise BrowserLeaseLostError(reply.get("error"))
+        raise BrowserDaemonError(reply.get("error") or "Request refused")
+    return reply
+
+
+@dataclass
+class _Browser:
+    slot: int
+    port: int
+    driver: Optional[webdriver.Chrome] = None
+    lease_id: Optional[str] = None
+    owner: Optional[str] = None
+    expires_at: float = 0.0
+    leases: int = 0
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            message = json.loads(self.rfile.readline())
+            reply = self.server.browser_daemon.handle(message)
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class BrowserDaemon:
+    """
+    Keep a pool of warm Chrome browsers and lease them to scraper runs over a local socket.
+
+    Every browser is launched once, through chromedriver, with its own remote-debugging
+    port and profile directory, and stays up for the life of the daemon, so its HTTP
+    cache and session cookies carry over from one lease to the next. A lease hands out
+    the browser's debugger address; the client attaches its own chromedriver session
+    to it (see `lease_chromedriver`). On release the daemon closes the extra tabs and
+    blanks the page; a browser that died is launched again.
+
+    Leases expire after `lease_seconds` unless renewed, so a run that crashed does not
+    hold its browser forever.
+    """
+
+    def __init__(
+            self,
+            address: str = "127.0.0.1:9600",
+            browsers: int = 2,
+            first_debugging_port: int = 9222,
+            lease_seconds: float = 600,
+            launcher: Callable[[int], webdriver.Chrome] = None,
+            **driver_options
+    ):
+        """
+        Args:
+            address: "host:port" the daemon listens on; keep it on localhost
+            browsers: Number of browsers in the pool
+            first_debugging_port: Remote-debugging port of the first browser; the others count up
+            lease_seconds: Time a lease lasts without being renewed (in seconds)
+            launcher: Function launching a browser for a debugging port (default: Chrome via
+                      get_selenium_chrome_driver with `driver_options`)
+            **driver_options: Options for get_selenium_chrome_driver, e.g. chromedriver_path, headless
+        """
+        if browsers < 1:
+            raise ValueError(f"browsers must be at least 1, got: {browsers}")
+
+        self.address = address
+        self.lease_seconds = lease_seconds
+        self.launcher = launcher or (
+            lambda port: get_selenium_chrome_driver(remote_debugging_port=port, **driver_options)
+        )
+        self._browsers = [_Browser(slot=slot, port=first_debugging_port + slot) for slot in range(browsers)]
+        self._available = threading.Condition()
+        self._stop_event = threading.Event()
+        self._server = None
+
+    # Pool
+    # ---------------------------------------------------------------
+    def _launch(self, browser: _Browser):
+        started = time.perf_counter()
+        browser.driver = self.launcher(browser.port)
+        print(f"Browser {browser.slot} ready on debugging port {browser.port} ({time.perf_counter() - started:.1f}s)")
+
+    def _reset(self, browser: _Browser):
+        """Close the tabs a lease opened and blank the page; relaunch the browser if it died."""
+        try:
+            handles = browser.driver.window_handles
+            for handle in handles[1:]:
+                browser.driver.switch_to.window(handle)
+                browser.driver.close()
+            browser.driver.switch_to.window(handles[0])
+            browser.driver.get("about:blank")
+        except (WebDriverException, AttributeError, IndexError) as e:
+            print(f"Browser {browser.slot} is gone ({e}), launching it again")
+            self._quit(browser)
+            self._launch(browser)
+
+    @staticmethod
+    def _quit(browser: _Browser):
+        if browser.driver is not None:
+            try:
+                browser.driver.quit()
+            except WebDriverException:
+                pass
+            browser.driver = None
+
+    @staticmethod
+    def _hold_for_reset(browser: _Browser):
+        # Neither free nor leasable nor reclaimable until the reset is done (call with the lock held)
+        browser.lease_id = ""
+        browser.expires_at = float("inf")
+
+    def _free(self, browser: _Browser):
+        # Reset outside the lock, so other requests are not held up by the browser
+        try:
+            self._reset(browser)
+        finally:
+            with self._available:
+                browser.lease_id = None
+                browser.owner = None
+                browser.expires_at = 0.0
+                self._available.notify()
+
+    def _reap(self):
+        """Reclaim browsers whose lease expired without being renewed or released."""
+        while not self._stop_event.wait(5):
+            now = time.monotonic()
+            with self._available:
+                expired = [browser for browser in self._browsers if browser.lease_id and browser.expires_at < now]
+                for browser in expired:
+                    print(f"Lease of browser {browser.slot} by {browser.owner} expired, reclaiming it")
+                    self._hold_for_reset(browser)
+
+            for browser in expired:
+                self._free(browser)
+
+    # Requests
+    # ---------------------------------------------------------------
+    def _find_lease(self, lease_id: str) -> _Browser:
+        for browser in self._browsers:
+            if lease_id and browser.lease_id == lease_id:
+                return browser
+        raise BrowserLeaseLostError(f"Unknown or expired lease: {lease_id}")
+
+    def _lease(self, owner: str, wait_seconds: float, lease_seconds: float) -> dict:
+        deadline = time.monotonic() + min(wait_seconds, 300)
+
+        with self._available:
+            while True:
+                browser = next((browser for browser in self._browsers if browser.lease_id is None), None)
+                if browser is not None:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BrowserDaemonError(f"All {len(self._browsers)} browsers are leased")
+                self._available.wait(remaining)
+
+            browser.lease_id = lease_id = uuid.uuid4().hex
+            browser.owner = owner
+            browser.expires_at = time.monotonic() + lease_seconds
+            browser.leases += 1
+
+        host, _ = _parse_address(self.address)
+        print(f"Browser {browser.slot} leased to {owner}")
+        return {
+            "ok": True,
+            "lease_id": lease_id,
+            "debugger_address": f"{host}:{browser.port}",
+            "lease_seconds": lease_seconds,
+        }
+
+    def handle(self, message: dict) -> dict:
+        """
+        Answer one protocol request.
+
+        Args:
+            message: {"op": "lease", "owner", "wait_seconds", "lease_seconds"},
+                     {"op": "renew", "lease_id"}, {"op": "release", "lease_id"} or {"op": "status"}
+
+        Returns:
+            dict: Reply with "ok", plus "error" when it is False and "lease_lost" when
+                  the lease is unknown or expired
+        """
+        op = message.get("op")
+
+        try:
+            if op == "lease":
+                return self._lease(
+                    owner=str(message.get("owner") or "unknown"),
+                    wait_seconds=float(message.get("wait_seconds") or 0),
+                    lease_seconds=float(message.get("lease_seconds") or self.lease_seconds)
+                )
+
+            if op == "renew":
+                with self._available:
+                    browser = self._find_lease(message.get("lease_id"))
+                    lease_seconds = float(message.get("lease_seconds") or self.lease_seconds)
+                    browser.expires_at = time.monotonic() + lease_seconds
+                return {"ok": True, "lease_seconds": lease_seconds}
+
+            if op == "release":
+                with self._available:
+                    browser = self._find_lease(message.get("lease_id"))
+                    self._hold_for_reset(browser)
+                print(f"Browser {browser.slot} released by {browser.owner}")
+                self._free(browser)
+                return {"ok": True}
+
+            if op == "status":
+                now = time.monotonic()
+                with self._available:
+                    browsers = [
+                        {
+                            "slot": browser.slot,
+                            "port": browser.port,
+                            "owner": browser.owner,
+                            "leased": browser.lease_id is not None,
+                            "expires_in": round(browser.expires_at - now, 1) if browser.lease_id else None,
+                            "resetting": browser.lease_id == "",
+                            "leases": browser.leases,
+                        }
+                        for browser in self._browsers
+                    ]
+                return {"ok": True, "browsers": browsers}
+        except BrowserLeaseLostError as e:
+            return {"ok": False, "error": str(e), "lease_lost": True}
+        except BrowserDaemonError as e:
+            return {"ok": False, "error": str(e)}
+
+        return {"ok": False, "error": f"Unknown op: {op}"}
+
+    # Lifecycle
+    # ---------------------------------------------------------------
+    def serve_forever(self):
+        """Launch the pool and answer requests until interrupted, then close every browser."""
+        for browser in self._browsers:
+            self._launch(browser)
+
+        self._server = _Server(_parse_address(self.address), _RequestHandler)
+        self._server.browser_daemon = self
+        reaper = threading.Thread(target=self._reap, name="browser-daemon-reaper", daemon=True)
+        reaper.start()
+
+        print(f"Browser daemon listening on {self.address} with {len(self._browsers)} browsers")
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stop_event.set()
+            self._server.server_close()
+            for browser in self._browsers:
+                self._quit(browser)
+            print("Browser daemon stopped")
+
+    def shutdown(self):
+        """Stop `serve_forever` from another thread."""
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class LeasedChromeDriver(webdriver.Chrome):
+    """
+    A chromedriver session attached to a browser leased from the daemon.
+
+    The lease is renewed in the background while the session is open; `quit()` ends
+    the session and releases the browser back to the pool, which keeps it running.
+    If the daemon reports the lease expired anyway, the browser may already serve
+    another run: renewing stops and every further command raises BrowserLeaseLostError.
+    """
+
+    def __init__(self, daemon_address: str, lease: dict, *args, **kwargs):
+        self._lease_lost = None
+        super().__init__(*args, **kwargs)
+        self.daemon_address = daemon_address
+        self.lease_id = lease["lease_id"]
+        self._released = threading.Event()
+        self._renewer = threading.Thread(
+            target=self._renew, args=(float(lease["lease_seconds"]),), name="browser-lease-renewer", daemon=True
+        )
+        self._renewer.start()
+
+    def _renew(self, lease_seconds: float):
+        while not self._released.wait(lease_seconds / 3):
+            try:
+                _request(self.daemon_address, {"op": "renew", "lease_id": self.lease_id})
+            except BrowserLeaseLostError as e:
+                print(f"Browser lease lost, no further commands are sent to the browser: {e}")
+                self._lease_lost = e
+                return
+            except BrowserDaemonError as e:
+                print(f"Could not renew browser lease: {e}")
+
+    def execute(self, driver_command: str, params: dict = None):
+        if self._lease_lost is not None and driver_command != Command.QUIT:
+            raise BrowserLeaseLostError(f"The browser was taken back by the daemon: {self._lease_lost}")
+        return super().execute(driver_command, params)
+
+    def quit(self):
+        if self._released.is_set():
+            return
+        self._released.set()
+
+        try:
+            # A session attached through debugger_address ends without closing the browser
+            super().quit()
+        finally:
+            # A lost lease has nothing left to release
+            if self._lease_lost is None:
+                try:
+                    _request(self.daemon_address, {"op": "release", "lease_id": self.lease_id})
+                except BrowserDaemonError as e:
+                    print(f"Could not release browser lease: {e}")
+
+
+def lease_chromedriver(
+        address: str,
+        chromedriver_path: str = "/usr/local/bin/chromedriver",
+        page_load_strategy: str = None,
+        owner: str = None,
+        wait_seconds: float = 30
+) -> LeasedChromeDriver:
+    """
+    Lease a warm browser from the daemon and attach a WebDriver session to it.
+
+    Args:
+        address (str): "host:port" of the browser daemon
+        chromedriver_path (str): Path to the ChromeDriver executable used to attach
+        page_load_strategy (str): Page load strategy of the attached session (default: Chrome's "normal")
+        owner (str): Name shown in the daemon's status (default: host and process ID)
+        wait_seconds (float): How long to wait for a browser when all are leased (default: 30)
+
+    Returns:
+        LeasedChromeDriver: WebDriver whose quit() releases the browser
+
+    Raises:
+        BrowserDaemonError: If the daemon is not running, no browser became free in time,
+                            or attaching to the leased browser failed
+    """
+    lease = _request(
+        address,
+        {"op": "lease", "owner": owner or f"{socket.gethostname()}:{os.getpid()}", "wait_seconds": wait_seconds},
+        timeout=wait_seconds + 10
+    )
+
+    options = Options()
+    options.debugger_address = lease["debugger_address"]
+    if page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+
+    try:
+        return LeasedChromeDriver(
+            address, lease, service=Service(executable_path=chromedriver_path), options=options
+        )
+    except WebDriverException as e:
+        _request(address, {"op": "release", "lease_id": lease["lease_id"]})
+        raise BrowserDaemonError(f"Could not attach to {lease['debugger_address']}: {e}") from e
+
+
+def browser_daemon_status(address: str) -> list[dict]:
+    """
+    Return the state of every browser in the daemon's pool.
+
+    Raises:
+        BrowserDaemonError: If the daemon is not running
+    """
+    return _request(address, {"op": "status"})["browsers"]
@@ -9,9 +9,16 @@ def get_selenium_chrome_driver(
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
     download_dir: str = None,
     binary_path=None,
-    chromedriver_path="/usr/local/bin/chromedriver"
+    chromedriver_path="/usr/local/bin/chromedriver",
+    page_load_strategy: str = None,
+    remote_debugging_port: int = None
 ):
     options = Options()
+
+    # "none" returns from navigations immediately, so several tabs can load at once
+    if page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+
     options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
@@ -25,6 +32,10 @@ def get_selenium_chrome_driver(
     if binary_path:
         options.binary_location = binary_path
 
+    # Lets other chromedriver sessions attach to this browser through debugger_address
+    if remote_debugging_port:
+        options.add_argument(f"--remote-debugging-port={remote_debugging_port}")
+
     if download_dir:
         prefs = {
             "download.default_directory": os.path.abspath(download_dir),